@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+
+import argparse
+import contextlib
+import glob
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Iterable, Iterator, NamedTuple, Optional, List, Dict
+
+from pyasn1.error import PyAsn1Error
+
+from pkilint import loader, report, util, document, etsi, linter_registry, profiling, validation
+from pkilint.cabf import serverauth, smime
+
+
+class BatchLinter:
+    """Loads documents of a single kind and lints each with the linter that is selected for it.
+
+    Linters are retrieved from the process-wide linter registry, so each worker builds a given linter at most once.
+    If finding code patterns are specified, then each linter is pruned to the validators that may report matching
+    findings. Documents whose linter cannot report any matching finding are not validated.
+    """
+
+    profile_name: str = None
+
+    def __init__(self, validity_period_start_retriever: document.ValidityPeriodStartRetriever, report_all: bool,
+                 severity_threshold: Optional[validation.ValidationFindingSeverity] = None,
+                 fail_fast_severity: Optional[validation.ValidationFindingSeverity] = None,
+                 finding_code_patterns: Optional[List[str]] = None):
+        self._validity_period_start_retriever = validity_period_start_retriever
+        self._report_all = report_all
+        self._severity_threshold = severity_threshold
+        self._fail_fast_severity = fail_fast_severity
+        self._finding_code_patterns = finding_code_patterns
+        self._selected_linters: Dict[linter_registry.LinterKey, Optional[linter_registry.PrebuiltLinter]] = {}
+
+    def load_document(self, f, path: str) -> document.Document:
+        pass
+
+    def determine_linter_name(self, doc: document.Document) -> str:
+        return 'PKIX'
+
+    def _select_linter(self, linter: linter_registry.PrebuiltLinter) -> Optional[linter_registry.PrebuiltLinter]:
+        if linter.key not in self._selected_linters:
+            try:
+                selected_linter = linter.select_finding_codes(self._finding_code_patterns)
+            except ValueError:
+                selected_linter = None
+
+            self._selected_linters[linter.key] = selected_linter
+
+        return self._selected_linters[linter.key]
+
+    def lint(self, doc: document.Document):
+        linter = linter_registry.get_linter(
+            self.profile_name, self.determine_linter_name(doc), self._validity_period_start_retriever
+        )
+
+        if self._finding_code_patterns:
+            selected_linter = self._select_linter(linter)
+
+            if selected_linter is None:
+                return linter.key.linter_name, [], False
+
+            linter = selected_linter
+
+        if self._fail_fast_severity is None:
+            fail_fast = None
+        else:
+            fail_fast = linter.create_fail_fast_condition(self._fail_fast_severity, self._report_all)
+
+        results = linter.validate(doc, self._report_all, self._severity_threshold, fail_fast)
+
+        return linter.key.linter_name, results, fail_fast is not None and fail_fast.triggered
+
+
+class CertificateBatchLinter(BatchLinter):
+    def load_document(self, f, path):
+        return loader.load_certificate_file(f, path)
+
+
+class PkixCertificateBatchLinter(CertificateBatchLinter):
+    profile_name = 'pkix-cert'
+
+
+class CabfServerauthBatchLinter(CertificateBatchLinter):
+    profile_name = 'cabf-serverauth'
+
+    def determine_linter_name(self, doc):
+        return serverauth.determine_certificate_type(doc).to_option_str
+
+
+class CabfSmimeBatchLinter(CertificateBatchLinter):
+    profile_name = 'cabf-smime'
+
+    def determine_linter_name(self, doc):
+        validation_level, generation = smime.guess_validation_level_and_generation(doc)
+
+        return f'{validation_level}-{generation}'
+
+
+class EtsiBatchLinter(CertificateBatchLinter):
+    profile_name = 'etsi'
+
+    def determine_linter_name(self, doc):
+        return etsi.determine_certificate_type(doc).to_option_str
+
+
+class PkixCrlBatchLinter(BatchLinter):
+    profile_name = 'pkix-crl'
+
+    def load_document(self, f, path):
+        return loader.load_crl_file(f, path)
+
+
+class PkixOcspResponseBatchLinter(BatchLinter):
+    profile_name = 'pkix-ocsp'
+
+    def load_document(self, f, path):
+        return loader.load_ocsp_response_file(f, path)
+
+
+BATCH_LINTERS = {
+    c.profile_name: c for c in (
+        PkixCertificateBatchLinter,
+        CabfServerauthBatchLinter,
+        CabfSmimeBatchLinter,
+        EtsiBatchLinter,
+        PkixCrlBatchLinter,
+        PkixOcspResponseBatchLinter,
+    )
+}
+
+
+class DocumentOutcome(NamedTuple):
+    path: str
+    '''The path of the document'''
+
+    output_line: str
+    '''The JSON-encoded result (or error) for the document'''
+
+    findings_count: int
+    '''The number of findings at or above the severity threshold'''
+
+    failed: bool
+    '''Whether the document could not be loaded or linted'''
+
+    profiler: Optional[profiling.ValidationProfiler] = None
+    '''The validation statistics that were collected for the document, if profiling is enabled'''
+
+
+_WORKER_LINTER: Optional[BatchLinter] = None
+_WORKER_SEVERITY = None
+_WORKER_PROFILE = False
+
+
+def _init_worker(batch_linter_cls, validity_period_start_retriever, report_all, severity, decode_cache_size,
+                 fail_fast_severity, finding_code_patterns, profile):
+    global _WORKER_LINTER, _WORKER_SEVERITY, _WORKER_PROFILE
+
+    if decode_cache_size > 0:
+        document.enable_decode_cache(decode_cache_size)
+
+    _WORKER_LINTER = batch_linter_cls(
+        validity_period_start_retriever, report_all, severity, fail_fast_severity, finding_code_patterns
+    )
+    _WORKER_SEVERITY = severity
+    _WORKER_PROFILE = profile
+
+
+def _create_error_outcome(path: str, message: str) -> DocumentOutcome:
+    return DocumentOutcome(path, json.dumps({'document': path, 'error': message}), 0, True)
+
+
+def _lint_path(path: str) -> DocumentOutcome:
+    profiler = profiling.ValidationProfiler() if _WORKER_PROFILE else None
+
+    try:
+        with open(path, 'rb') as f:
+            doc = _WORKER_LINTER.load_document(f, path)
+
+        with contextlib.nullcontext() if profiler is None else profiler:
+            linter_name, results, truncated = _WORKER_LINTER.lint(doc)
+    except (OSError, ValueError, PyAsn1Error) as e:
+        return _create_error_outcome(path, str(e))
+    except Exception as e:
+        # an unexpected error for one document must not abort the linting of the remaining documents
+        return _create_error_outcome(path, f'{type(e).__name__}: {e}')
+
+    report_generator = report.ReportGeneratorJson(results, _WORKER_SEVERITY)
+    report_results = report_generator.generate_results()
+    findings_count = report_generator.findings_count
+
+    output = {'document': path, 'linter': linter_name, 'results': report_results}
+    if truncated:
+        output['truncated'] = True
+
+    output_line = json.dumps(output)
+
+    return DocumentOutcome(path, output_line, findings_count, False, profiler)
+
+
+def expand_inputs(inputs: Iterable[str]) -> Iterator[str]:
+    """Expands the specified files, directories, and glob patterns into the paths of the files to lint.
+
+    Directories are searched recursively. Paths are yielded in a deterministic order.
+    """
+    for input_path in inputs:
+        if os.path.isdir(input_path):
+            for dir_path, dir_names, file_names in os.walk(input_path):
+                dir_names.sort()
+
+                for file_name in sorted(file_names):
+                    yield os.path.join(dir_path, file_name)
+        elif glob.has_magic(input_path):
+            yield from expand_inputs(sorted(glob.glob(input_path, recursive=True)))
+        else:
+            yield input_path
+
+
+def _read_file_list(f) -> Iterator[str]:
+    for line in f:
+        line = line.strip()
+
+        if line:
+            yield line
+
+
+def lint_paths(batch_linter_cls, paths: Iterable[str], jobs: int, ordered: bool, chunk_size: int,
+               validity_period_start_retriever, report_all: bool, severity,
+               decode_cache_size: int = 0, fail_fast_severity=None,
+               finding_code_patterns: Optional[List[str]] = None, profile: bool = False) -> Iterator[DocumentOutcome]:
+    init_args = (
+        batch_linter_cls, validity_period_start_retriever, report_all, severity, decode_cache_size, fail_fast_severity,
+        finding_code_patterns, profile
+    )
+
+    if jobs == 1:
+        _init_worker(*init_args)
+
+        yield from map(_lint_path, paths)
+    else:
+        with multiprocessing.Pool(jobs, initializer=_init_worker, initargs=init_args) as pool:
+            map_func = pool.imap if ordered else pool.imap_unordered
+
+            yield from map_func(_lint_path, paths, chunk_size)
+
+
+def _positive_int(value):
+    value = int(value)
+
+    if value < 1:
+        raise argparse.ArgumentTypeError(f'Value must be positive: {value}')
+
+    return value
+
+
+def _non_negative_int(value):
+    value = int(value)
+
+    if value < 0:
+        raise argparse.ArgumentTypeError(f'Value must not be negative: {value}')
+
+    return value
+
+
+def main(cli_args=None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Batch linter. Lints many documents with a pool of worker processes and outputs one JSON line '
+                    'per document'
+    )
+
+    parser.add_argument('linter', type=str.lower, choices=list(BATCH_LINTERS.keys()),
+                        help='The linter to use. The certificate type is detected for each document where '
+                             'applicable. CRLs are linted against the RFC 5280 profile only; use lint_crl to lint '
+                             'CRLs or ARLs against the CA/B Forum Baseline Requirements.')
+    parser.add_argument('inputs', nargs='*',
+                        help='Files, directories (searched recursively), or glob patterns of documents to lint')
+    parser.add_argument('-l', '--file-list', type=argparse.FileType('r'),
+                        help='A file that contains the paths of documents to lint, one per line. Specify "-" to read '
+                             'from standard input.')
+    parser.add_argument('-j', '--jobs', type=_positive_int, default=os.cpu_count() or 1,
+                        help='The number of worker processes (default: the number of CPUs)')
+    parser.add_argument('--chunk-size', type=_positive_int, default=16,
+                        help='The number of documents dispatched to a worker at a time')
+    parser.add_argument('-u', '--unordered', action='store_true',
+                        help='Output results as soon as they are available, rather than in input order')
+    parser.add_argument('-o', '--output', type=argparse.FileType('w'), default=sys.stdout,
+                        help='The file to which results are written (default: standard output)')
+    parser.add_argument('--decode-cache-size', type=_non_negative_int, default=0,
+                        help='The number of decoded substrates (such as issuer names and extension values) to cache '
+                             'in each worker. Caching is disabled by default.')
+    parser.add_argument('-r', '--report-all', action='store_true',
+                        help='Report all findings without filtering any findings that are superseded by other '
+                             'requirements')
+
+    util.add_certificate_validity_period_start_arg(parser)
+    util.add_severity_arg(parser)
+    util.add_fail_fast_arg(parser)
+    util.add_finding_code_selection_arg(parser)
+    util.add_profile_arg(parser)
+
+    args = parser.parse_intermixed_args(cli_args)
+
+    if not args.inputs and args.file_list is None:
+        parser.error('At least one input or a file list must be specified')
+
+    paths = expand_inputs(args.inputs)
+    if args.file_list is not None:
+        paths = itertools.chain(paths, _read_file_list(args.file_list))
+
+    document_count, failed_count, findings_count = 0, 0, 0
+    start = time.perf_counter()
+
+    with util.profile_validation(args.timing_profile) as profiler:
+        for outcome in lint_paths(BATCH_LINTERS[args.linter], paths, args.jobs, not args.unordered, args.chunk_size,
+                                  args.validity_period_start, args.report_all, args.severity,
+                                  args.decode_cache_size, args.fail_fast, args.only, profiler is not None):
+            args.output.write(outcome.output_line + '\n')
+
+            document_count += 1
+            findings_count += outcome.findings_count
+
+            if outcome.failed:
+                failed_count += 1
+
+            if outcome.profiler is not None:
+                profiler.merge(outcome.profiler)
+
+        args.output.flush()
+
+    elapsed = time.perf_counter() - start
+    rate = document_count / elapsed if elapsed > 0 else 0.0
+
+    print(f'Linted {document_count} document(s) in {elapsed:.2f} seconds ({rate:.1f} documents/second) with '
+          f'{args.jobs} worker(s); {failed_count} document(s) failed, {findings_count} finding(s) reported',
+          file=sys.stderr)
+
+    return util.clamp_exit_code(findings_count + failed_count)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
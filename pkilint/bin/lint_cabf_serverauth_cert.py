@@ -91,16 +91,26 @@ def main(cli_args=None) -> int:
             serverauth.create_validators(certificate_type, args.validity_period_start)
         )
 
-        results = doc_validator.validate(cert.root)
+        try:
+            doc_validator = util.select_validators(doc_validator, args)
+        except ValueError as e:
+            print(f'Invalid finding code selection: {e}', file=sys.stderr)
+            return 1
+
+        finding_filters = [] if args.report_all else serverauth.create_serverauth_finding_filters(certificate_type)
+        fail_fast = util.create_fail_fast_condition(args, finding_filters)
+
+        with util.profile_validation(args.timing_profile):
+            results = doc_validator.iter_validate(cert.root, args.severity, fail_fast)
+
+            if not args.report_all:
+                results = finding_filter.iter_filter_results(finding_filters, results)
 
-        if not args.report_all:
-            results, _ = finding_filter.filter_results(
-                serverauth.create_serverauth_finding_filters(certificate_type), results
-            )
+            findings_count = args.format(results, args.severity, sys.stdout)
 
-        print(args.format(results, args.severity))
+        util.print_fail_fast_notice(fail_fast)
 
-        return util.clamp_exit_code(report.get_findings_count(results, args.severity))
+        return util.clamp_exit_code(findings_count)
 
 
 if __name__ == "__main__":
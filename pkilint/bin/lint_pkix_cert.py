@@ -50,11 +50,22 @@ def main(cli_args=None) -> int:
             print(f'Failed to load certificate: {e}', file=sys.stderr)
             return 1
 
-        results = doc_validator.validate(cert.root)
+        try:
+            doc_validator = util.select_validators(doc_validator, args)
+        except ValueError as e:
+            print(f'Invalid finding code selection: {e}', file=sys.stderr)
+            return 1
+
+        fail_fast = util.create_fail_fast_condition(args)
+
+        with util.profile_validation(args.timing_profile):
+            results = doc_validator.iter_validate(cert.root, args.severity, fail_fast)
+
+            findings_count = args.format(results, args.severity, sys.stdout)
 
-        print(args.format(results, args.severity))
+        util.print_fail_fast_notice(fail_fast)
 
-        return util.clamp_exit_code(report.get_findings_count(results, args.severity))
+        return util.clamp_exit_code(findings_count)
 
 
 if __name__ == "__main__":
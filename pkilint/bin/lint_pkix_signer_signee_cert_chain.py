@@ -9,6 +9,8 @@ from pkilint import loader, document, util, validation, pkix, report
 from pkilint.pkix import certificate, name, extension, algorithm
 from pkilint.pkix.certificate import certificate_extension, certificate_key
 
+_TBS_CERTIFICATE_PATH = document.compile_path('^.tbsCertificate')
+
 
 def create_decoder_validation_container():
     decoders = [
@@ -53,7 +55,7 @@ def create_issuer_validation_container():
 def create_subject_validation_container():
     validators = [
         certificate_key.SubjectSignatureVerificationValidator(
-            tbs_node_retriever=lambda n: n.navigate('^.tbsCertificate'),
+            tbs_node_retriever=lambda n: n.navigate(_TBS_CERTIFICATE_PATH),
             path='certificate.signature'
         )
     ]
@@ -113,14 +115,42 @@ def main(cli_args=None) -> int:
 
         doc_collection['subject'] = subject
 
-        results = decoding_validation_container.validate(issuer.root)
-        results += decoding_validation_container.validate(subject.root)
-        results += issuer_validation_container.validate(issuer.root)
-        results += subject_validation_container.validate(subject.root)
+        if args.only:
+            try:
+                selector = validation.create_finding_code_selector(
+                    validation.ValidatorContainer(validators=[
+                        decoding_validation_container, issuer_validation_container, subject_validation_container
+                    ]),
+                    args.only
+                )
+            except ValueError as e:
+                print(f'Invalid finding code selection: {e}', file=sys.stderr)
+                return 1
+
+            decoding_validation_container = decoding_validation_container.prune(selector)
+            issuer_validation_container = issuer_validation_container.prune(selector)
+            subject_validation_container = subject_validation_container.prune(selector)
+
+        fail_fast = util.create_fail_fast_condition(args)
+        results = []
+
+        with util.profile_validation(args.timing_profile):
+            for validator_container, cert in (
+                    (decoding_validation_container, issuer),
+                    (decoding_validation_container, subject),
+                    (issuer_validation_container, issuer),
+                    (subject_validation_container, subject),
+            ):
+                results += validator_container.validate(cert.root, args.severity, fail_fast)
+
+                if fail_fast is not None and fail_fast.triggered:
+                    break
+
+        findings_count = args.format(results, args.severity, sys.stdout)
 
-        print(args.format(results, args.severity))
+        util.print_fail_fast_notice(fail_fast)
 
-        return util.clamp_exit_code(report.get_findings_count(results, args.severity))
+        return util.clamp_exit_code(findings_count)
 
 
 if __name__ == '__main__':
@@ -1,17 +1,15 @@
 import ipaddress
 from urllib.parse import urlparse
 
-import publicsuffixlist
 from pyasn1_alt_modules import rfc8398, rfc5280
 
 from pkilint import validation
+from pkilint.common import public_suffix_list
 from pkilint.pkix import general_name
 
 
 class InternalDomainNameValidator(validation.Validator):
     def __init__(self, validation_internal_domain_name_present: validation.ValidationFinding, *args, **kwargs):
-        self._psl = publicsuffixlist.PublicSuffixList(accept_unknown=False)
-
         super().__init__(validations=[validation_internal_domain_name_present], **kwargs)
 
         self._validation_internal_domain_name_present = validation_internal_domain_name_present
@@ -21,10 +19,10 @@ class InternalDomainNameValidator(validation.Validator):
         return str(node.pdu)
 
     def validate_with_value(self, node, value):
-        if self._psl.publicsuffix(value) is None:
+        if public_suffix_list.get_public_suffix_list().publicsuffix(value) is None:
             raise validation.ValidationFindingEncountered(
                 self._validation_internal_domain_name_present,
-                f'Internal domain name: "{value}"'
+                lambda: f'Internal domain name: "{value}"'
             )
 
     def validate(self, node):
@@ -144,7 +142,7 @@ class InternalIpAddressValidator(validation.Validator):
         if not ip_addr.is_global:
             raise validation.ValidationFindingEncountered(
                 self._validation_internal_ip_address_present,
-                f'Internal IP address: "{ip_addr}"'
+                lambda: f'Internal IP address: "{ip_addr}"'
             )
 
 
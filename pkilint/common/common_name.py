@@ -32,7 +32,7 @@ class CommonNameValidator(validation.Validator):
         if san_ext_and_idx is None:
             raise validation.ValidationFindingEncountered(
                 self._validation_unknown_value_source,
-                f'Unknown source for value of common name: "{value_str}"'
+                lambda: f'Unknown source for value of common name: "{value_str}"'
             )
 
         san_ext_node, _ = san_ext_and_idx
@@ -68,5 +68,5 @@ class CommonNameValidator(validation.Validator):
 
         raise validation.ValidationFindingEncountered(
             self._validation_unknown_value_source,
-            f'Unknown source for value of common name: "{value_str}"'
+            lambda: f'Unknown source for value of common name: "{value_str}"'
         )
@@ -0,0 +1,81 @@
+import functools
+import os
+import threading
+from typing import Optional
+
+import publicsuffixlist
+
+PUBLIC_SUFFIX_LIST_FILE_ENV_VAR = 'PKILINT_PUBLIC_SUFFIX_LIST_FILE'
+'''The environment variable that specifies the path of a pinned Public Suffix List snapshot'''
+
+DEFAULT_LOOKUP_CACHE_SIZE = 16384
+
+
+class PublicSuffixListService:
+    """Determines the public suffix of domain names using a single parsed copy of the Public Suffix List.
+
+    Lookups are memoized in a bounded LRU cache, as certificates typically repeat a small set of registrable domains.
+    Unknown top-level domains are not considered to be public suffixes.
+
+    The lookup of the publicsuffixlist package is used as-is rather than compiling the list into a separate suffix trie.
+    The package already matches each label suffix with a hashed set lookup, and reusing it keeps its handling of
+    wildcard and exception rules.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None, cache_size: int = DEFAULT_LOOKUP_CACHE_SIZE):
+        """
+        Args:
+            snapshot_path: The path of a Public Suffix List file to load. If None, the copy of the Public Suffix List
+            that is bundled with the publicsuffixlist package is loaded.
+            cache_size: The maximum number of domain names whose public suffix is cached.
+        """
+        if snapshot_path is None:
+            psl = publicsuffixlist.PublicSuffixList(accept_unknown=False)
+        else:
+            with open(snapshot_path, 'rb') as f:
+                psl = publicsuffixlist.PublicSuffixList(f, accept_unknown=False)
+
+        self.snapshot_path = snapshot_path
+
+        self._psl = psl
+        self._lookup = functools.lru_cache(maxsize=cache_size)(psl.publicsuffix)
+
+    def publicsuffix(self, domain_name: str) -> Optional[str]:
+        """Returns the public suffix of the specified domain name, or None if it does not have a known public suffix."""
+        # the returned suffix is case-folded, so case-folding the domain name beforehand improves the cache hit rate
+        return self._lookup(domain_name.lower())
+
+    def cache_info(self):
+        return self._lookup.cache_info()
+
+
+_SERVICE: Optional[PublicSuffixListService] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_public_suffix_list() -> PublicSuffixListService:
+    """Returns the process-wide Public Suffix List service, loading it on first use.
+
+    If the environment variable named by :py:const:`PUBLIC_SUFFIX_LIST_FILE_ENV_VAR` is set, then the pinned snapshot
+    file at that path is loaded. Otherwise, the bundled copy of the Public Suffix List is loaded.
+    """
+    global _SERVICE
+
+    service = _SERVICE
+    if service is not None:
+        return service
+
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = PublicSuffixListService(os.environ.get(PUBLIC_SUFFIX_LIST_FILE_ENV_VAR))
+
+        return _SERVICE
+
+
+def set_public_suffix_list(service: Optional[PublicSuffixListService]):
+    """Replaces the process-wide Public Suffix List service. If None is specified, then the service is reloaded on
+    next use."""
+    global _SERVICE
+
+    with _SERVICE_LOCK:
+        _SERVICE = service
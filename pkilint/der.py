@@ -0,0 +1,626 @@
+"""Verifies that substrates are DER-encoded without re-encoding them.
+
+Without a decoded value, the schema-independent rules (definite and minimal lengths, primitive/constructed forms,
+BOOLEAN, INTEGER, BIT STRING, OBJECT IDENTIFIER and time encodings, and the ordering of SET components) are checked
+for the universal types in a single pass over the TLV stream.
+
+With a decoded value, the TLVs are walked alongside the value, so the content rules are applied by the type of each
+component regardless of its tag, explicit tags must be constructed, SET OF components must be in order, and DEFAULT
+values and empty OPTIONAL values must be omitted. The content of ANY values is reproduced as-is by the encoder, so it
+is checked when it is decoded with its own schema. Where the walk cannot determine the outcome (such as for REAL
+values or fractional times), the substrate is compared with the DER encoding of the value instead.
+"""
+
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from pyasn1.codec.der.encoder import encode
+from pyasn1.error import PyAsn1Error
+from pyasn1.type import univ, useful
+from pyasn1.type.base import Asn1Type
+from pyasn1.type.namedtype import NamedType
+from pyasn1.type.tag import tagClassUniversal
+
+_CLASS_MASK = 0xc0
+_CONSTRUCTED_MASK = 0x20
+_TAG_NUMBER_MASK = 0x1f
+
+_BOOLEAN = 1
+_INTEGER = 2
+_BIT_STRING = 3
+_NULL = 5
+_OBJECT_IDENTIFIER = 6
+_ENUMERATED = 10
+_SEQUENCE = 16
+_SET = 17
+_UTC_TIME = 23
+_GENERALIZED_TIME = 24
+
+# universal types whose DER encoding is always primitive
+_PRIMITIVE_UNIVERSAL_TAG_NUMBERS = {1, 2, 3, 4, 5, 6, 9, 10, 12, 13, 14, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28,
+                                    29, 30}
+_CONSTRUCTED_UNIVERSAL_TAG_NUMBERS = {_SEQUENCE, _SET}
+
+
+class DerEncodingViolation(NamedTuple):
+    offset: int
+    '''The offset of the TLV (or octet) in the substrate at which the violation occurs'''
+
+    reason: str
+    '''A description of the violation'''
+
+    def __str__(self):
+        return f'{self.reason} at offset {self.offset}'
+
+
+class _DerEncodingViolationEncountered(Exception):
+    def __init__(self, offset: int, reason: str):
+        self.violation = DerEncodingViolation(offset, reason)
+
+
+class _Tlv(NamedTuple):
+    offset: int
+    identifier: int
+    tag_number: int
+    value_offset: int
+    end: int
+
+    @property
+    def tag_class(self):
+        return self.identifier & _CLASS_MASK
+
+    @property
+    def is_constructed(self):
+        return bool(self.identifier & _CONSTRUCTED_MASK)
+
+    @property
+    def is_universal(self):
+        return self.tag_class == tagClassUniversal
+
+    @property
+    def tag(self) -> Tuple[int, int]:
+        return self.tag_class, self.tag_number
+
+
+def _read_tlv(data: bytes, offset: int, end: int) -> _Tlv:
+    if offset >= end:
+        raise _DerEncodingViolationEncountered(offset, 'Missing identifier octet')
+
+    identifier = data[offset]
+    position = offset + 1
+
+    tag_number = identifier & _TAG_NUMBER_MASK
+    if tag_number == _TAG_NUMBER_MASK:
+        tag_number = 0
+
+        if position < end and data[position] == 0x80:
+            raise _DerEncodingViolationEncountered(position, 'Tag number is not minimally encoded')
+
+        while True:
+            if position >= end:
+                raise _DerEncodingViolationEncountered(position, 'Truncated tag number')
+
+            octet = data[position]
+            position += 1
+
+            tag_number = (tag_number << 7) | (octet & 0x7f)
+
+            if not octet & 0x80:
+                break
+
+        if tag_number < _TAG_NUMBER_MASK:
+            raise _DerEncodingViolationEncountered(offset, 'Tag number is not minimally encoded')
+
+    if position >= end:
+        raise _DerEncodingViolationEncountered(position, 'Missing length octet')
+
+    length_octet = data[position]
+    length_offset = position
+    position += 1
+
+    if length_octet == 0x80:
+        raise _DerEncodingViolationEncountered(length_offset, 'Indefinite length encoding')
+    elif length_octet == 0xff:
+        raise _DerEncodingViolationEncountered(length_offset, 'Reserved length octet')
+    elif length_octet & 0x80:
+        length_octet_count = length_octet & 0x7f
+
+        if position + length_octet_count > end:
+            raise _DerEncodingViolationEncountered(length_offset, 'Truncated length')
+        if data[position] == 0:
+            raise _DerEncodingViolationEncountered(length_offset, 'Length is not minimally encoded')
+
+        length = int.from_bytes(data[position:position + length_octet_count], 'big')
+        position += length_octet_count
+
+        if length < 0x80:
+            raise _DerEncodingViolationEncountered(length_offset, 'Length is not minimally encoded')
+    else:
+        length = length_octet
+
+    value_end = position + length
+    if value_end > end:
+        raise _DerEncodingViolationEncountered(length_offset, 'Length exceeds the available octets')
+
+    return _Tlv(offset, identifier, tag_number, position, value_end)
+
+
+def _read_children(data: bytes, tlv: _Tlv) -> List[_Tlv]:
+    children = []
+
+    position = tlv.value_offset
+    while position < tlv.end:
+        child = _read_tlv(data, position, tlv.end)
+
+        children.append(child)
+        position = child.end
+
+    return children
+
+
+def _check_boolean(data: bytes, tlv: _Tlv):
+    if tlv.end - tlv.value_offset != 1:
+        raise _DerEncodingViolationEncountered(tlv.offset, 'BOOLEAN value is not one octet')
+    if data[tlv.value_offset] not in (0x00, 0xff):
+        raise _DerEncodingViolationEncountered(tlv.offset, 'BOOLEAN TRUE value is not encoded as 0xFF')
+
+
+def _check_integer(data: bytes, tlv: _Tlv):
+    length = tlv.end - tlv.value_offset
+
+    if length == 0:
+        raise _DerEncodingViolationEncountered(tlv.offset, 'Integer value has no content octets')
+    if length > 1:
+        first, second = data[tlv.value_offset], data[tlv.value_offset + 1]
+
+        if (first == 0x00 and second < 0x80) or (first == 0xff and second >= 0x80):
+            raise _DerEncodingViolationEncountered(tlv.offset, 'Integer value is not minimally encoded')
+
+
+def _check_bit_string(data: bytes, tlv: _Tlv):
+    length = tlv.end - tlv.value_offset
+
+    if length == 0:
+        raise _DerEncodingViolationEncountered(tlv.offset, 'BIT STRING value has no unused bits octet')
+
+    unused_bits = data[tlv.value_offset]
+    if unused_bits > 7:
+        raise _DerEncodingViolationEncountered(tlv.value_offset, 'BIT STRING unused bits count exceeds 7')
+    if length == 1 and unused_bits != 0:
+        raise _DerEncodingViolationEncountered(tlv.value_offset, 'Empty BIT STRING has a non-zero unused bits count')
+    if unused_bits and data[tlv.end - 1] & ((1 << unused_bits) - 1):
+        raise _DerEncodingViolationEncountered(tlv.end - 1, 'BIT STRING unused bits are not zero')
+
+
+def _check_null(data: bytes, tlv: _Tlv):
+    if tlv.end != tlv.value_offset:
+        raise _DerEncodingViolationEncountered(tlv.offset, 'NULL value has content octets')
+
+
+def _check_object_identifier(data: bytes, tlv: _Tlv):
+    if tlv.end == tlv.value_offset:
+        raise _DerEncodingViolationEncountered(tlv.offset, 'OBJECT IDENTIFIER value has no content octets')
+    if data[tlv.end - 1] & 0x80:
+        raise _DerEncodingViolationEncountered(tlv.end - 1, 'OBJECT IDENTIFIER value is truncated')
+
+    subidentifier_start = True
+    for position in range(tlv.value_offset, tlv.end):
+        octet = data[position]
+
+        if subidentifier_start and octet == 0x80:
+            raise _DerEncodingViolationEncountered(position, 'OBJECT IDENTIFIER arc is not minimally encoded')
+
+        subidentifier_start = not octet & 0x80
+
+
+def _check_time(data: bytes, tlv: _Tlv, type_name: str, min_length: int, max_length: int):
+    value = data[tlv.value_offset:tlv.end]
+
+    if b'+' in value or b'-' in value:
+        raise _DerEncodingViolationEncountered(tlv.offset, f'{type_name} value is not expressed in UTC')
+    if not value.endswith(b'Z'):
+        raise _DerEncodingViolationEncountered(tlv.offset, f'{type_name} value does not end with "Z"')
+    if b',' in value:
+        raise _DerEncodingViolationEncountered(tlv.offset, f'{type_name} value uses a comma as the decimal separator')
+
+    if b'.' in value:
+        fraction = value[value.index(b'.') + 1:-1]
+
+        if not fraction or fraction.endswith(b'0'):
+            raise _DerEncodingViolationEncountered(tlv.offset,
+                                                   f'{type_name} value has a trailing zero or empty fraction')
+
+    if not min_length <= len(value) <= max_length:
+        raise _DerEncodingViolationEncountered(tlv.offset, f'{type_name} value has an invalid length')
+
+
+def _check_utc_time(data: bytes, tlv: _Tlv):
+    _check_time(data, tlv, 'UTCTime', 11, 13)
+
+
+def _check_generalized_time(data: bytes, tlv: _Tlv):
+    _check_time(data, tlv, 'GeneralizedTime', 13, 19)
+
+
+# checks of the content octets of primitive values, by universal tag number
+_UNIVERSAL_PRIMITIVE_CHECKS = {
+    _BOOLEAN: _check_boolean,
+    _INTEGER: _check_integer,
+    _BIT_STRING: _check_bit_string,
+    _NULL: _check_null,
+    _OBJECT_IDENTIFIER: _check_object_identifier,
+    _ENUMERATED: _check_integer,
+    _UTC_TIME: _check_utc_time,
+    _GENERALIZED_TIME: _check_generalized_time,
+}
+
+
+def _check_tlv(data: bytes, tlv: _Tlv):
+    if tlv.is_universal:
+        if tlv.is_constructed and tlv.tag_number in _PRIMITIVE_UNIVERSAL_TAG_NUMBERS:
+            raise _DerEncodingViolationEncountered(tlv.offset, 'Constructed encoding of a primitive type')
+        if not tlv.is_constructed and tlv.tag_number in _CONSTRUCTED_UNIVERSAL_TAG_NUMBERS:
+            raise _DerEncodingViolationEncountered(tlv.offset, 'Primitive encoding of SEQUENCE or SET')
+
+    if not tlv.is_constructed:
+        if tlv.is_universal and tlv.tag_number in _UNIVERSAL_PRIMITIVE_CHECKS:
+            _UNIVERSAL_PRIMITIVE_CHECKS[tlv.tag_number](data, tlv)
+
+        return
+
+    children = _read_children(data, tlv)
+
+    for child in children:
+        _check_tlv(data, child)
+
+    if tlv.is_universal and tlv.tag_number == _SET:
+        _check_set_of_order(data, children)
+
+
+def _check_set_of_order(data: bytes, children: List[_Tlv]):
+    # no complete TLV is a proper prefix of another, so octet string comparison suffices
+    for previous, current in zip(children, children[1:]):
+        if data[previous.offset:previous.end] > data[current.offset:current.end]:
+            raise _DerEncodingViolationEncountered(current.offset, 'SET components are not in ascending order')
+
+
+class _CheckUndetermined(Exception):
+    """Raised when the decoded value cannot be matched with the TLVs of the substrate or is of a type whose encoding
+    rules are not checked, in which case the substrate is compared with the DER encoding of the value instead"""
+
+
+def _check_time_value(data: bytes, tlv: _Tlv, check):
+    # the encoder of pyasn1 removes zeros from fractions of seconds in a manner that is not replicated, so fractional
+    # time values are compared with their encoding
+    if b'.' in data[tlv.value_offset:tlv.end]:
+        raise _CheckUndetermined()
+
+    check(data, tlv)
+
+
+# checks of the content octets of primitive values, by the type of the decoded value. Time types are subclasses of
+# OctetString, so they are listed first
+_VALUE_PRIMITIVE_CHECKS = (
+    (univ.Boolean, _check_boolean),
+    (univ.Integer, _check_integer),
+    (univ.BitString, _check_bit_string),
+    (univ.Null, _check_null),
+    (univ.ObjectIdentifier, _check_object_identifier),
+    (useful.UTCTime, lambda d, t: _check_time_value(d, t, _check_utc_time)),
+    (useful.GeneralizedTime, lambda d, t: _check_time_value(d, t, _check_generalized_time)),
+    # any content octets are the DER encoding of an OCTET STRING or character string value
+    (univ.OctetString, lambda d, t: None),
+)
+
+
+def _is_constructed_type(value: Asn1Type) -> bool:
+    return isinstance(value, (univ.SequenceOfAndSetOfBase, univ.SequenceAndSetBase))
+
+
+def _get_encoded_components(value: univ.SequenceAndSetBase) -> Tuple[List[Tuple[NamedType, Asn1Type]], bool]:
+    """Returns the named types and values of the components that are encoded in DER and whether any components with
+    values are omitted."""
+    named_types = value.componentType
+
+    encoded = []
+    has_omitted = False
+    for idx, component in enumerate(value.values()):
+        named_type = named_types[idx]
+
+        if named_type.isOptional and not component.isValue:
+            continue
+
+        if named_type.isDefaulted and component == named_type.asn1Object:
+            has_omitted = True
+            continue
+
+        if _is_omitted(component, named_type.isOptional):
+            has_omitted = True
+            continue
+
+        encoded.append((named_type, component))
+
+    return encoded, has_omitted
+
+
+def _is_omitted(value: Asn1Type, if_not_empty: bool) -> bool:
+    """Returns whether the DER encoder omits the specified value.
+
+    Within an OPTIONAL component, the encoder omits constructed values that have no content octets. This also applies
+    to the elements of SEQUENCE OF and SET OF values and to the alternatives of CHOICE values within the component.
+    """
+    if not if_not_empty:
+        return False
+    elif isinstance(value, univ.Choice):
+        return value.isValue and _is_omitted(value.getComponent(), if_not_empty)
+    elif isinstance(value, univ.SequenceOfAndSetOfBase):
+        return all(_is_omitted(c, if_not_empty) for c in value)
+    elif isinstance(value, univ.SequenceAndSetBase):
+        return not _get_encoded_components(value)[0]
+    else:
+        return False
+
+
+def _unwrap_explicit_tags(data: bytes, tlv: _Tlv, count: int) -> _Tlv:
+    for _ in range(count):
+        if not tlv.is_constructed:
+            raise _DerEncodingViolationEncountered(tlv.offset, 'Explicit tag is not encoded in constructed form')
+
+        children = _read_children(data, tlv)
+        if len(children) != 1:
+            raise _CheckUndetermined()
+
+        tlv = children[0]
+
+    return tlv
+
+
+def _check_primitive_value(data: bytes, value: Asn1Type, tlv: _Tlv):
+    if tlv.is_constructed:
+        raise _DerEncodingViolationEncountered(tlv.offset, 'Constructed encoding of a primitive type')
+
+    for value_cls, check in _VALUE_PRIMITIVE_CHECKS:
+        if isinstance(value, value_cls):
+            check(data, tlv)
+
+            return
+
+    # such as REAL values
+    raise _CheckUndetermined()
+
+
+def _check_value(data: bytes, value: Asn1Type, tlv: _Tlv, if_not_empty: bool):
+    if isinstance(value, univ.Choice):
+        if not value.isValue:
+            raise _CheckUndetermined()
+
+        # explicit tags are the only tags that can be applied to a CHOICE
+        tlv = _unwrap_explicit_tags(data, tlv, len(value.tagSet.superTags))
+
+        _check_value(data, value.getComponent(), tlv, if_not_empty)
+
+        return
+
+    if isinstance(value, univ.Any):
+        # the DER encoder reproduces the content of ANY values as-is. The content is checked when it is decoded with
+        # its own schema, so only the explicit tags (if any) are checked here
+        explicit_tag_count = len(value.tagSet.superTags)
+
+        if explicit_tag_count > 0:
+            tlv = _unwrap_explicit_tags(data, tlv, explicit_tag_count - 1)
+
+            if not tlv.is_constructed:
+                raise _DerEncodingViolationEncountered(tlv.offset, 'Explicit tag is not encoded in constructed form')
+
+        return
+
+    tlv = _unwrap_explicit_tags(data, tlv, len(value.tagSet.superTags) - 1)
+
+    if not _is_constructed_type(value):
+        _check_primitive_value(data, value, tlv)
+
+        return
+
+    if not tlv.is_constructed:
+        raise _DerEncodingViolationEncountered(tlv.offset, 'Primitive encoding of a constructed type')
+
+    children = _read_children(data, tlv)
+    type_name = value.__class__.__name__
+
+    # the encoder refuses to encode constructed values that violate their constraints, such as empty SIZE (1..MAX)
+    # values
+    if value.isInconsistent:
+        raise _DerEncodingViolationEncountered(tlv.offset, f'"{type_name}" value does not satisfy its constraints')
+
+    if isinstance(value, univ.SequenceOfAndSetOfBase):
+        if len(children) != len(value):
+            raise _CheckUndetermined()
+
+        for component, child in zip(value, children):
+            if _is_omitted(component, if_not_empty):
+                raise _DerEncodingViolationEncountered(
+                    child.offset, f'"{type_name}" encodes an empty value within an OPTIONAL value'
+                )
+
+            _check_value(data, component, child, if_not_empty)
+
+        if isinstance(value, univ.SetOf):
+            _check_set_of_order(data, children)
+
+        return
+
+    # the components of a SET are encoded in tag order, which is not tracked
+    if isinstance(value, univ.Set):
+        raise _CheckUndetermined()
+
+    named_components, has_omitted = _get_encoded_components(value)
+
+    if len(children) != len(named_components):
+        if has_omitted:
+            raise _DerEncodingViolationEncountered(
+                tlv.offset, f'"{type_name}" encodes a DEFAULT value or an empty OPTIONAL value'
+            )
+        else:
+            raise _CheckUndetermined()
+
+    for (named_type, component), child in zip(named_components, children):
+        # open type values that were decoded with their own schema are wrapped by the encoder
+        if named_type.openType and not isinstance(component, univ.Any):
+            raise _CheckUndetermined()
+
+        _check_value(data, component, child, named_type.isOptional)
+
+
+def _find_encoding_mismatch(data: bytes, decoded: Asn1Type) -> Optional[DerEncodingViolation]:
+    try:
+        encoded = encode(decoded)
+    except (ValueError, PyAsn1Error) as e:
+        return DerEncodingViolation(0, f'Value cannot be DER-encoded ({e})')
+
+    if encoded == data:
+        return None
+
+    offset = next((i for i, (e, d) in enumerate(zip(encoded, data)) if e != d), min(len(encoded), len(data)))
+
+    return DerEncodingViolation(offset, 'Substrate differs from the DER encoding of the decoded value')
+
+
+class ByteSpan(NamedTuple):
+    offset: int
+    '''The offset of the first octet of the span'''
+
+    length: int
+    '''The number of octets in the span'''
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+
+def _descend_explicit_tags(data: bytes, tlv: _Tlv, count: int) -> Optional[_Tlv]:
+    for _ in range(count):
+        children = _read_children(data, tlv)
+        if len(children) != 1:
+            return None
+
+        tlv = children[0]
+
+    return tlv
+
+
+def find_component_span(substrate: bytes, value: Asn1Type, span: ByteSpan, component_name: str) -> Optional[ByteSpan]:
+    """Returns the span of the DER encoding of a component of the specified value.
+
+    Args:
+        substrate: The DER-encoded substrate that contains the value.
+        value: The constructed value that contains the component.
+        span: The span of the DER encoding of the value (including any explicit tags) within the substrate.
+        component_name: The name of the component. This is the index of the element for SEQUENCE OF and SET OF
+        values.
+
+    Returns:
+        The span of the DER encoding of the component, or None if the component is not encoded in the substrate.
+    """
+    try:
+        tlv = _read_tlv(substrate, span.offset, span.end)
+
+        if isinstance(value, univ.Choice):
+            if not value.isValue or value.getName() != component_name:
+                return None
+
+            tlv = _descend_explicit_tags(substrate, tlv, len(value.tagSet.superTags))
+        elif isinstance(value, univ.SequenceOfAndSetOfBase):
+            tlv = _descend_explicit_tags(substrate, tlv, len(value.tagSet.superTags) - 1)
+            if tlv is None:
+                return None
+
+            children = _read_children(substrate, tlv)
+            index = int(component_name)
+
+            tlv = children[index] if len(children) == len(value) and 0 <= index < len(children) else None
+        elif isinstance(value, univ.Sequence):
+            tlv = _descend_explicit_tags(substrate, tlv, len(value.tagSet.superTags) - 1)
+            if tlv is None:
+                return None
+
+            children = _read_children(substrate, tlv)
+            names = [t.name for t, _ in _get_encoded_components(value)[0]]
+
+            if len(children) == len(names) and component_name in names:
+                tlv = children[names.index(component_name)]
+            else:
+                tlv = None
+        else:
+            # the components of a SET are encoded in tag order, which is not tracked
+            return None
+    except (_DerEncodingViolationEncountered, ValueError):
+        return None
+
+    if tlv is None:
+        return None
+    else:
+        return ByteSpan(tlv.offset, tlv.end - tlv.offset)
+
+
+def iter_top_level_spans(substrate: bytes, offset: int = 0) -> Iterator[ByteSpan]:
+    """Yields the span of each top-level TLV in the specified substrate, such as each document in a concatenation of
+    DER-encoded documents. Only the TLV headers are read; the values are not checked.
+
+    Raises:
+        ValueError: The substrate (starting at the specified offset) is not a sequence of complete TLVs.
+    """
+    end = len(substrate)
+
+    while offset < end:
+        try:
+            tlv = _read_tlv(substrate, offset, end)
+        except _DerEncodingViolationEncountered as e:
+            raise ValueError(f'Invalid TLV: {e.violation}') from e
+
+        yield ByteSpan(tlv.offset, tlv.end - tlv.offset)
+
+        offset = tlv.end
+
+
+def find_violation(substrate: bytes, decoded: Optional[Asn1Type] = None) -> Optional[DerEncodingViolation]:
+    """Returns the first DER encoding violation in the specified substrate, or None if the substrate is DER-encoded.
+
+    Args:
+        substrate: The octets to check.
+        decoded: The value that was decoded from the substrate. If specified, then the encoding is checked against the
+        schema of the value, and a substrate is reported as DER-encoded only if it is equal to the DER encoding of the
+        value. Otherwise, only the schema-independent rules are checked.
+    """
+    data = bytes(substrate)
+
+    if decoded is None:
+        try:
+            position = 0
+            while position < len(data):
+                tlv = _read_tlv(data, position, len(data))
+
+                _check_tlv(data, tlv)
+
+                position = tlv.end
+        except _DerEncodingViolationEncountered as e:
+            return e.violation
+
+        return None
+
+    try:
+        tlv = _read_tlv(data, 0, len(data))
+
+        if tlv.end != len(data):
+            raise _DerEncodingViolationEncountered(tlv.end, 'Octets follow the encoding of the value')
+
+        _check_value(data, decoded, tlv, False)
+    except _CheckUndetermined:
+        return _find_encoding_mismatch(data, decoded)
+    except _DerEncodingViolationEncountered as e:
+        # the TLV headers within the content of ANY values are read as-is, but the encoder reproduces that content
+        # verbatim. Violations are therefore only reported if the substrate also differs from the encoding
+        if _find_encoding_mismatch(data, decoded) is None:
+            return None
+
+        return e.violation
+
+    return None
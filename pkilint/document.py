@@ -1,7 +1,13 @@
 import datetime
+import functools
+import heapq
 import logging
+import operator
 import re
-from typing import Callable, Mapping, Tuple, Type, Union, Optional, Dict, List, NamedTuple
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Mapping, Tuple, Type, Union, Optional, Dict, List, NamedTuple, Sequence, Iterator
 
 from pyasn1.codec.der.decoder import decode
 from pyasn1.codec.der.encoder import encode
@@ -11,10 +17,14 @@ from pyasn1.type.univ import (ObjectIdentifier, SequenceOfAndSetOfBase, Sequence
                               Choice, BitString
                               )
 
+from pkilint import der
+
 logger = logging.getLogger(__name__)
 
 PATH_REGEX = re.compile(r'^((?P<doc_name>[^:]*):)?(?P<node_path>([^.]+\.)*[^.]+)?$')
 
+_COMPILED_PATH_CACHE_SIZE = 4096
+
 try:
     # noinspection PyUnresolvedReferences
     from pyasn1_fasder import decode_der
@@ -89,9 +99,50 @@ class Document:
         return f'{self.root.name} document "{self.substrate_source}"'
 
 
+class CompiledPath(NamedTuple):
+    """Represents a parsed path that can be passed to :py:meth:`pkilint.document.PDUNode.navigate`."""
+
+    path: str
+    '''The path from which this instance was created'''
+
+    doc_name: Optional[str]
+    '''The name of the document that anchors the path, if any'''
+
+    node_path_parts: Tuple[str, ...]
+    '''The node path elements, in traversal order'''
+
+    def __str__(self):
+        return self.path
+
+
+@functools.lru_cache(maxsize=_COMPILED_PATH_CACHE_SIZE)
+def compile_path(path: str) -> CompiledPath:
+    """Parses the specified path so that it can be navigated repeatedly without re-parsing.
+
+    Parsed paths are retained in a bounded cache, so repeated calls with the same path are inexpensive.
+
+    Args:
+        path: The path to parse. See :py:meth:`pkilint.document.PDUNode.navigate` for the path syntax.
+    """
+    m = PATH_REGEX.match(path)
+
+    if m is None:
+        raise ValueError(f'Invalid path syntax: "{path}"')
+
+    node_path = m.group('node_path')
+    node_path_parts = () if node_path is None else tuple(sys.intern(p) for p in node_path.split('.'))
+
+    return CompiledPath(path, m.group('doc_name'), node_path_parts)
+
+
+_SPAN_NOT_COMPUTED = object()
+
+
 class PDUNode:
     """Represents a node of a document."""
 
+    __slots__ = ('document', 'name', 'pdu', 'parent', '_children', '_path', '_substrate', '_span',)
+
     def __init__(self, document: Document, name: str, pdu: Asn1Type,
                  parent: Optional['PDUNode']
                  ):
@@ -103,15 +154,103 @@ class PDUNode:
         populated.
         """
         self.document = document
-        self.name = name
+        self.name = sys.intern(name)
         self.pdu = pdu
         self.parent = parent
-        if self.parent is None:
-            self.path = self.name
+
+        self._children = None
+        self._path = None
+        self._substrate = None
+        self._span = _SPAN_NOT_COMPUTED
+
+    @property
+    def path(self) -> str:
+        """The path of this node from the root of the document.
+
+        The path is built the first time it is requested and is then retained for subsequent lookups.
+        """
+        if self._path is None:
+            if self.parent is None:
+                self._path = self.name
+            else:
+                self._path = f'{self.parent.path}.{self.name}'
+
+        return self._path
+
+    @property
+    def children(self) -> Dict[str, 'PDUNode']:
+        """The child nodes of this node, keyed by node name.
+
+        Child nodes are created on first access, so subtrees that are never visited are never materialized.
+        """
+        if self._children is None:
+            self._children = self._generate_child_nodes()
+
+        return self._children
+
+    @children.setter
+    def children(self, value: Dict[str, 'PDUNode']):
+        self._children = value
+
+    @property
+    def substrate(self) -> Optional[bytes]:
+        """The DER-encoded substrate from which this node was decoded.
+
+        For nodes that were decoded from a nested substrate (such as the value of an extension), this is the nested
+        substrate rather than the substrate of the document.
+        """
+        node = self
+        while node is not None:
+            if node._substrate is not None:
+                return node._substrate
+
+            node = node.parent
+
+        return None
+
+    @property
+    def span(self) -> Optional[der.ByteSpan]:
+        """The offset and length of the DER encoding of this node within :py:attr:`substrate`.
+
+        The span is located the first time it is requested by walking the TLV headers of the encoding of the parent
+        node. None is returned if this node was not decoded from a substrate.
+        """
+        if self._span is _SPAN_NOT_COMPUTED:
+            if self._substrate is not None:
+                self._span = der.ByteSpan(0, len(self._substrate))
+            elif self.parent is None:
+                self._span = None
+            else:
+                parent_span = self.parent.span
+
+                if parent_span is None:
+                    self._span = None
+                else:
+                    self._span = der.find_component_span(
+                        self.parent.substrate, self.parent.pdu, parent_span, self.name
+                    )
+
+        return self._span
+
+    @property
+    def der(self) -> memoryview:
+        """The DER encoding of this node.
+
+        If the span of this node is known, then a zero-copy view of the substrate is returned. Otherwise, the value
+        of this node is encoded. Substrates are only accepted if they are equal to the DER encoding of their decoded
+        value (see :py:func:`pkilint.der.find_violation`), so the view is equal to the encoding of the value.
+        """
+        span = self.span
+
+        if span is None:
+            return memoryview(encode(self.pdu))
         else:
-            self.path = f'{self.parent.path}.{self.name}'
+            return memoryview(self.substrate)[span.offset:span.end]
 
-        self.children = self._generate_child_nodes()
+    @property
+    def is_materialized(self) -> bool:
+        """Whether the child nodes of this node have been created."""
+        return self._children is not None
 
     @property
     def parents(self) -> List['PDUNode']:
@@ -137,7 +276,7 @@ class PDUNode:
         else:
             return next(iter(self.children.items()))
 
-    def navigate(self, path: str) -> Union['PDUNode', Document]:
+    def navigate(self, path: Union[str, CompiledPath]) -> Union['PDUNode', Document]:
         """Navigates to a node or document (depending on the path specified).
 
         Elements within a path are separated by periods ("."). Paths may be absolute or relative. Relative paths can
@@ -153,20 +292,14 @@ class PDUNode:
         The node path element "^" navigates to the parent node.
 
         Args:
-            path: The requested path.
+            path: The requested path, either as a string or as returned by :py:func:`pkilint.document.compile_path`.
         """
-        requested_path = path
-
-        m = PATH_REGEX.match(path)
+        if not isinstance(path, CompiledPath):
+            path = compile_path(path)
 
-        if m is None:
-            raise ValueError(f'Invalid path syntax: "{path}"')
-
-        doc_name = m.group('doc_name')
-        if m.group('node_path') is None:
-            node_path_parts = []
-        else:
-            node_path_parts = m.group('node_path').split('.')
+        requested_path = path.path
+        doc_name = path.doc_name
+        node_path_parts = path.node_path_parts
 
         if doc_name is None:
             node = self
@@ -202,27 +335,26 @@ class PDUNode:
 
     def _generate_child_nodes(self):
         if isinstance(self.pdu, Choice):
-            name = self.pdu.getName()
-            return {name: PDUNode(
-                self.document, name, self.pdu.getComponent(), self
-            )
-            }
+            node = PDUNode(self.document, self.pdu.getName(), self.pdu.getComponent(), self)
+
+            return {node.name: node}
         elif isinstance(self.pdu, SequenceOfAndSetOfBase):
             # noinspection PyTypeChecker
-            return {
-                str(i): PDUNode(
-                    self.document, str(i), component, self
-                )
+            nodes = (
+                PDUNode(self.document, str(i), component, self)
                 for i, component in enumerate(self.pdu)
-            }
+            )
         elif isinstance(self.pdu, SequenceAndSetBase):
-            return {name: PDUNode(self.document, name, value, self)
-                    for name, value in self.pdu.items()
-                    if value.isValue
-                    }
+            nodes = (
+                PDUNode(self.document, name, value, self)
+                for name, value in self.pdu.items()
+                if value.isValue
+            )
         else:
             return {}
 
+        return {node.name: node for node in nodes}
+
     def __repr__(self):
         if self.document is not None and self.document.name is not None:
             path = f'{self.document.name}:{self.path}'
@@ -260,6 +392,57 @@ class NodeVisitor:
         return True
 
 
+class NodeVisitorIndex:
+    """Indexes a sequence of node visitors by the static criteria that they match on, so that only the visitors which
+    can possibly match a node are tested against it.
+
+    Visitors that specify a path are keyed by the last element of that path, and visitors that specify a PDU class are
+    keyed by that class. All other visitors are candidates for every node. Sub-classes of
+    :py:class:`pkilint.document.NodeVisitor` that override ``match`` must only narrow the set of nodes that the base
+    implementation matches (i.e., they must call ``super().match``).
+    """
+
+    def __init__(self, visitors: Sequence[NodeVisitor]):
+        self._by_name: Dict[str, List[Tuple[int, NodeVisitor]]] = {}
+        self._by_pdu_class: List[Tuple[int, NodeVisitor]] = []
+        self._residual: List[Tuple[int, NodeVisitor]] = []
+
+        for entry in enumerate(visitors):
+            _, visitor = entry
+
+            if visitor._path is not None:
+                name = visitor._path.rsplit('.', 1)[-1]
+
+                self._by_name.setdefault(name, []).append(entry)
+            elif visitor._pdu_class is not None:
+                self._by_pdu_class.append(entry)
+            else:
+                self._residual.append(entry)
+
+        self._by_pdu_type: Dict[type, List[Tuple[int, NodeVisitor]]] = {}
+
+    def _get_entries_for_pdu_type(self, pdu_type: type) -> List[Tuple[int, NodeVisitor]]:
+        entries = self._by_pdu_type.get(pdu_type)
+
+        if entries is None:
+            entries = [e for e in self._by_pdu_class if issubclass(pdu_type, e[1]._pdu_class)]
+            entries = sorted(entries + self._residual, key=operator.itemgetter(0))
+
+            self._by_pdu_type[pdu_type] = entries
+
+        return entries
+
+    def get_candidates(self, node: PDUNode) -> Iterator[NodeVisitor]:
+        """Returns the visitors that may match the specified node, in the order in which they were specified."""
+        entries = self._get_entries_for_pdu_type(type(node.pdu))
+
+        name_entries = self._by_name.get(node.name)
+        if name_entries is not None:
+            entries = heapq.merge(entries, name_entries)
+
+        return map(operator.itemgetter(1), entries)
+
+
 def get_node_name_for_pdu(pdu: Asn1Type) -> str:
     name = pdu.__class__.__name__
     # convert PDU class name to camelCase
@@ -290,6 +473,91 @@ class SubstrateDecodingFailedError(ValueError):
         return message
 
 
+class DecodeCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class DecodeCache:
+    """A bounded LRU cache of decoded substrates, keyed by schema and substrate octets.
+
+    Issuing CAs repeat byte-identical issuer names, extension values, and policy blocks across the documents that they
+    sign, so a long-lived process that lints many documents can avoid decoding the same substrate repeatedly. Cached
+    pyasn1 values are shared by every document that contains the substrate, but each document receives its own
+    PDUNode subtree. Consequently, validators must not mutate decoded values.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError('Decode cache size must be positive')
+
+        self.maxsize = maxsize
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def create_key(substrate, pdu_instance: Asn1Type):
+        return pdu_instance.__class__, pdu_instance.tagSet, bytes(substrate)
+
+    def get(self, key) -> Optional[Tuple[Asn1Type, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+
+            return entry
+
+    def put(self, key, decoded: Asn1Type, decoded_pdu_name: str):
+        with self._lock:
+            self._entries[key] = (decoded, decoded_pdu_name)
+            self._entries.move_to_end(key)
+
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def cache_info(self) -> DecodeCacheInfo:
+        with self._lock:
+            return DecodeCacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
+
+
+_DECODE_CACHE: Optional[DecodeCache] = None
+
+
+def enable_decode_cache(maxsize: int) -> DecodeCache:
+    """Enables the process-wide decode cache that is used by :py:func:`decode_substrate`. Decoded substrates are not
+    cached unless the cache is enabled."""
+    global _DECODE_CACHE
+
+    _DECODE_CACHE = DecodeCache(maxsize)
+
+    return _DECODE_CACHE
+
+
+def disable_decode_cache():
+    global _DECODE_CACHE
+
+    _DECODE_CACHE = None
+
+
+def get_decode_cache() -> Optional[DecodeCache]:
+    return _DECODE_CACHE
+
+
 def decode_substrate(source_document: Document, substrate: bytes,
                      pdu_instance: Asn1Type, parent_node: Optional[PDUNode] = None) -> PDUNode:
     if parent_node is not None and any(parent_node.children):
@@ -298,7 +566,17 @@ def decode_substrate(source_document: Document, substrate: bytes,
                      )
         return next(iter(parent_node.children.values()))
 
-    if _USE_PYASN1_FASDER:
+    decode_cache = _DECODE_CACHE
+    if decode_cache is not None:
+        cache_key = DecodeCache.create_key(substrate, pdu_instance)
+
+        cache_entry = decode_cache.get(cache_key)
+    else:
+        cache_key, cache_entry = None, None
+
+    if cache_entry is not None:
+        decoded, decoded_pdu_name = cache_entry
+    elif _USE_PYASN1_FASDER:
         try:
             decoded, _ = decode_der(substrate, asn1Spec=pdu_instance)
         except (ValueError, PyAsn1Error) as e:
@@ -324,20 +602,19 @@ def decode_substrate(source_document: Document, substrate: bytes,
                     f'{len(rest)} unexpected octet(s) following "{type_name}" TLV: "{rest_hex}"'
                 )
 
-        try:
-            encoded = encode(decoded)
-
-            substrate_is_der = encoded == substrate
-        except (ValueError, PyAsn1Error):
-            substrate_is_der = False
+        der_violation = der.find_violation(substrate, decoded)
 
-        if not substrate_is_der:
+        if der_violation is not None:
             raise SubstrateDecodingFailedError(
                 source_document, pdu_instance, parent_node,
-                f'Substrate of type "{type_name}" is not DER-encoded'
+                f'Substrate of type "{type_name}" is not DER-encoded: {der_violation}'
             )
 
+    if cache_key is not None and cache_entry is None:
+        decode_cache.put(cache_key, decoded, decoded_pdu_name)
+
     node = PDUNode(source_document, decoded_pdu_name, decoded, parent_node)
+    node._substrate = substrate if isinstance(substrate, bytes) else bytes(substrate)
 
     if parent_node is not None:
         parent_node.children[decoded_pdu_name] = node
@@ -368,6 +645,9 @@ class ValueDecoder:
         self.type_mappings = type_mappings.copy()
         self.default = default
 
+        self._type_path = compile_path(type_path)
+        self._value_path = compile_path(value_path)
+
     def filter_value(self, node, type_node, value_node, pdu_type):
         if self._BITSTRING_SCHEMA_OBJ.isSuperTypeOf(value_node.pdu):
             return value_node.pdu.asOctets()
@@ -375,10 +655,10 @@ class ValueDecoder:
             return value_node.pdu
 
     def __call__(self, node):
-        type_node = node.navigate(self.type_path)
+        type_node = node.navigate(self._type_path)
 
         try:
-            value_node = node.navigate(self.value_path)
+            value_node = node.navigate(self._value_path)
         except PDUNavigationFailedError:
             value_node = None
 
@@ -444,6 +724,15 @@ class ValidityPeriodStartRetriever:
     def __call__(self, *args, **kwargs) -> datetime.datetime:
         pass
 
+    # retrievers that are equal select the same validity period start, which allows them to be used as cache keys.
+    # Retrievers are compared by their type and instance state, so subclasses that hold state (such as a fixed start
+    # date) must hold hashable values
+    def __eq__(self, other):
+        return type(self) is type(other) and vars(self) == vars(other)
+
+    def __hash__(self):
+        return hash((type(self), tuple(sorted(vars(self).items()))))
+
 
 class StaticValidityPeriodStartRetriever(ValidityPeriodStartRetriever):
     def __init__(self, validity_period_start: datetime.datetime):
@@ -1,6 +1,7 @@
-from typing import List, Sequence, Tuple, NamedTuple
+from typing import List, Tuple, NamedTuple, Optional, Iterable, Iterator, Union, Dict
 
-from pkilint.validation import ValidationResult, ValidationFinding, ValidationFindingDescription
+from pkilint.validation import (ValidationResult, ValidationFinding, ValidationFindingDescription, FailFastCondition,
+                                ValidationFindingSeverity)
 
 
 class FindingDescriptionFilter:
@@ -26,31 +27,143 @@ class ValidationFindingFilter(FindingDescriptionFilter):
         return self._validation_finding != finding_description.finding
 
 
-def filter_results(filters: List[FindingDescriptionFilter], results: Sequence[ValidationResult]) -> Tuple[
+class FindingDescriptionFilterIndex:
+    """Determines which filter (if any) excludes a finding description.
+
+    Filters that exclude a single finding (instances of :py:class:`ValidationFindingFilter` that do not override
+    :py:meth:`ValidationFindingFilter.filter`) are indexed by that finding, so a finding description is checked against
+    them with one lookup. The remaining filters are evaluated in order. If multiple filters exclude a finding
+    description, then the filter that appears first in the list of filters is returned.
+    """
+
+    def __init__(self, filters: List[FindingDescriptionFilter]):
+        self.filters = filters
+
+        self._indexed_filters: Dict[ValidationFinding, Tuple[int, ValidationFindingFilter]] = {}
+        self._general_filters: List[Tuple[int, FindingDescriptionFilter]] = []
+
+        for position, f in enumerate(filters):
+            if isinstance(f, ValidationFindingFilter) and type(f).filter is ValidationFindingFilter.filter:
+                self._indexed_filters.setdefault(f._validation_finding, (position, f))
+            else:
+                self._general_filters.append((position, f))
+
+    def find_excluding_filter(self, result: ValidationResult, finding_description: ValidationFindingDescription
+                              ) -> Optional[FindingDescriptionFilter]:
+        indexed_position, indexed_filter = self._indexed_filters.get(
+            finding_description.finding, (len(self.filters), None)
+        )
+
+        for position, f in self._general_filters:
+            if position > indexed_position:
+                break
+
+            if not f.filter(result, finding_description):
+                return f
+
+        return indexed_filter
+
+
+FindingDescriptionFilters = Union[List[FindingDescriptionFilter], FindingDescriptionFilterIndex]
+
+
+def create_filter_index(filters: FindingDescriptionFilters) -> FindingDescriptionFilterIndex:
+    """Indexes the specified filters. If the filters are already indexed, then they are returned as-is."""
+    if isinstance(filters, FindingDescriptionFilterIndex):
+        return filters
+    else:
+        return FindingDescriptionFilterIndex(filters)
+
+
+class FilteredFailFastCondition(FailFastCondition):
+    """A fail-fast condition that disregards findings that are excluded by the specified filters, so that validation
+    is not stopped by a finding that would not be reported."""
+
+    def __init__(self, filters: FindingDescriptionFilters,
+                 severity: ValidationFindingSeverity = ValidationFindingSeverity.ERROR):
+        super().__init__(severity)
+
+        self._filter_index = create_filter_index(filters)
+
+    def is_blocking_finding(self, result, finding_description):
+        return (
+            super().is_blocking_finding(result, finding_description) and
+            self._filter_index.find_excluding_filter(result, finding_description) is None
+        )
+
+
+def create_fail_fast_condition(severity: Optional[ValidationFindingSeverity],
+                               filters: Optional[FindingDescriptionFilters] = None
+                               ) -> Optional[FailFastCondition]:
+    """Creates a fail-fast condition for the specified severity, or returns None if no severity is specified"""
+    if severity is None:
+        return None
+    elif filters is not None and any(create_filter_index(filters).filters):
+        return FilteredFailFastCondition(filters, severity)
+    else:
+        return FailFastCondition(severity)
+
+
+def _filter_result(filter_index: FindingDescriptionFilterIndex, result: ValidationResult
+                   ) -> Tuple[ValidationResult, Optional[ResultWithExcludedFindingDescriptions]]:
+    finding_descriptions = result.finding_descriptions
+
+    for first_excluded_index, finding_description in enumerate(finding_descriptions):
+        excluding_filter = filter_index.find_excluding_filter(result, finding_description)
+
+        if excluding_filter is not None:
+            break
+    else:
+        # nothing was excluded, so the result is returned as-is
+        return result, None
+
+    included_finding_descriptions = list(finding_descriptions[:first_excluded_index])
+    filtered_finding_descriptions = [(excluding_filter, finding_description,)]
+
+    for finding_description in finding_descriptions[first_excluded_index + 1:]:
+        excluding_filter = filter_index.find_excluding_filter(result, finding_description)
+
+        if excluding_filter is None:
+            included_finding_descriptions.append(finding_description)
+        else:
+            filtered_finding_descriptions.append((excluding_filter, finding_description,))
+
+    result_with_exclusions = ResultWithExcludedFindingDescriptions(
+        ValidationResult(result.validator, result.node, [fafd[1] for fafd in filtered_finding_descriptions]),
+        filtered_finding_descriptions
+    )
+
+    return ValidationResult(result.validator, result.node, included_finding_descriptions), result_with_exclusions
+
+
+def filter_results(filters: FindingDescriptionFilters, results: Iterable[ValidationResult]) -> Tuple[
         List[ValidationResult], List[ResultWithExcludedFindingDescriptions]]:
+    filter_index = create_filter_index(filters)
+
     filtered_results = []
     results_with_exclusions = []
 
     for result in results:
-        included_finding_descriptions = []
-        filtered_finding_descriptions = []
+        filtered_result, result_with_exclusions = _filter_result(filter_index, result)
 
-        for finding_description in result.finding_descriptions:
-            excluding_filter = next((f for f in filters if not f.filter(result, finding_description)), None)
+        filtered_results.append(filtered_result)
 
-            if excluding_filter is None:
-                included_finding_descriptions.append(finding_description)
-            else:
-                filtered_finding_descriptions.append((excluding_filter, finding_description,))
+        if result_with_exclusions is not None:
+            results_with_exclusions.append(result_with_exclusions)
 
-        if any(filtered_finding_descriptions):
-            results_with_exclusions.append(ResultWithExcludedFindingDescriptions(
-                ValidationResult(result.validator, result.node, [fafd[1] for fafd in filtered_finding_descriptions]),
-                filtered_finding_descriptions
-            ))
+    return filtered_results, results_with_exclusions
 
-            filtered_results.append(ValidationResult(result.validator, result.node, included_finding_descriptions))
-        else:
-            filtered_results.append(result)
 
-    return filtered_results, results_with_exclusions
+def iter_filter_results(filters: FindingDescriptionFilters, results: Iterable[ValidationResult],
+                        include_empty_results: bool = True) -> Iterator[ValidationResult]:
+    """Filters results as they are produced. Unlike :py:func:`filter_results`, the excluded findings are discarded.
+
+    If include_empty_results is False, then results that contain no findings once filtered are not yielded.
+    """
+    filter_index = create_filter_index(filters)
+
+    for result in results:
+        filtered_result, _ = _filter_result(filter_index, result)
+
+        if include_empty_results or any(filtered_result.finding_descriptions):
+            yield filtered_result
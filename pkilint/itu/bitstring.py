@@ -22,7 +22,7 @@ class NamedBitStringMinimalEncodingValidator(validation.Validator):
 
         asserted_values = ','.join((k for k in node.pdu.namedValues.keys() if has_named_bit(node, k)))
 
-        encoded = encode(node.pdu)
+        encoded = bytes(node.der)
 
         new_encoded = encode(type(node.pdu)(asserted_values), asn1Spec=node.pdu)
 
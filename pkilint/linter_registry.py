@@ -0,0 +1,332 @@
+import threading
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from pkilint import document, finding_filter, etsi, pkix, validation
+from pkilint.cabf import serverauth, smime
+from pkilint.cabf.serverauth import serverauth_constants
+from pkilint.cabf.smime import smime_constants
+from pkilint.etsi import etsi_constants
+from pkilint.pkix import certificate, crl, ocsp, name, extension
+from pkilint.pkix.certificate import certificate_validity
+
+
+class LinterKey(NamedTuple):
+    profile: str
+    '''The name of the profile (such as "cabf-serverauth")'''
+
+    linter_name: str
+    '''The name of the linter within the profile (such as the certificate type option string)'''
+
+    validity_period_start_retriever: Optional[document.ValidityPeriodStartRetriever]
+    '''The validity period start strategy, or None if the profile does not use one'''
+
+
+class PrebuiltLinter(NamedTuple):
+    key: LinterKey
+    '''The key under which the linter is registered'''
+
+    validator: validation.ValidatorContainer
+    '''The fully built validator container'''
+
+    finding_filters: List[finding_filter.FindingDescriptionFilter]
+    '''The finding filters that are applied to results unless all findings are requested'''
+
+    def select_finding_codes(self, code_patterns: List[str]) -> 'PrebuiltLinter':
+        """Returns a linter that executes only the validators that may report findings with codes that match any of the
+        specified shell-style patterns, along with the decoding validators that they may depend upon."""
+        return self._replace(validator=validation.select_validators_by_finding_code(self.validator, code_patterns))
+
+    def create_fail_fast_condition(self, severity: validation.ValidationFindingSeverity,
+                                   report_all: bool = False) -> validation.FailFastCondition:
+        """Creates a fail-fast condition that is not triggered by findings that the linter's filters exclude"""
+        return finding_filter.create_fail_fast_condition(severity, None if report_all else self.finding_filters)
+
+    def validate(self, doc: document.Document, report_all: bool = False,
+                 severity_threshold: Optional[validation.ValidationFindingSeverity] = None,
+                 fail_fast: Optional[validation.FailFastCondition] = None
+                 ) -> List[validation.ValidationResult]:
+        results = self.validator.validate(doc.root, severity_threshold, fail_fast)
+
+        if not report_all and any(self.finding_filters):
+            results, _ = finding_filter.filter_results(self.finding_filters, results)
+
+        return results
+
+    def iter_validate(self, doc: document.Document, report_all: bool = False,
+                      severity_threshold: Optional[validation.ValidationFindingSeverity] = None,
+                      fail_fast: Optional[validation.FailFastCondition] = None,
+                      include_empty_results: bool = True
+                      ) -> Iterator[validation.ValidationResult]:
+        """Lints the specified document, yielding results as they are produced"""
+        results = self.validator.iter_validate(doc.root, severity_threshold, fail_fast, include_empty_results)
+
+        if not report_all and any(self.finding_filters):
+            results = finding_filter.iter_filter_results(self.finding_filters, results, include_empty_results)
+
+        return results
+
+
+class LinterProfile:
+    """Describes how the linters of a profile are built.
+
+    Validators that do not vary by linter (such as decoding validators) are built once per profile by
+    :py:meth:`create_shared_validators` and are shared by every linter in the profile.
+    """
+
+    name: str = None
+
+    uses_validity_period_start = False
+
+    @property
+    def linter_names(self) -> List[str]:
+        pass
+
+    def create_shared_validators(self) -> Optional[List[validation.Validator]]:
+        return None
+
+    def create_validator(self, linter_name: str, shared_validators: Optional[List[validation.Validator]],
+                         validity_period_start_retriever: Optional[document.ValidityPeriodStartRetriever]
+                         ) -> validation.ValidatorContainer:
+        pass
+
+    def create_finding_filters(self, linter_name: str) -> List[finding_filter.FindingDescriptionFilter]:
+        return []
+
+    def normalize_linter_name(self, linter_name: str) -> str:
+        try:
+            return next(n for n in self.linter_names if n.casefold() == linter_name.casefold())
+        except StopIteration:
+            raise ValueError(f'Unknown linter for profile "{self.name}": "{linter_name}"')
+
+
+class PkixCertificateLinterProfile(LinterProfile):
+    name = 'pkix-cert'
+
+    @property
+    def linter_names(self):
+        return ['PKIX']
+
+    def create_validator(self, linter_name, shared_validators, validity_period_start_retriever):
+        return certificate.create_pkix_certificate_validator_container(
+            certificate.create_decoding_validators(name.ATTRIBUTE_TYPE_MAPPINGS, extension.EXTENSION_MAPPINGS),
+            [
+                certificate.create_issuer_validator_container([]),
+                certificate.create_validity_validator_container(),
+                certificate.create_subject_validator_container([]),
+                certificate.create_extensions_validator_container([]),
+            ]
+        )
+
+
+class CabfServerauthLinterProfile(LinterProfile):
+    name = 'cabf-serverauth'
+
+    uses_validity_period_start = True
+
+    @property
+    def linter_names(self):
+        return [t.to_option_str for t in serverauth_constants.CertificateType]
+
+    def create_shared_validators(self):
+        return serverauth.create_decoding_validators()
+
+    def create_validator(self, linter_name, shared_validators, validity_period_start_retriever):
+        cert_type = serverauth_constants.CertificateType.from_option_str(linter_name)
+
+        return certificate.create_pkix_certificate_validator_container(
+            shared_validators,
+            serverauth.create_validators(cert_type, validity_period_start_retriever)
+        )
+
+    def create_finding_filters(self, linter_name):
+        return serverauth.create_serverauth_finding_filters(
+            serverauth_constants.CertificateType.from_option_str(linter_name)
+        )
+
+
+class CabfSmimeLinterProfile(LinterProfile):
+    name = 'cabf-smime'
+
+    @property
+    def linter_names(self):
+        return [f'{v}-{g}' for v in smime_constants.ValidationLevel for g in smime_constants.Generation]
+
+    def create_shared_validators(self):
+        return smime.create_decoding_validators()
+
+    def create_validator(self, linter_name, shared_validators, validity_period_start_retriever):
+        validation_level, generation = linter_name.split('-', maxsplit=1)
+
+        return certificate.create_pkix_certificate_validator_container(
+            shared_validators,
+            smime.create_subscriber_validators(
+                smime_constants.ValidationLevel[validation_level],
+                smime_constants.Generation[generation]
+            )
+        )
+
+
+class EtsiLinterProfile(LinterProfile):
+    name = 'etsi'
+
+    uses_validity_period_start = True
+
+    @property
+    def linter_names(self):
+        return [t.to_option_str for t in etsi_constants.CertificateType]
+
+    def create_validator(self, linter_name, shared_validators, validity_period_start_retriever):
+        cert_type = etsi_constants.CertificateType.from_option_str(linter_name)
+
+        # the set of decoders varies by certificate type, so they are not shared
+        return certificate.create_pkix_certificate_validator_container(
+            etsi.create_decoding_validators(cert_type),
+            etsi.create_validators(cert_type, validity_period_start_retriever)
+        )
+
+    def create_finding_filters(self, linter_name):
+        return etsi.create_etsi_finding_filters(etsi_constants.CertificateType.from_option_str(linter_name))
+
+
+class PkixCrlLinterProfile(LinterProfile):
+    name = 'pkix-crl'
+
+    @property
+    def linter_names(self):
+        return ['PKIX']
+
+    def create_validator(self, linter_name, shared_validators, validity_period_start_retriever):
+        return crl.create_pkix_crl_validator_container(
+            [
+                pkix.create_attribute_decoder(name.ATTRIBUTE_TYPE_MAPPINGS),
+                pkix.create_extension_decoder(extension.EXTENSION_MAPPINGS),
+            ],
+            [
+                crl.create_issuer_validator_container([]),
+                crl.create_validity_validator_container([]),
+                crl.create_extensions_validator_container([]),
+            ]
+        )
+
+
+class PkixOcspResponseLinterProfile(LinterProfile):
+    name = 'pkix-ocsp'
+
+    @property
+    def linter_names(self):
+        return ['PKIX']
+
+    def create_validator(self, linter_name, shared_validators, validity_period_start_retriever):
+        return ocsp.create_pkix_ocsp_response_validator_container(
+            [
+                ocsp.create_response_decoder(),
+                pkix.create_attribute_decoder(name.ATTRIBUTE_TYPE_MAPPINGS),
+                pkix.create_extension_decoder(extension.EXTENSION_MAPPINGS),
+            ],
+            []
+        )
+
+
+LINTER_PROFILES = {
+    p.name: p for p in (
+        PkixCertificateLinterProfile(),
+        CabfServerauthLinterProfile(),
+        CabfSmimeLinterProfile(),
+        EtsiLinterProfile(),
+        PkixCrlLinterProfile(),
+        PkixOcspResponseLinterProfile(),
+    )
+}
+
+
+class LinterRegistry:
+    """Memoizes fully built linters.
+
+    Linters are built lazily on first use and are keyed by profile, linter name, and validity period start strategy.
+    A long-lived process therefore pays the cost of building a linter once, and only for the linters that it uses.
+    Validators are stateless, so a built linter can be shared freely by callers (including concurrently executing
+    threads).
+    """
+
+    def __init__(self, profiles: Optional[Dict[str, LinterProfile]] = None):
+        if profiles is None:
+            profiles = LINTER_PROFILES
+
+        self._profiles = profiles
+        self._linters: Dict[LinterKey, PrebuiltLinter] = {}
+        self._shared_validators: Dict[str, Optional[List[validation.Validator]]] = {}
+        self._lock = threading.Lock()
+
+    def get_profile(self, profile_name: str) -> LinterProfile:
+        try:
+            return self._profiles[profile_name.casefold()]
+        except KeyError:
+            raise ValueError(f'Unknown linter profile: "{profile_name}"')
+
+    def create_key(self, profile_name: str, linter_name: str,
+                   validity_period_start_retriever: Optional[document.ValidityPeriodStartRetriever] = None
+                   ) -> LinterKey:
+        profile = self.get_profile(profile_name)
+
+        if not profile.uses_validity_period_start:
+            validity_period_start_retriever = None
+        elif validity_period_start_retriever is None:
+            validity_period_start_retriever = certificate_validity.CertificateValidityPeriodStartRetriever()
+
+        return LinterKey(profile.name, profile.normalize_linter_name(linter_name), validity_period_start_retriever)
+
+    def get_linter(self, profile_name: str, linter_name: str,
+                   validity_period_start_retriever: Optional[document.ValidityPeriodStartRetriever] = None
+                   ) -> PrebuiltLinter:
+        key = self.create_key(profile_name, linter_name, validity_period_start_retriever)
+
+        linter = self._linters.get(key)
+        if linter is not None:
+            return linter
+
+        with self._lock:
+            linter = self._linters.get(key)
+
+            if linter is None:
+                linter = self._build_linter(key)
+
+                self._linters[key] = linter
+
+        return linter
+
+    def _build_linter(self, key: LinterKey) -> PrebuiltLinter:
+        profile = self._profiles[key.profile]
+
+        if key.profile not in self._shared_validators:
+            self._shared_validators[key.profile] = profile.create_shared_validators()
+
+        validator = profile.create_validator(
+            key.linter_name, self._shared_validators[key.profile], key.validity_period_start_retriever
+        )
+
+        return PrebuiltLinter(key, validator, profile.create_finding_filters(key.linter_name))
+
+    @property
+    def built_keys(self) -> List[LinterKey]:
+        """The keys of the linters that have been built."""
+        return list(self._linters.keys())
+
+    def clear(self):
+        with self._lock:
+            self._linters.clear()
+            self._shared_validators.clear()
+
+
+_DEFAULT_REGISTRY = LinterRegistry()
+
+
+def get_default_registry() -> LinterRegistry:
+    """Returns the process-wide linter registry."""
+    return _DEFAULT_REGISTRY
+
+
+def get_linter(profile_name: str, linter_name: str,
+               validity_period_start_retriever: Optional[document.ValidityPeriodStartRetriever] = None
+               ) -> PrebuiltLinter:
+    """Retrieves the specified linter from the process-wide linter registry, building it if necessary."""
+    return _DEFAULT_REGISTRY.get_linter(profile_name, linter_name, validity_period_start_retriever)
@@ -1,17 +1,41 @@
 import base64
+import mmap
+import os
 import re
+from typing import Iterator, NamedTuple
 
+from pkilint import der, document
 from pkilint.pkix.certificate import RFC5280Certificate
 from pkilint.pkix.crl import RFC5280CertificateList
 from pkilint.pkix.ocsp import RFC6960OCSPResponse
 
 
+class DocumentSubstrate(NamedTuple):
+    offset: int
+    '''The offset of the first octet of the document (or its PEM block) in the input'''
+
+    substrate: bytes
+    '''The DER encoding of the document'''
+
+
+class LoadedDocument(NamedTuple):
+    offset: int
+    '''The offset of the first octet of the document (or its PEM block) in the input'''
+
+    document: document.Document
+    '''The decoded document'''
+
+
+_NON_WHITESPACE_RE = re.compile(rb'\S')
+
+
 class DocumentLoader:
     def __init__(self, document_cls, document_pem_label: str):
         self._document_cls = document_cls
         self._document_pem_label = document_pem_label.upper()
 
         self._pem_re = self._create_pem_re()
+        self._pem_block_re = self._create_pem_block_re()
 
     def _create_pem_re(self) -> re.Pattern:
         ascii_armor_start = f'-----BEGIN {self._document_pem_label}-----'
@@ -19,6 +43,12 @@ class DocumentLoader:
 
         return re.compile(f'^\\s*{ascii_armor_start}(?P<pem>.+){ascii_armor_end}\\s*$', re.DOTALL)
 
+    def _create_pem_block_re(self) -> re.Pattern:
+        ascii_armor_start = f'-----BEGIN {self._document_pem_label}-----'.encode()
+        ascii_armor_end = f'-----END {self._document_pem_label}-----'.encode()
+
+        return re.compile(re.escape(ascii_armor_start) + rb'(?P<pem>.*?)' + re.escape(ascii_armor_end), re.DOTALL)
+
     def load_der_document(self, substrate: bytes, document_name: str = None, substrate_source: str = None, parent=None):
         if not substrate.startswith(b'\x30'):
             raise ValueError('Substrate is not DER-encoded')
@@ -44,15 +74,17 @@ class DocumentLoader:
 
         return self.load_b64_document(data, document_name, substrate_source, parent)
 
-    def load_pem_document(self, substrate: str, document_name: str = None, substrate_source: str = None, parent=None):
+    def pem_to_der(self, substrate: str) -> bytes:
+        """Returns the DER encoding of the document in the specified PEM text without decoding the document"""
         m = self._pem_re.match(substrate)
 
         if m is None:
             raise ValueError('Invalid PEM text')
 
-        b64_text = m.group('pem')
+        return base64.b64decode(m.group('pem'))
 
-        return self.load_b64_document(b64_text, document_name, substrate_source, parent)
+    def load_pem_document(self, substrate: str, document_name: str = None, substrate_source: str = None, parent=None):
+        return self.load_der_document(self.pem_to_der(substrate), document_name, substrate_source, parent)
 
     def load_pem_file(self, f, document_name: str = None, substrate_source: str = None, parent=None):
         data = f.read()
@@ -62,6 +94,63 @@ class DocumentLoader:
 
         return self.load_pem_document(data, document_name, substrate_source, parent)
 
+    def iter_pem_substrates(self, data) -> Iterator[DocumentSubstrate]:
+        """Yields the DER encoding of each document in the PEM blocks of the specified octets, such as a PEM bundle or
+        a log file in which PEM blocks are embedded. Text outside of the PEM blocks is ignored.
+
+        The data may be any object that supports the buffer protocol, such as a memory-mapped file.
+        """
+        for m in self._pem_block_re.finditer(data):
+            try:
+                yield DocumentSubstrate(m.start(), base64.b64decode(m.group('pem')))
+            except ValueError as e:
+                raise ValueError(f'Invalid PEM block at offset {m.start()}') from e
+
+    @staticmethod
+    def iter_der_substrates(data) -> Iterator[DocumentSubstrate]:
+        """Yields the DER encoding of each document in the specified concatenation of DER-encoded documents. Only the
+        TLV headers are read to find the documents.
+
+        The data may be any object that supports the buffer protocol, such as a memory-mapped file.
+        """
+        for span in der.iter_top_level_spans(data):
+            yield DocumentSubstrate(span.offset, bytes(data[span.offset:span.end]))
+
+    def iter_substrates(self, data) -> Iterator[DocumentSubstrate]:
+        """Yields the DER encoding of each document in the specified octets, which are either a concatenation of
+        DER-encoded documents or text that contains PEM blocks"""
+        m = _NON_WHITESPACE_RE.search(data)
+
+        if m is None:
+            return
+        elif data[m.start()] == 0x30:
+            yield from self.iter_der_substrates(data)
+        else:
+            yield from self.iter_pem_substrates(data)
+
+    def iter_documents(self, data, document_name: str = None, substrate_source: str = None,
+                       parent=None) -> Iterator[LoadedDocument]:
+        """Decodes and yields each document in the specified octets, which are either a concatenation of DER-encoded
+        documents or text that contains PEM blocks. Documents are decoded as they are yielded."""
+        for offset, substrate in self.iter_substrates(data):
+            yield LoadedDocument(offset, self.load_der_document(substrate, document_name, substrate_source, parent))
+
+    def iter_file_documents(self, path: str, document_name: str = None, substrate_source: str = None,
+                            parent=None) -> Iterator[LoadedDocument]:
+        """Decodes and yields each document in the specified file, which is either a concatenation of DER-encoded
+        documents or text that contains PEM blocks. The file is memory-mapped rather than read, so that files that
+        are larger than the available memory can be processed."""
+        if substrate_source is None:
+            substrate_source = path
+
+        with open(path, 'rb') as f:
+            # empty files cannot be memory-mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield from self.iter_documents(data, document_name, substrate_source, parent)
+
     @classmethod
     def _is_ascii_armor_start_present(cls, substrate: str):
         first_significant_char = next((c for c in substrate if not c.isspace()), None)
@@ -96,33 +185,42 @@ class DocumentLoader:
 _RFC5280_CERTIFICATE_LOADER = DocumentLoader(RFC5280Certificate, 'CERTIFICATE')
 load_der_certificate = _RFC5280_CERTIFICATE_LOADER.load_der_document
 load_pem_certificate = _RFC5280_CERTIFICATE_LOADER.load_pem_document
+pem_certificate_to_der = _RFC5280_CERTIFICATE_LOADER.pem_to_der
 load_b64_certificate = _RFC5280_CERTIFICATE_LOADER.load_b64_document
 load_certificate = _RFC5280_CERTIFICATE_LOADER.load_document_or_file
 load_der_certificate_file = _RFC5280_CERTIFICATE_LOADER.load_der_file
 load_pem_certificate_file = _RFC5280_CERTIFICATE_LOADER.load_pem_file
 load_b64_certificate_file = _RFC5280_CERTIFICATE_LOADER.load_b64_file
 load_certificate_file = _RFC5280_CERTIFICATE_LOADER.load_file
+iter_certificates = _RFC5280_CERTIFICATE_LOADER.iter_documents
+iter_certificates_in_file = _RFC5280_CERTIFICATE_LOADER.iter_file_documents
 
 
 # RFC 5280 CRL
 _RFC5280_CERTIFICATE_LIST_LOADER = DocumentLoader(RFC5280CertificateList, 'X509 CRL')
 load_der_crl = _RFC5280_CERTIFICATE_LIST_LOADER.load_der_document
 load_pem_crl = _RFC5280_CERTIFICATE_LIST_LOADER.load_pem_document
+pem_crl_to_der = _RFC5280_CERTIFICATE_LIST_LOADER.pem_to_der
 load_b64_crl = _RFC5280_CERTIFICATE_LIST_LOADER.load_b64_document
 load_crl = _RFC5280_CERTIFICATE_LIST_LOADER.load_document_or_file
 load_der_crl_file = _RFC5280_CERTIFICATE_LIST_LOADER.load_der_file
 load_pem_crl_file = _RFC5280_CERTIFICATE_LIST_LOADER.load_pem_file
 load_b64_crl_file = _RFC5280_CERTIFICATE_LIST_LOADER.load_b64_file
 load_crl_file = _RFC5280_CERTIFICATE_LIST_LOADER.load_file
+iter_crls = _RFC5280_CERTIFICATE_LIST_LOADER.iter_documents
+iter_crls_in_file = _RFC5280_CERTIFICATE_LIST_LOADER.iter_file_documents
 
 
 # RFC 6960 OCSP Response
 _RFC6960_OCSP_RESPONSE_LOADER = DocumentLoader(RFC6960OCSPResponse, 'OCSP RESPONSE')
 load_der_ocsp_response = _RFC6960_OCSP_RESPONSE_LOADER.load_der_document
 load_pem_ocsp_response = _RFC6960_OCSP_RESPONSE_LOADER.load_pem_document
+pem_ocsp_response_to_der = _RFC6960_OCSP_RESPONSE_LOADER.pem_to_der
 load_b64_ocsp_response = _RFC6960_OCSP_RESPONSE_LOADER.load_b64_document
 load_ocsp_response = _RFC6960_OCSP_RESPONSE_LOADER.load_document_or_file
 load_der_ocsp_response_file = _RFC6960_OCSP_RESPONSE_LOADER.load_der_file
 load_pem_ocsp_response_file = _RFC6960_OCSP_RESPONSE_LOADER.load_pem_file
 load_b64_ocsp_response_file = _RFC6960_OCSP_RESPONSE_LOADER.load_b64_file
 load_ocsp_response_file = _RFC6960_OCSP_RESPONSE_LOADER.load_file
+iter_ocsp_responses = _RFC6960_OCSP_RESPONSE_LOADER.iter_documents
+iter_ocsp_responses_in_file = _RFC6960_OCSP_RESPONSE_LOADER.iter_file_documents
@@ -1,6 +1,5 @@
 import binascii
 
-from pyasn1.codec.der.encoder import encode
 from pyasn1.type import univ
 from pyasn1_alt_modules import rfc4055, rfc5280, rfc5480, rfc8410
 
@@ -90,7 +89,7 @@ class AllowedSignatureAlgorithmEncodingValidator(validation.Validator):
         )
 
     def validate(self, node):
-        encoded = encode(node.pdu)
+        encoded = bytes(node.der)
         if encoded not in self._allowed_encodings:
             encoded_str = binascii.hexlify(encoded).decode('us-ascii')
             try:
@@ -6,7 +6,6 @@ from cryptography import x509, exceptions
 from cryptography.hazmat.primitives.asymmetric import (
     padding, rsa, dsa, ec, ed25519, ed448
 )
-from pyasn1.codec.der.encoder import encode
 from pyasn1.type import univ
 from pyasn1.type.base import Asn1Type
 from pyasn1_alt_modules import rfc5280, rfc3739
@@ -95,7 +94,7 @@ class RFC5280Certificate(Document):
         issuer_node = self.root.navigate('tbsCertificate.issuer')
         subject_node = self.root.navigate('tbsCertificate.subject')
 
-        return encode(issuer_node.pdu) == encode(subject_node.pdu)
+        return issuer_node.der == subject_node.der
 
     @functools.cached_property
     def is_self_signed(self):
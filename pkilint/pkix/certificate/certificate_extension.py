@@ -42,7 +42,7 @@ class BasicConstraintsValidator(validation.Validator):
         if not is_ca and 'pathLenConstraint' in node.children:
             raise validation.ValidationFindingEncountered(
                 self.VALIDATION_ILLEGAL_PATHLEN_SET,
-                f'Certificate is end-entity but has pathLenConstraint of '
+                lambda: f'Certificate is end-entity but has pathLenConstraint of '
                 f'{int(node.children["pathLenConstraint"].pdu)} set'
             )
 
@@ -392,11 +392,9 @@ class DuplicatePolicyValidator(validation.Validator):
         ]
 
         if len(duplicates) > 0:
-            dups_str = ', '.join(map(str, duplicates))
-
             raise validation.ValidationFindingEncountered(
                 self.VALIDATION_DUPLICATE_POLICIES,
-                f'Duplicate policy identifiers: {dups_str}'
+                lambda: f'Duplicate policy identifiers: {", ".join(map(str, duplicates))}'
             )
 
 
@@ -432,11 +430,9 @@ class CertificatePolicyQualifierValidator(validation.Validator):
                 ]
 
                 if len(disallowed_qualifiers) > 0:
-                    message = ', '.join(map(str, disallowed_qualifiers))
-
                     raise validation.ValidationFindingEncountered(
                         self.VALIDATION_ANYPOLICY_DISALLOWED_QUALIFIER,
-                        f'anyPolicy has disallowed qualifiers: {message}'
+                        lambda: f'anyPolicy has disallowed qualifiers: {", ".join(map(str, disallowed_qualifiers))}'
                     )
 
             if len(node.children['policyQualifiers'].children) > 0:
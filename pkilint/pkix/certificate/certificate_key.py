@@ -162,6 +162,8 @@ class SubjectKeyIdentifierValidator(validation.Validator):
         hashes.SHA512: VALIDATION_RFC7093_METHOD_3,
     }
 
+    _SUBJECT_PUBLIC_KEY_PATH = document.compile_path('tbsCertificate.subjectPublicKeyInfo.subjectPublicKey')
+
     # TODO: support RFC 7093 method 4
     @staticmethod
     def _calculate_rfc7093_method_hash(public_key_octets, hash_cls):
@@ -171,9 +173,7 @@ class SubjectKeyIdentifierValidator(validation.Validator):
         return h[:20]
 
     def validate(self, node):
-        public_key_node = node.document.root.navigate(
-            'tbsCertificate.subjectPublicKeyInfo.subjectPublicKey'
-        )
+        public_key_node = node.document.root.navigate(self._SUBJECT_PUBLIC_KEY_PATH)
 
         public_key_octets = public_key_node.pdu.asOctets()
 
@@ -235,7 +235,7 @@ class SubjectSignatureVerificationValidator(validation.Validator):
         subject_crypto_doc = node.document.cryptography_object
         public_key = issuer_crypto_cert.public_key()
 
-        tbs_octets = encode(self._tbs_node_retriever(node).pdu)
+        tbs_octets = bytes(self._tbs_node_retriever(node).der)
 
         if not _verify_signature(public_key, tbs_octets,
                                  node.pdu.asOctets(),
@@ -255,7 +255,7 @@ class AllowedPublicKeyAlgorithmEncodingValidator(validation.Validator):
         self._allowed_encodings = allowed_encodings
 
     def validate(self, node):
-        encoded = encode(node.pdu)
+        encoded = bytes(node.der)
 
         if encoded not in self._allowed_encodings:
             encoded_str = binascii.hexlify(encoded).decode('us-ascii')
@@ -116,6 +116,10 @@ class SctListExtensionDecodingValidator(validation.Validator):
 
         self._append_decoded = append_decoded
 
+    @property
+    def tags(self):
+        return super().tags + [validation.DECODING_TAG]
+
     def validate(self, node):
         try:
             decoded = _decode(node.pdu)
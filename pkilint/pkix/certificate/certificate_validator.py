@@ -1,6 +1,8 @@
 from pyasn1_alt_modules import rfc5280
 
-from pkilint import validation
+from pkilint import validation, document
+
+_TBS_CERTIFICATE_SIGNATURE_PATH = document.compile_path('^.tbsCertificate.signature')
 
 
 class CorrectVersionValidator(validation.ScalarFieldValueEqualityValidator):
@@ -19,7 +21,7 @@ class SignatureAlgorithmMatchValidator(validation.DEREqualityValidator):
     def __init__(self):
         super().__init__(
             other_node_retriever=(
-                lambda n: n.navigate('^.tbsCertificate.signature')
+                lambda n: n.navigate(_TBS_CERTIFICATE_SIGNATURE_PATH)
             ),
             path='certificate.signatureAlgorithm',
             validation=validation.ValidationFinding(
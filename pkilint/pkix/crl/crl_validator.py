@@ -1,6 +1,8 @@
 from pyasn1_alt_modules import rfc5280
 
-from pkilint import validation
+from pkilint import validation, document
+
+_TBS_CERT_LIST_SIGNATURE_PATH = document.compile_path('^.tbsCertList.signature')
 
 
 class VersionPresenceValidator(validation.NodePresenceValidator):
@@ -34,7 +36,7 @@ class SignatureAlgorithmMatchValidator(validation.DEREqualityValidator):
     def __init__(self):
         super().__init__(
             other_node_retriever=(
-                lambda n: n.navigate('^.tbsCertList.signature')
+                lambda n: n.navigate(_TBS_CERT_LIST_SIGNATURE_PATH)
             ),
             path='signatureAlgorithm',
             validation=validation.ValidationFinding(
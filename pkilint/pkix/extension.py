@@ -1,6 +1,6 @@
 from pyasn1_alt_modules import rfc5280, rfc6960, rfc6962, rfc4262
 
-from pkilint import validation
+from pkilint import validation, document
 
 EXTENSION_MAPPINGS = {
     **rfc4262._certificateExtensionsMap,
@@ -10,8 +10,11 @@ EXTENSION_MAPPINGS = {
 }
 
 
+_EXTENSION_FROM_DECODED_VALUE_PATH = document.compile_path('^.^')
+
+
 def get_criticality_from_decoded_node(node):
-    ext_node = node.navigate('^.^')
+    ext_node = node.navigate(_EXTENSION_FROM_DECODED_VALUE_PATH)
 
     return bool(ext_node.children['critical'].pdu)
 
@@ -36,7 +39,7 @@ class PermittedExtensionValidator(validation.Validator):
         if oid not in self.known_oids:
             raise validation.ValidationFindingEncountered(
                 self.validations[0],
-                f'Unknown extension type: {str(oid)}'
+                lambda: f'Unknown extension type: {str(oid)}'
             )
 
 
@@ -58,7 +61,7 @@ class UniqueExtensionValidator(validation.Validator):
             if oid in oids:
                 raise validation.ValidationFindingEncountered(
                     self.VALIDATION_EXTENSION_NOT_UNIQUE,
-                    f'Multiple extensions of type "{str(oid)}"'
+                    lambda: f'Multiple extensions of type "{str(oid)}"'
                 )
 
             oids.add(oid)
@@ -86,12 +89,12 @@ class ExtensionCriticalityValidator(validation.Validator):
         if self._is_critical and not criticality:
             raise validation.ValidationFindingEncountered(
                 self._validation,
-                f'Extension {self._type_oid} is not critical'
+                lambda: f'Extension {self._type_oid} is not critical'
             )
         elif not self._is_critical and criticality:
             raise validation.ValidationFindingEncountered(
                 self._validation,
-                f'Extension {self._type_oid} is critical'
+                lambda: f'Extension {self._type_oid} is critical'
             )
 
 
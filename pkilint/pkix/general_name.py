@@ -76,7 +76,7 @@ class UriSyntaxValidator(validation.Validator):
         if not self.validate_value(node):
             raise validation.ValidationFindingEncountered(
                 self.VALIDATION_INVALID_URI_SYNTAX,
-                f'Invalid URI syntax: "{str(node.pdu)}"'
+                lambda: f'Invalid URI syntax: "{str(node.pdu)}"'
             )
 
 
@@ -102,7 +102,7 @@ class DomainNameSyntaxValidator(validation.Validator):
         if not self.validate_value(node):
             raise validation.ValidationFindingEncountered(
                 self.VALIDATION_NOT_PREFERRED_NAME_SYNTAX,
-                f'Invalid domain name syntax: "{str(node.pdu)}"'
+                lambda: f'Invalid domain name syntax: "{str(node.pdu)}"'
             )
 
 
@@ -128,7 +128,7 @@ class MailboxAddressSyntaxValidator(validation.Validator):
         if not self.validate_value(node):
             raise validation.ValidationFindingEncountered(
                 self.VALIDATION_INVALID_EMAIL_ADDRESS_SYNTAX,
-                f'Invalid e-mail address syntax: "{str(node.pdu)}"'
+                lambda: f'Invalid e-mail address syntax: "{str(node.pdu)}"'
             )
 
 
@@ -254,12 +254,12 @@ class GeneralNameIpAddressSyntaxValidator(validation.Validator):
             if is_nc_child:
                 raise validation.ValidationFindingEncountered(
                     self.VALIDATION_IP_ADDRESS_NC_WRONG_LENGTH,
-                    f'Invalid IP address contraint length: {actual_length}'
+                    lambda: f'Invalid IP address contraint length: {actual_length}'
                 )
             else:
                 raise validation.ValidationFindingEncountered(
                     self.VALIDATION_IP_ADDRESS_WRONG_LENGTH,
-                    f'Invalid IP address length: {actual_length}'
+                    lambda: f'Invalid IP address length: {actual_length}'
                 )
 
         if is_nc_child:
@@ -358,7 +358,7 @@ class DomainNameLengthValidator(validation.Validator):
         if value_len > self._MAX_DOMAIN_NAME_ASCII_LENGTH:
             raise validation.ValidationFindingEncountered(
                 self._validation_domain_name_too_long,
-                f'Domain name too long: "{value}" ({value_len} characters) exceeds maximum length of '
+                lambda: f'Domain name too long: "{value}" ({value_len} characters) exceeds maximum length of '
                 f'{self._MAX_DOMAIN_NAME_ASCII_LENGTH} characters'
             )
 
@@ -70,7 +70,7 @@ class RDNContainsUniqueTypesValidator(validation.Validator):
             if oid in oids:
                 raise validation.ValidationFindingEncountered(
                     self.VALIDATION_ATTRIBUTE_TYPES_NOT_UNIQUE,
-                    f'Multiple attributes of type "{str(oid)}"'
+                    lambda: f'Multiple attributes of type "{str(oid)}"'
                 )
 
             oids.add(oid)
@@ -119,11 +119,9 @@ class PermittedAttributeTypeValidator(NameAttributeTypesValidatorBase):
         prohibited_oids = attributes - self.expected_oid_set
 
         if len(prohibited_oids) > 0:
-            oids_str = oid.format_oids(prohibited_oids)
-
             raise validation.ValidationFindingEncountered(
                 self.validation,
-                f'Prohibited attribute types: {oids_str}'
+                lambda: f'Prohibited attribute types: {oid.format_oids(prohibited_oids)}'
             )
 
 
@@ -140,11 +138,9 @@ class RequiredAttributeTypeValidator(NameAttributeTypesValidatorBase):
         missing_oids = self.expected_oid_set - attributes
 
         if len(missing_oids) > 0:
-            oids_str = oid.format_oids(missing_oids)
-
             raise validation.ValidationFindingEncountered(
                 self.validation,
-                f'Required attribute types not present: {oids_str}'
+                lambda: f'Required attribute types not present: {oid.format_oids(missing_oids)}'
             )
 
 
@@ -209,7 +205,7 @@ class DomainComponentValidDomainNameValidator(validation.Validator):
             if not isinstance(ret, bool) or not ret:
                 raise validation.ValidationFindingEncountered(
                     self.VALIDATION_NAME_DC_NOT_A_VALID_DOMAIN_NAME,
-                    f'Invalid domain name in domainComponents: "{domain_name}"'
+                    lambda: f'Invalid domain name in domainComponents: "{domain_name}"'
                 )
 
 
@@ -230,9 +226,7 @@ class DuplicateAttributeTypeValidator(NameAttributeTypesValidatorBase):
         disallowed_duplicates = duplicates - self.expected_oid_set
 
         if len(disallowed_duplicates) > 0:
-            oids_str = oid.format_oids(disallowed_duplicates)
-
             raise validation.ValidationFindingEncountered(
                 self.validation,
-                f'Prohibited multiple instances of attribute types: {oids_str}'
+                lambda: f'Prohibited multiple instances of attribute types: {oid.format_oids(disallowed_duplicates)}'
             )
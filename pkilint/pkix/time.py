@@ -103,7 +103,7 @@ class TimeCorrectEncodingValidator(validation.Validator):
                 parsed_datetime.year < 2050):
             raise validation.ValidationFindingEncountered(
                 self.VALIDATION_WRONG_TIME_TYPE,
-                'Time values that contain a year value of '
+                lambda: 'Time values that contain a year value of '
                 f'"{parsed_datetime.year}" must be encoded using UTCTime'
             )
 
@@ -170,7 +170,7 @@ class SaneValidityPeriodValidator(ValidityPeriodDifferenceValidator):
         if start_datetime > end_datetime:
             raise validation.ValidationFindingEncountered(
                 self._invalid_validity_period_validation,
-                f'Start of validity period "{start_datetime}" is greater than '
+                lambda: f'Start of validity period "{start_datetime}" is greater than '
                 f'end of validity period "{end_datetime}"'
             )
 
@@ -207,13 +207,13 @@ class ValidityPeriodThresholdsValidator(ValidityPeriodDifferenceValidator):
                 if op in [operator.ge, operator.gt]:
                     raise validation.ValidationFindingEncountered(
                         finding,
-                        f'Validity period of {validity} is below minimum '
+                        lambda: f'Validity period of {validity} is below minimum '
                         f'value of {threshold_value}'
                     )
                 else:
                     raise validation.ValidationFindingEncountered(
                         finding,
-                        f'Validity period of {validity} exceeds maximum '
+                        lambda: f'Validity period of {validity} exceeds maximum '
                         f'value of {threshold_value}'
                     )
 
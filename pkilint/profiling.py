@@ -0,0 +1,154 @@
+import contextvars
+import json
+from typing import Dict, List, NamedTuple, Optional, TextIO, Tuple
+
+_ACTIVE_PROFILER = contextvars.ContextVar('pkilint_active_profiler', default=None)
+
+
+def get_active_profiler() -> Optional['ValidationProfiler']:
+    """Returns the profiler that is collecting statistics in the current context, if any."""
+    return _ACTIVE_PROFILER.get()
+
+
+class ValidatorStatistics:
+    """Represents the statistics collected for a validator, optionally scoped to a single node path."""
+
+    __slots__ = ('match_count', 'validate_count', 'total_time', 'max_time', 'exception_count',)
+
+    def __init__(self):
+        self.match_count = 0
+        '''The number of times the validator was tested against a node'''
+
+        self.validate_count = 0
+        '''The number of times the validator was executed'''
+
+        self.total_time = 0.0
+        '''The cumulative wall time spent executing the validator, in seconds'''
+
+        self.max_time = 0.0
+        '''The longest wall time spent on a single execution of the validator, in seconds'''
+
+        self.exception_count = 0
+        '''The number of executions that raised an unhandled exception'''
+
+    def merge(self, other: 'ValidatorStatistics'):
+        self.match_count += other.match_count
+        self.validate_count += other.validate_count
+        self.total_time += other.total_time
+        self.max_time = max(self.max_time, other.max_time)
+        self.exception_count += other.exception_count
+
+    def to_dict(self) -> dict:
+        return {
+            'match_count': self.match_count,
+            'validate_count': self.validate_count,
+            'total_time': self.total_time,
+            'max_time': self.max_time,
+            'exception_count': self.exception_count,
+        }
+
+
+class ValidatorProfileEntry(NamedTuple):
+    validator: str
+    '''The class name of the validator'''
+
+    node_path: Optional[str]
+    '''The path of the node on which the validator was executed, or None if the entry covers all nodes'''
+
+    statistics: ValidatorStatistics
+    '''The statistics collected for the validator'''
+
+    def to_dict(self) -> dict:
+        return {'validator': self.validator, 'node_path': self.node_path, **self.statistics.to_dict()}
+
+
+class ValidationProfiler:
+    """Collects per-validator timing and call counts while validation is performed.
+
+    Profiling is opt-in: statistics are only collected for validation that is performed while the profiler is active.
+    A profiler is activated by using it as a context manager. For example:
+
+        with ValidationProfiler() as profiler:
+            results = validator_container.validate(doc.root)
+
+        print(profiler.get_report())
+
+    Time spent in nested validator containers is attributed to the validators that they contain.
+    """
+
+    def __init__(self):
+        self._statistics: Dict[Tuple[str, str], ValidatorStatistics] = {}
+        self._tokens = []
+
+    def __enter__(self) -> 'ValidationProfiler':
+        self._tokens.append(_ACTIVE_PROFILER.set(self))
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _ACTIVE_PROFILER.reset(self._tokens.pop())
+
+    def _get_statistics(self, validator, node) -> ValidatorStatistics:
+        key = (validator.name, node.path)
+
+        statistics = self._statistics.get(key)
+        if statistics is None:
+            statistics = ValidatorStatistics()
+
+            self._statistics[key] = statistics
+
+        return statistics
+
+    def record_match(self, validator, node):
+        self._get_statistics(validator, node).match_count += 1
+
+    def record_validation(self, validator, node, elapsed: float):
+        statistics = self._get_statistics(validator, node)
+
+        statistics.validate_count += 1
+        statistics.total_time += elapsed
+        statistics.max_time = max(statistics.max_time, elapsed)
+
+    def record_exception(self, validator, node):
+        self._get_statistics(validator, node).exception_count += 1
+
+    def merge(self, other: 'ValidationProfiler'):
+        """Adds the statistics collected by the specified profiler, such as a profiler of another process, to the
+        statistics of this profiler."""
+        for key, statistics in other._statistics.items():
+            self._statistics.setdefault(key, ValidatorStatistics()).merge(statistics)
+
+    def get_entries(self, by_node_path: bool = False) -> List[ValidatorProfileEntry]:
+        """Returns the collected statistics, ordered by descending cumulative time.
+
+        Args:
+            by_node_path: Whether to report statistics separately for each node path on which a validator was
+            executed. If False, the statistics for each validator are aggregated across all node paths.
+        """
+        if by_node_path:
+            entries = [
+                ValidatorProfileEntry(validator, node_path, statistics)
+                for (validator, node_path), statistics in self._statistics.items()
+            ]
+        else:
+            aggregated = {}
+            for (validator, _), statistics in self._statistics.items():
+                aggregated.setdefault(validator, ValidatorStatistics()).merge(statistics)
+
+            entries = [
+                ValidatorProfileEntry(validator, None, statistics)
+                for validator, statistics in aggregated.items()
+            ]
+
+        return sorted(entries, key=lambda e: (-e.statistics.total_time, e.validator, e.node_path or ''))
+
+    def get_report(self) -> dict:
+        """Returns a structured report of the collected statistics."""
+        return {
+            'validators': [e.to_dict() for e in self.get_entries()],
+            'nodes': [e.to_dict() for e in self.get_entries(by_node_path=True)],
+        }
+
+    def dump_json(self, f: TextIO):
+        """Writes the report returned by :py:meth:`get_report` to the specified file object in JSON format."""
+        json.dump(self.get_report(), f, indent=2)
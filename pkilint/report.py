@@ -1,7 +1,7 @@
 import csv
 import io
 import json
-from typing import Iterable, Optional, Any, List
+from typing import Iterable, Optional, Any, List, IO
 
 from pkilint import validation
 from pkilint.validation import ValidationFindingSeverity, ValidationResult, ValidationFindingDescription
@@ -13,16 +13,21 @@ class ReportGeneratorBase:
         self.results = results
         self.severity_threshold = severity_threshold
         self.report_context = report_context
+        self.findings_count = 0
+        '''The number of findings that have been reported'''
 
     def get_finding_descriptions_for_result(self, result):
         return [f for f in result.finding_descriptions
                 if self.severity_threshold is None or f.finding.severity <= self.severity_threshold
                 ]
 
-    def is_relevant_result(self, result):
-        return self.severity_threshold is None or any(self.get_finding_descriptions_for_result(result))
+    def is_relevant_result(self, result, finding_descriptions: Optional[List[ValidationFindingDescription]] = None):
+        if finding_descriptions is None:
+            finding_descriptions = self.get_finding_descriptions_for_result(result)
 
-    def handle_result(self, result) -> Optional[Any]:
+        return self.severity_threshold is None or any(finding_descriptions)
+
+    def handle_result(self, result, finding_descriptions: List[ValidationFindingDescription]) -> Optional[Any]:
         pass
 
     def handle_finding_description(self, result: ValidationResult, finding_description: ValidationFindingDescription,
@@ -31,42 +36,128 @@ class ReportGeneratorBase:
 
     def generate(self):
         for result in self.results:
-            result_context = self.handle_result(result)
+            # the findings of each result are filtered once, and the filtered list is used for both handling steps
+            finding_descriptions = self.get_finding_descriptions_for_result(result)
+
+            result_context = self.handle_result(result, finding_descriptions)
 
-            for finding_description in self.get_finding_descriptions_for_result(result):
+            for finding_description in finding_descriptions:
                 self.handle_finding_description(result, finding_description, result_context)
 
+                self.findings_count += 1
 
-class ReportGeneratorPlaintext(ReportGeneratorBase):
-    def __init__(self, results, severity_threshold):
-        super().__init__(results, severity_threshold, io.StringIO())
 
-    def handle_result(self, result):
-        if self.is_relevant_result(result):
+def _finding_description_to_dict(finding_description: ValidationFindingDescription) -> dict:
+    return {
+        'severity': finding_description.finding.severity.name,
+        'code': finding_description.finding.code,
+        'message': finding_description.message,
+    }
+
+
+def _result_to_dict(result: ValidationResult, finding_descriptions: List[ValidationFindingDescription]) -> dict:
+    return {
+        'node_path': result.node.path,
+        'validator': str(result.validator),
+        'finding_descriptions': list(map(_finding_description_to_dict, finding_descriptions)),
+    }
+
+
+def _is_binary_output(output: IO) -> bool:
+    if isinstance(output, (io.RawIOBase, io.BufferedIOBase)):
+        return True
+    elif isinstance(output, io.TextIOBase):
+        return False
+    else:
+        # file objects that do not derive from the io classes (such as those returned by the tempfile module) are
+        # identified by their mode; any other object is treated as a text stream
+        mode = getattr(output, 'mode', None)
+
+        return isinstance(mode, str) and 'b' in mode
+
+
+class ReportWriterBase(ReportGeneratorBase):
+    """Writes a report to a file object as the results are consumed.
+
+    Neither the results nor the report are held in memory in their entirety, so results may be supplied by a generator
+    such as :py:meth:`pkilint.validation.ValidatorContainer.iter_validate`. Binary file objects are written to in UTF-8,
+    and any other object with a ``write`` method that accepts strings (such as a text file object) is written to
+    directly. The number of findings written is counted in the same pass.
+    """
+
+    followed_by_empty_line: bool = False
+    '''Whether :py:func:`write_report` writes an empty line after the report, as the command line tools did when they
+    printed the generated report'''
+
+    def __init__(self, results: Iterable[ValidationResult], severity_threshold: Optional[ValidationFindingSeverity],
+                 output: IO):
+        self._output = output
+
+        super().__init__(results, severity_threshold)
+
+    def start_report(self, output: IO):
+        pass
+
+    def end_report(self, output: IO):
+        pass
+
+    def write(self) -> int:
+        """Writes the report and returns the number of findings that were written"""
+        if _is_binary_output(self._output):
+            # newlines are written as-is, as the CSV writer emits its own line terminators
+            text_output = io.TextIOWrapper(self._output, encoding='utf-8', newline='', write_through=True)
+        else:
+            text_output = self._output
+
+        self.report_context = self.create_report_context(text_output)
+
+        try:
+            self.start_report(text_output)
+            # the string-returning generators override generate(), so the results are traversed with the base method
+            ReportGeneratorBase.generate(self)
+            self.end_report(text_output)
+
+            if hasattr(text_output, 'flush'):
+                text_output.flush()
+        finally:
+            if text_output is not self._output:
+                # detach so that the caller's file object is not closed along with the wrapper
+                text_output.detach()
+
+        return self.findings_count
+
+    def create_report_context(self, output: IO) -> Any:
+        return output
+
+
+class ReportWriterPlaintext(ReportWriterBase):
+    followed_by_empty_line = True
+
+    def handle_result(self, result, finding_descriptions):
+        if self.is_relevant_result(result, finding_descriptions):
             self.report_context.write(f'{result.validator} @ {result.node.path}\n')
 
     def handle_finding_description(self, result: ValidationResult, finding_description: ValidationFindingDescription,
                                    result_context: Optional[Any]):
         self.report_context.write(f'    {finding_description}\n')
 
-    def generate(self):
-        super().generate()
-
-        return self.report_context.getvalue()
-
 
-class ReportGeneratorCsv(ReportGeneratorBase):
+class ReportWriterCsv(ReportWriterBase):
     _CSV_FIELDNAMES = ['node_path', 'validator', 'severity', 'code', 'message']
 
-    def __init__(self, results, severity_threshold, output_headers=True):
-        self._output_io = io.StringIO()
+    followed_by_empty_line = True
+
+    def __init__(self, results, severity_threshold, output, output_headers=True):
+        self._output_headers = output_headers
 
-        output_csv = csv.DictWriter(self._output_io, fieldnames=self._CSV_FIELDNAMES)
+        super().__init__(results, severity_threshold, output)
 
-        if output_headers:
-            output_csv.writeheader()
+    def create_report_context(self, output):
+        return csv.DictWriter(output, fieldnames=self._CSV_FIELDNAMES)
 
-        super().__init__(results, severity_threshold, output_csv)
+    def start_report(self, output):
+        if self._output_headers:
+            self.report_context.writeheader()
 
     def handle_finding_description(self, result, finding_description, result_context):
         row = {
@@ -79,23 +170,66 @@ class ReportGeneratorCsv(ReportGeneratorBase):
 
         self.report_context.writerow(row)
 
+
+class ReportWriterJson(ReportWriterBase):
+    """Writes a JSON object with a "results" array, one result at a time. The object is terminated by a newline."""
+
+    def __init__(self, results, severity_threshold, output):
+        super().__init__(results, severity_threshold, output)
+
+        self._written_result_count = 0
+
+    def start_report(self, output):
+        output.write('{"results": [')
+
+    def handle_result(self, result, finding_descriptions):
+        if self.is_relevant_result(result, finding_descriptions):
+            if self._written_result_count > 0:
+                self.report_context.write(', ')
+
+            self.report_context.write(json.dumps(_result_to_dict(result, finding_descriptions)))
+
+            self._written_result_count += 1
+
+    def end_report(self, output):
+        output.write(']}\n')
+
+
+class ReportWriterNdjson(ReportWriterBase):
+    """Writes each result as a JSON object on its own line (newline-delimited JSON)."""
+
+    def handle_result(self, result, finding_descriptions):
+        if self.is_relevant_result(result, finding_descriptions):
+            self.report_context.write(json.dumps(_result_to_dict(result, finding_descriptions)) + '\n')
+
+
+class ReportGeneratorPlaintext(ReportWriterPlaintext):
+    def __init__(self, results, severity_threshold):
+        super().__init__(results, severity_threshold, io.StringIO())
+
     def generate(self):
-        super().generate()
+        self.write()
 
-        return self._output_io.getvalue()
+        return self._output.getvalue()
+
+
+class ReportGeneratorCsv(ReportWriterCsv):
+    def __init__(self, results, severity_threshold, output_headers=True):
+        super().__init__(results, severity_threshold, io.StringIO(), output_headers)
+
+    def generate(self):
+        self.write()
+
+        return self._output.getvalue()
 
 
 class ReportGeneratorJson(ReportGeneratorBase):
     def __init__(self, results, severity_threshold):
         super().__init__(results, severity_threshold, [])
 
-    def handle_result(self, result) -> Optional[Any]:
-        if self.is_relevant_result(result):
-            result_dict = {
-                'node_path': result.node.path,
-                'validator': str(result.validator),
-                'finding_descriptions': []
-            }
+    def handle_result(self, result, finding_descriptions) -> Optional[Any]:
+        if self.is_relevant_result(result, finding_descriptions):
+            result_dict = _result_to_dict(result, [])
 
             self.report_context.append(result_dict)
 
@@ -103,18 +237,15 @@ class ReportGeneratorJson(ReportGeneratorBase):
 
     def handle_finding_description(self, result: ValidationResult, finding_description: ValidationFindingDescription,
                                    result_context: Optional[Any]):
-        result_context.append(
-            {
-                'severity': finding_description.finding.severity.name,
-                'code': finding_description.finding.code,
-                'message': finding_description.message,
-            }
-        )
+        result_context.append(_finding_description_to_dict(finding_description))
 
-    def generate(self):
+    def generate_results(self) -> List[dict]:
         super().generate()
 
-        return json.dumps({'results': self.report_context})
+        return self.report_context
+
+    def generate(self):
+        return json.dumps({'results': self.generate_results()})
 
 
 def get_findings_count(results: Iterable[ValidationResult],
@@ -141,6 +272,27 @@ REPORT_FORMATS = {
     'JSON': ReportGeneratorJson,
 }
 
+REPORT_WRITERS = {
+    'TEXT': ReportWriterPlaintext,
+    'CSV': ReportWriterCsv,
+    'JSON': ReportWriterJson,
+    'NDJSON': ReportWriterNdjson,
+}
+
+
+def write_report(report_writer_cls, results: Iterable[ValidationResult],
+                 severity_threshold: Optional[ValidationFindingSeverity], output: IO) -> int:
+    """Writes a report of the results to the specified file object and returns the number of findings written"""
+    report_writer = report_writer_cls(results, severity_threshold, output)
+
+    findings_count = report_writer.write()
+
+    if report_writer.followed_by_empty_line:
+        output.write(b'\n' if _is_binary_output(output) else '\n')
+
+    return findings_count
+
+
 _VALIDATION_LIST_CSV_FIELDNAMES = ['severity', 'code']
 
 
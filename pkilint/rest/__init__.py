@@ -1,18 +1,65 @@
+import contextlib
+import gc
+import logging
+import os
+import time
 from importlib.metadata import version
-from typing import List
+from typing import Callable, List, Optional, Tuple, Union
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from pyasn1.error import PyAsn1Error
+from starlette import status
+from starlette.concurrency import run_in_threadpool
 
+from pkilint import linter_registry, validation
+from pkilint.common import public_suffix_list
 from pkilint.rest import cabf_serverauth, cabf_smime, etsi, ocsp
-from pkilint.rest import model
+from pkilint.rest import cache, executor, metrics, model, request_body
 
 _PKILINT_VERSION = version('pkilint')
 _API_VERSION = 'v1.4'
 
+logger = logging.getLogger(__name__)
+
+_process_start = time.monotonic()
+_startup_duration: Optional[float] = None
+
+
+def _reset_process_start():
+    global _process_start
+
+    _process_start = time.monotonic()
+
+
+if hasattr(os, 'register_at_fork'):
+    # a worker process of a pre-forking server starts when it is forked, not when this module was imported
+    os.register_at_fork(after_in_child=_reset_process_start)
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(_):
+    global _startup_duration
+
+    await _EXECUTOR.start()
+
+    _startup_duration = time.monotonic() - _process_start
+
+    logger.info(
+        'Process %d started in %.3f seconds; resident set size is %s bytes',
+        os.getpid(), _startup_duration, metrics.get_resident_memory_bytes()
+    )
+
+    yield
+
+    _EXECUTOR.shutdown()
+
+
 app = FastAPI(
     title='pkilint API',
     version=_API_VERSION,
-    description='HTTP interface for pkilint'
+    description='HTTP interface for pkilint',
+    lifespan=_lifespan
 )
 
 _CERTIFICATE_LINTER_GROUPS = [
@@ -26,12 +73,173 @@ _CERTIFICATE_LINTER_GROUPS = [
 _OCSP_PKIX_LINTER = ocsp.create_ocsp_response_linter()
 
 
+def _get_linters() -> List[model.Linter]:
+    return [l for g in _CERTIFICATE_LINTER_GROUPS for l in g.linters] + [_OCSP_PKIX_LINTER]
+
+
+WORKER_PROCESSES_ENV_VAR = 'PKILINT_REST_WORKER_PROCESSES'
+'''The environment variable that specifies the number of worker processes that lint documents. If not set (or set to 0),
+then documents are linted on the thread pool of the server process.'''
+
+MAX_PENDING_REQUESTS_ENV_VAR = 'PKILINT_REST_MAX_PENDING_REQUESTS'
+'''The environment variable that specifies the maximum number of lint requests that may be executing or waiting to
+execute. Further requests are rejected until pending requests complete. If not set, then the number is unlimited.'''
+
+REQUEST_TIMEOUT_ENV_VAR = 'PKILINT_REST_REQUEST_TIMEOUT'
+'''The environment variable that specifies the number of seconds within which a lint request must be completed. If not
+set, then requests do not time out.'''
+
+
+def _get_optional_env_var(name: str, value_type):
+    value = os.environ.get(name)
+
+    return None if value is None else value_type(value)
+
+
+def _create_executor() -> executor.LintExecutor:
+    worker_count = _get_optional_env_var(WORKER_PROCESSES_ENV_VAR, int)
+    max_pending_requests = _get_optional_env_var(MAX_PENDING_REQUESTS_ENV_VAR, int)
+    timeout = _get_optional_env_var(REQUEST_TIMEOUT_ENV_VAR, float)
+
+    if worker_count:
+        return executor.ProcessPoolLintExecutor(worker_count, _get_linters(), max_pending_requests, timeout)
+    else:
+        return executor.ThreadPoolLintExecutor(max_pending_requests, timeout)
+
+
+_EXECUTOR = _create_executor()
+
+CACHE_SIZE_ENV_VAR = 'PKILINT_REST_CACHE_SIZE'
+'''The environment variable that specifies the maximum number of linter determinations and lint results that are cached
+in-process. If not set (or set to 0), then responses are not cached.'''
+
+CACHE_TTL_ENV_VAR = 'PKILINT_REST_CACHE_TTL'
+'''The environment variable that specifies the number of seconds for which a cache entry is valid. If not set, then
+entries are valid until they are evicted.'''
+
+CACHE_DIRECTORY_ENV_VAR = 'PKILINT_REST_CACHE_DIRECTORY'
+'''The environment variable that specifies a directory in which cache entries are stored, so that the entries can be
+shared by multiple server processes on the same host'''
+
+
+def _create_cache() -> Optional[cache.LintCache]:
+    max_size = _get_optional_env_var(CACHE_SIZE_ENV_VAR, int)
+
+    if not max_size:
+        return None
+
+    cache_directory = os.environ.get(CACHE_DIRECTORY_ENV_VAR)
+    store = None if cache_directory is None else cache.FileCacheStore(cache_directory)
+
+    return cache.LintCache(max_size, _get_optional_env_var(CACHE_TTL_ENV_VAR, float), store)
+
+
+_CACHE = _create_cache()
+
+_OCSP_LINTER_GROUP_NAME = 'ocsp'
+
+metrics.REGISTRY.register(metrics.FunctionGauge(
+    'pkilint_startup_duration_seconds',
+    'The number of seconds between the start of this process (or its fork) and the time it was ready to serve requests',
+    lambda: _startup_duration
+))
+metrics.REGISTRY.register(metrics.FunctionGauge(
+    'pkilint_gc_frozen_objects', 'The number of objects in the permanent generation of the garbage collector',
+    gc.get_freeze_count
+))
+metrics.REGISTRY.register(metrics.FunctionGauge(
+    'pkilint_pending_lint_requests', 'The number of lint requests that are executing or waiting to execute',
+    lambda: _EXECUTOR.pending_request_count
+))
+metrics.REGISTRY.register(metrics.FunctionCounter(
+    'pkilint_cache_hits_total', 'The number of cache lookups that were answered from the cache',
+    lambda: None if _CACHE is None else _CACHE.hits
+))
+metrics.REGISTRY.register(metrics.FunctionCounter(
+    'pkilint_cache_misses_total', 'The number of cache lookups that were not answered from the cache',
+    lambda: None if _CACHE is None else _CACHE.misses
+))
+metrics.REGISTRY.register(metrics.FunctionGauge(
+    'pkilint_cache_hit_ratio', 'The ratio of cache lookups that were answered from the cache',
+    lambda: None if _CACHE is None or not _CACHE.hits + _CACHE.misses else _CACHE.hits / (_CACHE.hits + _CACHE.misses)
+))
+metrics.REGISTRY.register(metrics.FunctionGauge(
+    'pkilint_cache_entries', 'The number of entries that are held in the in-process cache',
+    lambda: None if _CACHE is None else len(_CACHE)
+))
+
+
+PRELOAD_ENV_VAR = 'PKILINT_REST_PRELOAD'
+'''The environment variable that specifies whether :py:func:`preload` is called when this module is imported. Set to "1"
+to enable.'''
+
+
+def preload() -> None:
+    """Builds the linters of every linter group, the Public Suffix List and the OpenAPI schema, and then freezes all
+    objects that are tracked by the garbage collector.
+
+    This is intended to be called in the master process of a pre-forking server (such as Gunicorn with preload_app
+    enabled) before worker processes are forked. Workers then start without building these objects and share their
+    memory pages with the master process. As the cyclic garbage collector does not examine frozen objects, it does not
+    write to (and thereby copy) these pages in the workers.
+    """
+    for linter in _get_linters():
+        if isinstance(linter, model.RegisteredLinter):
+            linter_registry.get_linter(linter.profile_name, linter.linter_name)
+
+    public_suffix_list.get_public_suffix_list()
+
+    app.openapi()
+
+    gc.collect()
+    gc.freeze()
+
+    logger.info(
+        'Preloaded %d linters and froze %d objects; resident set size is %s bytes',
+        len(linter_registry.get_default_registry().built_keys), gc.get_freeze_count(),
+        metrics.get_resident_memory_bytes()
+    )
+
+
+@app.middleware('http')
+async def _record_http_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+
+        return response
+    finally:
+        route = request.scope.get('route')
+        route_path = '' if route is None else route.path
+
+        metrics.HTTP_REQUESTS.inc(request.method, route_path, status_code)
+        metrics.HTTP_REQUEST_DURATION.observe(request.method, route_path, value=time.perf_counter() - start)
+
+
+@app.get('/metrics', response_class=PlainTextResponse)
+def metrics_exposition() -> PlainTextResponse:
+    """Retrieves the operational metrics of this server in the Prometheus text exposition format"""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get('/version')
 def version() -> model.Version:
     """Retrieves the version of pkilint that this server is using"""
     return model.Version(version=_PKILINT_VERSION)
 
 
+@app.get('/cache')
+def cache_statistics() -> model.CacheStatistics:
+    """Retrieves the statistics of the response cache"""
+    if _CACHE is None:
+        return model.CacheStatistics(enabled=False)
+    else:
+        return model.CacheStatistics(enabled=True, size=len(_CACHE), hits=_CACHE.hits, misses=_CACHE.misses)
+
+
 @app.get('/certificate')
 def certificate_linter_groups() -> List[model.LinterGroup]:
     """Retrieves the groups of linters that are available for linting certificates"""
@@ -51,31 +259,250 @@ def certificate_linter_group(linter_group_name: str) -> model.LinterGroup:
     return _get_linter_group_by_name(linter_group_name)
 
 
-@app.post('/certificate/{linter_group_name}')
-def certificate_determine_and_lint(
-        linter_group_name: str, doc: model.CertificateModel) -> model.LintResultListWithLinter:
+def _create_decoding_error(linter_group_name: str, e: ValueError) -> HTTPException:
+    metrics.DECODE_FAILURES.inc(linter_group_name)
+
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=model.create_unprocessable_entity_error_detail(str(e))
+    )
+
+
+def _parse_document(doc: model.DocumentModel, linter_group_name: str):
+    if doc.is_parsed:
+        return doc.parse_document()
+
+    start = time.perf_counter()
+
+    try:
+        parsed_doc = doc.parse_document()
+    except ValueError as e:
+        raise _create_decoding_error(linter_group_name, e)
+
+    metrics.PHASE_DURATION.observe(linter_group_name, metrics.PHASE_DECODE, value=time.perf_counter() - start)
+
+    return parsed_doc
+
+
+def _create_cache_key(doc: model.DocumentModel, linter_group_name: str, linter_name: Optional[str] = None,
+                      fail_fast_severity=None) -> cache.CacheKey:
+    return cache.CacheKey(doc.fingerprint, linter_group_name, linter_name, fail_fast_severity, _PKILINT_VERSION)
+
+
+def _determine_uncached_linter(linter_group_instance: model.LinterGroup, doc: model.DocumentModel) -> model.Linter:
+    parsed_doc = _parse_document(doc, linter_group_instance.name)
+
+    with metrics.PHASE_DURATION.time(linter_group_instance.name, metrics.PHASE_DETERMINE_LINTER):
+        return linter_group_instance.determine_linter(parsed_doc)
+
+
+def _determine_linter(linter_group_instance: model.LinterGroup, doc: model.DocumentModel) -> model.Linter:
+    if _CACHE is None:
+        return _determine_uncached_linter(linter_group_instance, doc)
+
+    key = _create_cache_key(doc, linter_group_instance.name)
+
+    linter_name = _CACHE.get_linter_name(key)
+    if linter_name is not None:
+        return linter_group_instance.get_linter_by_name(linter_name)
+
+    linter = _determine_uncached_linter(linter_group_instance, doc)
+
+    _CACHE.put_linter_name(key, linter.name)
+
+    return linter
+
+
+def _get_cached_result_list(linter_group_name: str, linter: model.Linter, doc: model.DocumentModel,
+                            fail_fast_severity) -> Optional[model.LintResultList]:
+    if _CACHE is None:
+        return None
+    else:
+        return _CACHE.get_result_list(_create_cache_key(doc, linter_group_name, linter.name, fail_fast_severity))
+
+
+def _put_cached_result_list(linter_group_name: str, linter: model.Linter, doc: model.DocumentModel,
+                            fail_fast_severity, result_list: model.LintResultList) -> None:
+    if _CACHE is not None:
+        _CACHE.put_result_list(
+            _create_cache_key(doc, linter_group_name, linter.name, fail_fast_severity), result_list
+        )
+
+
+def _put_cached_result_lists(linter_group_name: str, fail_fast_severity,
+                             result_lists: List[Tuple[model.Linter, model.DocumentModel, model.LintResultList]]
+                             ) -> None:
+    for linter, doc, result_list in result_lists:
+        _put_cached_result_list(linter_group_name, linter, doc, fail_fast_severity, result_list)
+
+
+async def _run_cache_operation(func: Callable, *args):
+    """Runs the specified cache operation on the thread pool if the cache has a store, as the store performs file I/O
+    and (de)serialization. Operations on the in-process cache alone are run directly."""
+    if _CACHE is not None and _CACHE.has_store:
+        return await run_in_threadpool(func, *args)
+    else:
+        return func(*args)
+
+
+def _record_lint_metrics(linter_group_name: str, linter: model.Linter, result_list: model.LintResultList,
+                         cached: bool) -> None:
+    metrics.LINT_REQUESTS.inc(linter_group_name, linter.name, str(cached).lower())
+
+    if cached or result_list.phase_durations is None:
+        return
+
+    for phase, duration in result_list.phase_durations.items():
+        metrics.PHASE_DURATION.observe(linter_group_name, phase, value=duration)
+
+    for result in result_list.results:
+        if any(
+                fd.code == validation.Validator.VALIDATION_FINDING_UNHANDLED_EXCEPTION.code
+                for fd in result.finding_descriptions
+        ):
+            metrics.UNHANDLED_EXCEPTIONS.inc(result.validator)
+
+
+async def _lint(linter_group_name: str, linter: model.Linter, doc: model.DocumentModel,
+                fail_fast_severity, start: float) -> model.LintResultList:
+    """Lints the document and records the metrics of the lint request, which started at the specified time"""
+    result_list = await _run_cache_operation(
+        _get_cached_result_list, linter_group_name, linter, doc, fail_fast_severity
+    )
+    cached = result_list is not None
+
+    if not cached:
+        try:
+            result_list = await _EXECUTOR.lint(linter, doc, fail_fast_severity)
+        except ValueError as e:
+            raise _create_decoding_error(linter_group_name, e)
+
+        await _run_cache_operation(
+            _put_cached_result_list, linter_group_name, linter, doc, fail_fast_severity, result_list
+        )
+
+    _record_lint_metrics(linter_group_name, linter, result_list, cached)
+    metrics.LINT_REQUEST_DURATION.observe(linter_group_name, linter.name, value=time.perf_counter() - start)
+
+    return result_list
+
+
+@app.post('/certificate/{linter_group_name}', openapi_extra=request_body.CERTIFICATE_BODY.openapi_extra)
+async def certificate_determine_and_lint(
+        linter_group_name: str, doc: request_body.CertificateBody,
+        fail_fast: model.FailFastQuery = None) -> model.LintResultListWithLinter:
     """Determines the linter that is most appropriate to lint the specified certificate and then returns the results
     reported by the linter for the certificate"""
+    start = time.perf_counter()
 
     linter_group_instance = _get_linter_group_by_name(linter_group_name)
 
-    parsed_doc = doc.parsed_document
+    linter = await run_in_threadpool(_determine_linter, linter_group_instance, doc)
 
-    linter = linter_group_instance.determine_linter(parsed_doc)
+    result_list = await _lint(linter_group_instance.name, linter, doc, model.to_fail_fast_severity(fail_fast), start)
 
-    result_list = linter.lint(parsed_doc)
+    return model.LintResultListWithLinter(results=result_list.results, truncated=result_list.truncated, linter=linter)
 
-    return model.LintResultListWithLinter(results=result_list.results, linter=linter)
 
+def _get_error_message(e: HTTPException) -> str:
+    if isinstance(e.detail, list):
+        return '; '.join(d['msg'] for d in e.detail)
+    else:
+        return str(e.detail)
 
-@app.post('/certificate/{linter_group_name}/determine-linter')
-def certificate_determine_type(linter_group_name: str, doc: model.CertificateModel) -> model.Linter:
-    """Determines the linter that is most appropriate to lint the specified certificate"""
+
+def _prepare_batch(batch, linter_group_name: str, determine_linter: Callable[[model.DocumentModel], model.Linter],
+                   fail_fast_severity
+                   ) -> List[Union[model.BatchLintResult, Tuple[model.DocumentModel, executor.LintJob]]]:
+    """Determines the linter of each document of the batch. Documents are decoded by the executor unless their linter
+    is determined. A result is returned in place of the job for each document that has a cached result, cannot be
+    parsed, or for which a linter cannot be determined."""
+    items = []
+    for doc in batch.documents:
+        try:
+            # extracting the DER encoding here keeps base-64 decoding off the event loop
+            doc.substrate
+
+            linter = determine_linter(doc)
+
+            result_list = _get_cached_result_list(linter_group_name, linter, doc, fail_fast_severity)
+
+            if result_list is None:
+                items.append((doc, executor.LintJob(linter, doc)))
+            else:
+                _record_lint_metrics(linter_group_name, linter, result_list, True)
+
+                items.append(
+                    model.BatchLintResult(linter=linter, results=result_list.results, truncated=result_list.truncated)
+                )
+        except (ValueError, PyAsn1Error) as e:
+            items.append(model.BatchLintResult(error=str(e)))
+        except HTTPException as e:
+            items.append(model.BatchLintResult(error=_get_error_message(e)))
+
+    return items
+
+
+async def _lint_batch(batch, linter_group_name: str, determine_linter: Callable[[model.DocumentModel], model.Linter],
+                      fail_fast_severity) -> model.BatchLintResultList:
+    # batches of DER-encoded documents have already been checked while the body was split
+    request_body.check_batch_size(len(batch.documents))
+
+    items = await run_in_threadpool(_prepare_batch, batch, linter_group_name, determine_linter, fail_fast_severity)
+
+    jobs = [job for _, job in filter(lambda i: isinstance(i, tuple), items)]
+    outcomes = iter(await _EXECUTOR.lint_many(jobs, fail_fast_severity))
+
+    batch_results = []
+    result_lists_to_cache = []
+    for item in items:
+        if isinstance(item, tuple):
+            doc, job = item
+            result_list = next(outcomes)
+
+            if isinstance(result_list, ValueError):
+                error = _create_decoding_error(linter_group_name, result_list)
+
+                batch_results.append(model.BatchLintResult(error=_get_error_message(error)))
+
+                continue
+
+            result_lists_to_cache.append((job.linter, doc, result_list))
+            _record_lint_metrics(linter_group_name, job.linter, result_list, False)
+
+            item = model.BatchLintResult(
+                linter=job.linter, results=result_list.results, truncated=result_list.truncated
+            )
+
+        batch_results.append(item)
+
+    await _run_cache_operation(_put_cached_result_lists, linter_group_name, fail_fast_severity, result_lists_to_cache)
+
+    return model.BatchLintResultList(items=batch_results)
+
+
+@app.post('/certificate/{linter_group_name}/batch', openapi_extra=request_body.CERTIFICATE_BATCH_BODY.openapi_extra)
+async def certificate_determine_and_lint_batch(
+        linter_group_name: str, batch: request_body.CertificateBatchBody,
+        fail_fast: model.FailFastQuery = None) -> model.BatchLintResultList:
+    """Determines the linter that is most appropriate to lint each of the specified certificates and then returns the
+    results reported by the linter for each certificate. Certificates that cannot be parsed or for which a linter
+    cannot be determined are reported as errors without affecting the other certificates in the batch."""
     linter_group_instance = _get_linter_group_by_name(linter_group_name)
 
-    parsed_doc = doc.parsed_document
+    return await _lint_batch(
+        batch, linter_group_instance.name, lambda d: _determine_linter(linter_group_instance, d),
+        model.to_fail_fast_severity(fail_fast)
+    )
+
 
-    return linter_group_instance.determine_linter(parsed_doc)
+@app.post('/certificate/{linter_group_name}/determine-linter',
+          openapi_extra=request_body.CERTIFICATE_BODY.openapi_extra)
+def certificate_determine_type(linter_group_name: str, doc: request_body.CertificateBody) -> model.Linter:
+    """Determines the linter that is most appropriate to lint the specified certificate"""
+    linter_group_instance = _get_linter_group_by_name(linter_group_name)
+
+    return _determine_linter(linter_group_instance, doc)
 
 
 @app.get('/certificate/{linter_group_name}/{linter_name}')
@@ -88,16 +515,34 @@ def linter_validations(linter_group_name: str, linter_name: str) -> List[model.V
     return linter_instance.validations
 
 
-@app.post('/certificate/{linter_group_name}/{linter_name}')
-def certificate_lint(linter_group_name: str, linter_name: str, doc: model.CertificateModel) -> model.LintResultList:
+@app.post('/certificate/{linter_group_name}/{linter_name}', openapi_extra=request_body.CERTIFICATE_BODY.openapi_extra)
+async def certificate_lint(linter_group_name: str, linter_name: str, doc: request_body.CertificateBody,
+                           fail_fast: model.FailFastQuery = None) -> model.LintResultList:
     """Lints the specified certificate with the specified linter"""
+    start = time.perf_counter()
+
     linter_group_instance = _get_linter_group_by_name(linter_group_name)
 
     linter_instance = linter_group_instance.get_linter_by_name(linter_name)
 
-    parsed_doc = doc.parsed_document
+    return await _lint(
+        linter_group_instance.name, linter_instance, doc, model.to_fail_fast_severity(fail_fast), start
+    )
+
+
+@app.post('/certificate/{linter_group_name}/{linter_name}/batch',
+          openapi_extra=request_body.CERTIFICATE_BATCH_BODY.openapi_extra)
+async def certificate_lint_batch(linter_group_name: str, linter_name: str, batch: request_body.CertificateBatchBody,
+                                 fail_fast: model.FailFastQuery = None) -> model.BatchLintResultList:
+    """Lints each of the specified certificates with the specified linter. Certificates that cannot be parsed are
+    reported as errors without affecting the other certificates in the batch."""
+    linter_group_instance = _get_linter_group_by_name(linter_group_name)
+
+    linter_instance = linter_group_instance.get_linter_by_name(linter_name)
 
-    return linter_instance.lint(parsed_doc)
+    return await _lint_batch(
+        batch, linter_group_instance.name, lambda d: linter_instance, model.to_fail_fast_severity(fail_fast)
+    )
 
 
 @app.get('/ocsp/pkix')
@@ -107,10 +552,26 @@ def ocsp_linter_validations() -> List[model.Validation]:
     return _OCSP_PKIX_LINTER.validations
 
 
-@app.post('/ocsp/pkix')
-def ocsp_response_lint(doc: model.OcspResponseModel) -> model.LintResultList:
+@app.post('/ocsp/pkix', openapi_extra=request_body.OCSP_RESPONSE_BODY.openapi_extra)
+async def ocsp_response_lint(doc: request_body.OcspResponseBody,
+                             fail_fast: model.FailFastQuery = None) -> model.LintResultList:
     """Lints the specified OCSP response"""
 
-    parsed_doc = doc.parsed_document
+    return await _lint(
+        _OCSP_LINTER_GROUP_NAME, _OCSP_PKIX_LINTER, doc, model.to_fail_fast_severity(fail_fast), time.perf_counter()
+    )
+
+
+@app.post('/ocsp/pkix/batch', openapi_extra=request_body.OCSP_RESPONSE_BATCH_BODY.openapi_extra)
+async def ocsp_response_lint_batch(batch: request_body.OcspResponseBatchBody,
+                                   fail_fast: model.FailFastQuery = None) -> model.BatchLintResultList:
+    """Lints each of the specified OCSP responses. OCSP responses that cannot be parsed are reported as errors without
+    affecting the other OCSP responses in the batch."""
+
+    return await _lint_batch(
+        batch, _OCSP_LINTER_GROUP_NAME, lambda d: _OCSP_PKIX_LINTER, model.to_fail_fast_severity(fail_fast)
+    )
+
 
-    return _OCSP_PKIX_LINTER.lint(parsed_doc)
+if os.environ.get(PRELOAD_ENV_VAR) == '1':
+    preload()
@@ -4,7 +4,6 @@ from starlette import status
 
 from pkilint.cabf import serverauth
 from pkilint.cabf.serverauth import serverauth_constants
-from pkilint.pkix import certificate
 from pkilint.rest import model
 
 
@@ -30,14 +29,7 @@ class CabfServerauthLinterGroup(model.LinterGroup):
 def create_linter_group_instance():
     return CabfServerauthLinterGroup(
         [
-            model.Linter(
-                validator=certificate.create_pkix_certificate_validator_container(
-                    serverauth.create_decoding_validators(),
-                    serverauth.create_validators(cert_type)
-                ),
-                finding_filters=serverauth.create_serverauth_finding_filters(cert_type),
-                name=cert_type.to_option_str
-            )
+            model.RegisteredLinter(profile_name='cabf-serverauth', name=cert_type.to_option_str)
             for cert_type in serverauth_constants.CertificateType
         ]
     )
@@ -4,7 +4,6 @@ from starlette import status
 
 from pkilint.cabf import smime
 from pkilint.cabf.smime import smime_constants
-from pkilint.pkix import certificate
 from pkilint.rest import model
 
 
@@ -45,13 +44,7 @@ for v in smime_constants.ValidationLevel:
 def create_linter_group_instance():
     return CabfSmimeLinterGroup(
         [
-            model.Linter(
-                validator=certificate.create_pkix_certificate_validator_container(
-                    smime.create_decoding_validators(),
-                    smime.create_subscriber_validators(v, g)
-                ),
-                name=f'{v}-{g}'
-            )
+            model.RegisteredLinter(profile_name='cabf-smime', name=f'{v}-{g}')
             for v, g in _V_G_PAIRS
         ]
     )
@@ -0,0 +1,200 @@
+import collections
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, NamedTuple, Optional, OrderedDict, Tuple
+
+from pkilint import validation
+from pkilint.rest import model
+
+
+class CacheKey(NamedTuple):
+    fingerprint: bytes
+    '''The SHA-256 digest of the DER encoding of the document'''
+
+    linter_group_name: str
+    '''The name of the linter group (such as "cabf-serverauth")'''
+
+    linter_name: Optional[str]
+    '''The name of the linter, or None if the entry is the linter that was determined for the document'''
+
+    fail_fast_severity: Optional[validation.ValidationFindingSeverity]
+    '''The fail-fast severity with which the document was linted, if any'''
+
+    version: str
+    '''The version of pkilint'''
+
+    @property
+    def digest(self) -> str:
+        """A stable string representation of the key that is suitable for use as a file name"""
+        fail_fast_severity = '' if self.fail_fast_severity is None else self.fail_fast_severity.name
+
+        key_str = '\0'.join((
+            self.fingerprint.hex(), self.linter_group_name, self.linter_name or '', fail_fast_severity, self.version
+        ))
+
+        return hashlib.sha256(key_str.encode()).hexdigest()
+
+
+class CacheStoreEntry(NamedTuple):
+    value: str
+    '''The stored value'''
+
+    age: float
+    '''The number of seconds since the value was stored'''
+
+
+class CacheStore:
+    """A store that is shared by the caches of multiple server processes. Values are stored as text."""
+
+    def get(self, key: CacheKey, ttl: Optional[float]) -> Optional[CacheStoreEntry]:
+        pass
+
+    def put(self, key: CacheKey, value: str) -> None:
+        pass
+
+
+class FileCacheStore(CacheStore):
+    """Stores each value in its own file in the specified directory.
+
+    Files are written atomically, so the directory may be shared by server processes on the same host. Entries that have
+    expired are removed when they are read; entries that are never read again are not removed.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+
+        os.makedirs(path, exist_ok=True)
+
+    def _get_file_path(self, key: CacheKey) -> str:
+        return os.path.join(self._path, key.digest)
+
+    def get(self, key, ttl):
+        file_path = self._get_file_path(key)
+
+        try:
+            age = max(time.time() - os.path.getmtime(file_path), 0.0)
+
+            if ttl is not None and age > ttl:
+                os.remove(file_path)
+
+                return None
+
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return CacheStoreEntry(f.read(), age)
+        except OSError:
+            return None
+
+    def put(self, key, value):
+        fd, temp_path = tempfile.mkstemp(dir=self._path, prefix='.tmp-')
+
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(value)
+
+            os.replace(temp_path, self._get_file_path(key))
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+class LintCache:
+    """A bounded, in-process cache of linter determinations and lint results.
+
+    The least recently used entry is evicted once max_size entries are held, and entries expire ttl seconds after they
+    are added. If a store is specified, then entries that are not held in-process are retrieved from (and new entries
+    are added to) the store.
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None, store: Optional[CacheStore] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._store = store
+        self._clock = clock
+
+        self._entries: OrderedDict[CacheKey, Tuple[float, object]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        '''The number of lookups that were answered from the cache'''
+        self.misses = 0
+        '''The number of lookups that were not answered from the cache'''
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def has_store(self) -> bool:
+        """Whether entries are also retrieved from and added to a store, which may perform blocking I/O"""
+        return self._store is not None
+
+    def _get(self, key: CacheKey, from_str: Callable[[str], object]):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                added, value = entry
+
+                if self._ttl is None or self._clock() - added <= self._ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+
+                    return value
+
+                del self._entries[key]
+
+        if self._store is not None:
+            store_entry = self._store.get(key, self._ttl)
+
+            if store_entry is not None:
+                value = from_str(store_entry.value)
+
+                with self._lock:
+                    # the entry expires when the stored entry does, not ttl seconds after it was retrieved
+                    self._add(key, value, self._clock() - store_entry.age)
+                    self.hits += 1
+
+                return value
+
+        with self._lock:
+            self.misses += 1
+
+        return None
+
+    def _add(self, key: CacheKey, value, added: Optional[float] = None):
+        self._entries[key] = (self._clock() if added is None else added, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def _put(self, key: CacheKey, value, to_str: Callable[[object], str]):
+        with self._lock:
+            self._add(key, value)
+
+        if self._store is not None:
+            self._store.put(key, to_str(value))
+
+    def get_linter_name(self, key: CacheKey) -> Optional[str]:
+        return self._get(key, str)
+
+    def put_linter_name(self, key: CacheKey, linter_name: str) -> None:
+        self._put(key, linter_name, str)
+
+    def get_result_list(self, key: CacheKey) -> Optional[model.LintResultList]:
+        return self._get(key, model.LintResultList.model_validate_json)
+
+    def put_result_list(self, key: CacheKey, result_list: model.LintResultList) -> None:
+        self._put(key, result_list, model.LintResultList.model_dump_json)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+            self.hits = 0
+            self.misses = 0
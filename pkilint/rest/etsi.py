@@ -3,7 +3,6 @@ from pyasn1.error import PyAsn1Error
 from starlette import status
 
 from pkilint import etsi
-from pkilint.pkix import certificate
 from pkilint.rest import model
 
 
@@ -29,14 +28,7 @@ class EtsiLinterGroup(model.LinterGroup):
 def create_linter_group_instance():
     return EtsiLinterGroup(
         [
-            model.Linter(
-                validator=certificate.create_pkix_certificate_validator_container(
-                    etsi.create_decoding_validators(cert_type),
-                    etsi.create_validators(cert_type)
-                ),
-                finding_filters=etsi.create_etsi_finding_filters(cert_type),
-                name=cert_type.to_option_str
-            )
+            model.RegisteredLinter(profile_name='etsi', name=cert_type.to_option_str)
             for cert_type in etsi.CertificateType
         ]
     )
@@ -0,0 +1,250 @@
+import asyncio
+import concurrent.futures
+import logging
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+from fastapi import HTTPException
+from starlette import status
+from starlette.concurrency import run_in_threadpool
+
+from pkilint import linter_registry, validation
+from pkilint.rest import model
+
+logger = logging.getLogger(__name__)
+
+LintOutcome = Union[model.LintResultList, ValueError]
+'''The result list of a lint job, or the error that was raised when the document of the job could not be decoded'''
+
+
+class LintJob(NamedTuple):
+    linter: model.Linter
+    '''The linter with which the document is linted'''
+
+    doc: model.DocumentModel
+    '''The document, which is decoded by the executor (off the event loop) if it has not been decoded already'''
+
+
+class LintTask(NamedTuple):
+    """A picklable description of a lint job, which a worker process executes with its own copy of the linter"""
+
+    profile_name: str
+    '''The name of the profile of the linter in the linter registry'''
+
+    linter_name: str
+    '''The name of the linter in the linter registry'''
+
+    document_model_cls: Type[model.DocumentModel]
+    '''The class of the document model, which decodes the document'''
+
+    substrate: bytes
+    '''The DER encoding of the document'''
+
+    fail_fast_severity: Optional[validation.ValidationFindingSeverity]
+    '''The fail-fast severity, if any'''
+
+
+def _lint_document(linter: model.Linter, doc: model.DocumentModel,
+                   fail_fast_severity: Optional[validation.ValidationFindingSeverity]) -> LintOutcome:
+    try:
+        return linter.lint_document(doc, fail_fast_severity)
+    except ValueError as e:
+        return e
+
+
+def _run_lint_task(task: LintTask) -> LintOutcome:
+    doc = task.document_model_cls.from_der(task.substrate)
+
+    linter = model.RegisteredLinter(profile_name=task.profile_name, linter_name=task.linter_name, name=task.linter_name)
+
+    return _lint_document(linter, doc, task.fail_fast_severity)
+
+
+def _init_worker(linter_keys: List[Tuple[str, str]]):
+    for profile_name, linter_name in linter_keys:
+        linter_registry.get_linter(profile_name, linter_name)
+
+
+def _warm_up_worker() -> None:
+    pass
+
+
+def _lint_jobs(jobs: Sequence[LintJob],
+               fail_fast_severity: Optional[validation.ValidationFindingSeverity]) -> List[LintOutcome]:
+    return [_lint_document(job.linter, job.doc, fail_fast_severity) for job in jobs]
+
+
+class LintExecutor:
+    """Executes lint jobs on behalf of the asynchronous endpoints.
+
+    At most max_pending_requests requests may be executing or waiting to execute at a time; further requests are
+    rejected with HTTP status 503. Requests that are not completed within timeout seconds are answered with HTTP
+    status 504. Linting that has already started is not interrupted when a request times out.
+    """
+
+    def __init__(self, max_pending_requests: Optional[int] = None, timeout: Optional[float] = None):
+        self._max_pending_requests = max_pending_requests
+        self._timeout = timeout
+
+        self._pending_request_count = 0
+
+    @property
+    def pending_request_count(self) -> int:
+        return self._pending_request_count
+
+    async def _execute(self, jobs: Sequence[LintJob],
+                       fail_fast_severity: Optional[validation.ValidationFindingSeverity]
+                       ) -> List[LintOutcome]:
+        pass
+
+    async def lint_many(self, jobs: Sequence[LintJob],
+                        fail_fast_severity: Optional[validation.ValidationFindingSeverity] = None
+                        ) -> List[LintOutcome]:
+        """Lints the documents of the specified jobs as a single request, returning the results in the same order. The
+        error is returned in place of the result list of each document that cannot be decoded."""
+        if self._max_pending_requests is not None and self._pending_request_count >= self._max_pending_requests:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='Too many requests are pending; retry later'
+            )
+
+        self._pending_request_count += 1
+        try:
+            return await asyncio.wait_for(self._execute(jobs, fail_fast_severity), self._timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail='Linting did not complete within the request timeout'
+            )
+        finally:
+            self._pending_request_count -= 1
+
+    async def lint(self, linter: model.Linter, doc: model.DocumentModel,
+                   fail_fast_severity: Optional[validation.ValidationFindingSeverity] = None) -> model.LintResultList:
+        """Lints the specified document
+
+        Raises:
+            ValueError: The document cannot be decoded.
+        """
+        outcome, = await self.lint_many([LintJob(linter, doc)], fail_fast_severity)
+
+        if isinstance(outcome, ValueError):
+            raise outcome
+
+        return outcome
+
+    async def start(self):
+        """Prepares the executor before requests are accepted"""
+        pass
+
+    def shutdown(self):
+        pass
+
+
+class ThreadPoolLintExecutor(LintExecutor):
+    """Lints documents in the server process on the thread pool of the ASGI framework"""
+
+    async def _execute(self, jobs, fail_fast_severity):
+        return await run_in_threadpool(_lint_jobs, jobs, fail_fast_severity)
+
+
+class ProcessPoolLintExecutor(LintExecutor):
+    """Lints documents in a pool of worker processes. Each worker builds the specified linters when it is started.
+
+    Only linters that are retrieved from the linter registry can be executed in a worker process; jobs for other linters
+    are executed in the server process.
+
+    If a worker process terminates abruptly (for example, if it is killed when the system runs out of memory), then the
+    pool is replaced with a new pool whose workers are started in the background. The requests that were executing in
+    the broken pool are answered with HTTP status 503.
+    """
+
+    def __init__(self, worker_count: int, linters: Iterable[model.Linter],
+                 max_pending_requests: Optional[int] = None, timeout: Optional[float] = None):
+        super().__init__(max_pending_requests, timeout)
+
+        self._worker_count = worker_count
+        self._linter_keys = [
+            (l.profile_name, l.linter_name) for l in linters if isinstance(l, model.RegisteredLinter)
+        ]
+
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._warm_up_task: Optional[asyncio.Task] = None
+
+    def _get_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                self._worker_count, initializer=_init_worker, initargs=(self._linter_keys,)
+            )
+
+        return self._pool
+
+    async def _warm_up_pool(self, pool: concurrent.futures.ProcessPoolExecutor):
+        loop = asyncio.get_running_loop()
+
+        await asyncio.gather(*(loop.run_in_executor(pool, _warm_up_worker) for _ in range(self._worker_count)))
+
+    async def _warm_up_replacement_pool(self, pool: concurrent.futures.ProcessPoolExecutor):
+        try:
+            await self._warm_up_pool(pool)
+        except BrokenProcessPool:
+            # the replacement pool is itself replaced by the next request that uses it
+            pass
+
+    def _replace_broken_pool(self, broken_pool: concurrent.futures.ProcessPoolExecutor):
+        # concurrent requests observe the same broken pool, so only the first of them replaces it
+        if self._pool is not broken_pool:
+            return
+
+        logger.warning('A lint worker process terminated abruptly; replacing the worker process pool')
+
+        broken_pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+        self._warm_up_task = asyncio.ensure_future(self._warm_up_replacement_pool(self._get_pool()))
+
+    async def start(self):
+        """Starts the worker processes and submits a no-op task to each, so that the workers have been started and have
+        built their linters before requests are accepted"""
+        await self._warm_up_pool(self._get_pool())
+
+    async def _execute_job(self, job: LintJob, fail_fast_severity):
+        # a document that has already been decoded (such as for linter determination) is still linted in a worker
+        # process, which decodes it again, so that the validation does not contend for the server process's GIL
+        if isinstance(job.linter, model.RegisteredLinter):
+            try:
+                substrate = job.doc.substrate
+            except ValueError as e:
+                return e
+
+            task = LintTask(
+                job.linter.profile_name, job.linter.linter_name, type(job.doc), substrate, fail_fast_severity
+            )
+
+            pool = self._get_pool()
+
+            try:
+                return await asyncio.get_running_loop().run_in_executor(pool, _run_lint_task, task)
+            except BrokenProcessPool:
+                self._replace_broken_pool(pool)
+
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail='A lint worker process terminated unexpectedly; retry later'
+                )
+        else:
+            return await run_in_threadpool(_lint_document, job.linter, job.doc, fail_fast_severity)
+
+    async def _execute(self, jobs, fail_fast_severity):
+        return await asyncio.gather(*(self._execute_job(job, fail_fast_severity) for job in jobs))
+
+    def shutdown(self):
+        if self._warm_up_task is not None:
+            self._warm_up_task.cancel()
+
+            self._warm_up_task = None
+
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+            self._pool = None
@@ -0,0 +1,247 @@
+"""Operational metrics of the REST API server, exposed in the Prometheus text exposition format.
+
+Metrics are held in-process. If the server is run with multiple server processes (for example, with multiple Gunicorn
+workers), then each process reports its own metrics.
+"""
+
+import bisect
+import contextlib
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    elif value == int(value):
+        return str(int(value))
+    else:
+        return repr(value)
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[str]) -> str:
+    if not label_names:
+        return ''
+
+    labels = ','.join(f'{n}="{_escape_label_value(v)}"' for n, v in zip(label_names, label_values))
+
+    return f'{{{labels}}}'
+
+
+def get_resident_memory_bytes() -> Optional[int]:
+    """Returns the resident set size of this process, or None if it cannot be determined on this platform"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class Metric:
+    type_name: str = None
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+        self._lock = threading.Lock()
+
+    def _check_label_values(self, label_values: Sequence[str]) -> Tuple[str, ...]:
+        if len(label_values) != len(self.label_names):
+            raise ValueError(f'Metric "{self.name}" requires label values for {self.label_names}')
+
+        return tuple(map(str, label_values))
+
+    def collect_samples(self) -> Iterator[str]:
+        pass
+
+    def collect(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} {self.type_name}'
+
+        yield from self.collect_samples()
+
+
+class Counter(Metric):
+    type_name = 'counter'
+
+    def __init__(self, name, documentation, label_names=()):
+        super().__init__(name, documentation, label_names)
+
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        key = self._check_label_values(label_values)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, *label_values: str) -> float:
+        return self._values.get(self._check_label_values(label_values), 0)
+
+    def collect_samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+
+        for label_values, value in values:
+            yield f'{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}'
+
+
+class FunctionGauge(Metric):
+    """A gauge whose value is retrieved when the metrics are collected. If the function returns None, then no sample is
+    reported."""
+
+    type_name = 'gauge'
+
+    def __init__(self, name, documentation, value_func: Callable[[], Optional[float]]):
+        super().__init__(name, documentation)
+
+        self._value_func = value_func
+
+    def collect_samples(self):
+        value = self._value_func()
+
+        if value is not None:
+            yield f'{self.name} {_format_value(value)}'
+
+
+class FunctionCounter(FunctionGauge):
+    """A counter whose value is retrieved when the metrics are collected, such as a counter that is maintained by
+    another component"""
+
+    type_name = 'counter'
+
+
+class _HistogramValue:
+    __slots__ = ('bucket_counts', 'sum', 'count',)
+
+    def __init__(self, bucket_count: int):
+        self.bucket_counts = [0] * bucket_count
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, label_names=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+
+        self._upper_bounds = sorted(buckets)
+        self._values: Dict[Tuple[str, ...], _HistogramValue] = {}
+
+    def observe(self, *label_values: str, value: float) -> None:
+        key = self._check_label_values(label_values)
+        bucket_index = bisect.bisect_left(self._upper_bounds, value)
+
+        with self._lock:
+            histogram_value = self._values.get(key)
+            if histogram_value is None:
+                histogram_value = _HistogramValue(len(self._upper_bounds) + 1)
+
+                self._values[key] = histogram_value
+
+            histogram_value.bucket_counts[bucket_index] += 1
+            histogram_value.sum += value
+            histogram_value.count += 1
+
+    @contextlib.contextmanager
+    def time(self, *label_values: str):
+        """Observes the duration of the block in seconds"""
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.observe(*label_values, value=time.perf_counter() - start)
+
+    def get_count(self, *label_values: str) -> int:
+        histogram_value = self._values.get(self._check_label_values(label_values))
+
+        return 0 if histogram_value is None else histogram_value.count
+
+    def collect_samples(self):
+        with self._lock:
+            values = sorted(
+                (k, (list(v.bucket_counts), v.sum, v.count)) for k, v in self._values.items()
+            )
+
+        bucket_label_names = self.label_names + ('le',)
+
+        for label_values, (bucket_counts, value_sum, count) in values:
+            cumulative_count = 0
+            for upper_bound, bucket_count in zip(self._upper_bounds + [math.inf], bucket_counts):
+                cumulative_count += bucket_count
+
+                labels = _format_labels(bucket_label_names, label_values + (_format_value(upper_bound),))
+                yield f'{self.name}_bucket{labels} {cumulative_count}'
+
+            labels = _format_labels(self.label_names, label_values)
+            yield f'{self.name}_sum{labels} {_format_value(value_sum)}'
+            yield f'{self.name}_count{labels} {count}'
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+
+        return metric
+
+    def render(self) -> str:
+        """Renders all registered metrics in the text exposition format"""
+        return ''.join(f'{line}\n' for metric in self._metrics for line in metric.collect())
+
+
+REGISTRY = MetricsRegistry()
+
+REGISTRY.register(FunctionGauge(
+    'process_resident_memory_bytes', 'The resident set size of this process', get_resident_memory_bytes
+))
+
+PHASE_DECODE = 'decode'
+PHASE_DETERMINE_LINTER = 'determine_linter'
+PHASE_VALIDATE = 'validate'
+PHASE_FILTER = 'filter'
+PHASE_SERIALIZE = 'serialize'
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    'pkilint_http_requests_total', 'The number of HTTP requests that were handled',
+    ('method', 'route', 'status_code')
+))
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    'pkilint_http_request_duration_seconds', 'The duration of HTTP requests', ('method', 'route')
+))
+LINT_REQUESTS = REGISTRY.register(Counter(
+    'pkilint_lint_requests_total', 'The number of documents that were linted, including documents in batches',
+    ('linter_group', 'linter', 'cached')
+))
+LINT_REQUEST_DURATION = REGISTRY.register(Histogram(
+    'pkilint_lint_request_duration_seconds',
+    'The duration of single-document lint requests, from linter determination to the construction of the response',
+    ('linter_group', 'linter')
+))
+PHASE_DURATION = REGISTRY.register(Histogram(
+    'pkilint_phase_duration_seconds', 'The duration of each phase of processing a document that was not cached',
+    ('linter_group', 'phase')
+))
+DECODE_FAILURES = REGISTRY.register(Counter(
+    'pkilint_decode_failures_total', 'The number of documents that could not be decoded', ('linter_group',)
+))
+UNHANDLED_EXCEPTIONS = REGISTRY.register(Counter(
+    'pkilint_unhandled_exceptions_total', 'The number of unhandled exceptions raised by validators', ('validator',)
+))
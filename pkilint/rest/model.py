@@ -1,10 +1,14 @@
-from typing import List, Optional
+import base64
+import enum
+import hashlib
+import time
+from typing import Dict, List, Optional
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Query
 from pydantic import BaseModel, Field, model_validator
 from typing_extensions import Annotated
 
-from pkilint import finding_filter, report, validation, loader, document
+from pkilint import finding_filter, report, validation, loader, document, linter_registry
 
 
 class Version(BaseModel):
@@ -37,34 +41,168 @@ class Result(BaseModel):
 
 class LintResultList(BaseModel):
     results: Annotated[List[Result], Field(description='The list of results returned by the linter')]
+    truncated: Annotated[
+        bool,
+        Field(description='Whether linting stopped early due to a finding at or above the fail-fast severity, in '
+                          'which case the list of results is incomplete')
+    ] = False
+
+    _phase_durations: Optional[Dict[str, float]] = None
+    '''The number of seconds spent in each phase of linting (decoding, if the document was decoded for linting, as well
+    as validation, filtering and serialization), or None if the list was not produced by linting (such as a list that
+    was retrieved from a cache)'''
+
+    @property
+    def phase_durations(self) -> Optional[Dict[str, float]]:
+        return self._phase_durations
+
+
+_REPORTED_SEVERITY_THRESHOLD = validation.ValidationFindingSeverity.INFO
+
+
+class _ResultListGenerator(report.ReportGeneratorBase):
+    """Builds the response models for validation results directly, so that the results are serialized only once (when
+    the response is sent). The models are constructed without validation, as their values are known to be valid."""
+
+    def __init__(self, results):
+        super().__init__(results, _REPORTED_SEVERITY_THRESHOLD, [])
+
+    def handle_result(self, result, finding_descriptions):
+        if self.is_relevant_result(result, finding_descriptions):
+            result_model = Result.model_construct(
+                validator=str(result.validator), node_path=result.node.path, finding_descriptions=[]
+            )
+
+            self.report_context.append(result_model)
+
+            return result_model.finding_descriptions
+
+    def handle_finding_description(self, result, finding_description, result_context):
+        result_context.append(
+            FindingDescription.model_construct(
+                severity=finding_description.finding.severity.name,
+                code=finding_description.finding.code,
+                message=finding_description.message
+            )
+        )
+
+    def generate(self) -> List[Result]:
+        super().generate()
+
+        return self.report_context
 
 
 class Linter(BaseModel):
     name: Annotated[str, Field(description='The name of the linter')]
 
-    def __init__(self, validator, finding_filters=None, **kwargs):
+    def __init__(self, validator=None, finding_filters=None, **kwargs):
         super().__init__(**kwargs)
 
         self._validator = validator
         self._finding_filters = finding_filters
 
+    def _get_validator_and_filters(self):
+        return self._validator, self._finding_filters
+
     @property
     def validations(self) -> List[Validation]:
+        validator, _ = self._get_validator_and_filters()
+
         return [
             Validation(severity=str(v.severity), code=v.code)
-            for v in report.get_included_validations(self._validator)
+            for v in report.get_included_validations(validator)
         ]
 
-    def lint(self, doc) -> LintResultList:
-        results = self._validator.validate(doc.root)
+    def lint(self, doc, fail_fast_severity: Optional[validation.ValidationFindingSeverity] = None) -> LintResultList:
+        validator, finding_filters = self._get_validator_and_filters()
+
+        fail_fast = finding_filter.create_fail_fast_condition(fail_fast_severity, finding_filters)
+
+        start = time.perf_counter()
+
+        results = validator.validate(doc.root, _REPORTED_SEVERITY_THRESHOLD, fail_fast)
+
+        validated = time.perf_counter()
+
+        if finding_filters is not None:
+            results, _ = finding_filter.filter_results(finding_filters, results)
+
+        filtered = time.perf_counter()
+
+        result_list = LintResultList.model_construct(
+            results=_ResultListGenerator(results).generate(),
+            truncated=fail_fast is not None and fail_fast.triggered
+        )
+
+        result_list._phase_durations = {
+            'validate': validated - start,
+            'filter': filtered - validated,
+            'serialize': time.perf_counter() - filtered,
+        }
+
+        return result_list
 
-        if self._finding_filters is not None:
-            results, _ = finding_filter.filter_results(self._finding_filters, results)
+    def lint_document(self, doc: 'DocumentModel',
+                      fail_fast_severity: Optional[validation.ValidationFindingSeverity] = None) -> LintResultList:
+        """Decodes the specified document (unless it has already been decoded) and lints it. The duration of decoding
+        is included in the phase durations of the returned list.
 
-        report_gen = report.ReportGeneratorJson(results, validation.ValidationFindingSeverity.INFO)
-        json_str = report_gen.generate()
+        Raises:
+            ValueError: The document cannot be decoded.
+        """
+        is_parsed = doc.is_parsed
 
-        return LintResultList.model_validate_json(json_str)
+        start = time.perf_counter()
+
+        parsed_doc = doc.parse_document()
+
+        decode_duration = time.perf_counter() - start
+
+        result_list = self.lint(parsed_doc, fail_fast_severity)
+
+        if not is_parsed:
+            result_list._phase_durations['decode'] = decode_duration
+
+        return result_list
+
+
+class RegisteredLinter(Linter):
+    """A linter that is retrieved from the process-wide linter registry, which builds it on first use."""
+
+    def __init__(self, profile_name: str, linter_name: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
+
+        self._profile_name = profile_name
+        self._linter_name = self.name if linter_name is None else linter_name
+
+    @property
+    def profile_name(self) -> str:
+        return self._profile_name
+
+    @property
+    def linter_name(self) -> str:
+        return self._linter_name
+
+    def _get_validator_and_filters(self):
+        linter = linter_registry.get_linter(self._profile_name, self._linter_name)
+
+        return linter.validator, linter.finding_filters
+
+
+FailFastSeverity = enum.Enum(
+    'FailFastSeverity', {s.name: s.name for s in validation.ValidationFindingSeverity}, type=str
+)
+'''The severity names that may be specified as the fail-fast severity'''
+
+FailFastQuery = Annotated[
+    Optional[FailFastSeverity],
+    Query(description='Stop linting at the first finding that is at least as severe as the specified severity. The '
+                      'returned list of results is then truncated.')
+]
+
+
+def to_fail_fast_severity(fail_fast: Optional[FailFastSeverity]) -> Optional[validation.ValidationFindingSeverity]:
+    return None if fail_fast is None else validation.ValidationFindingSeverity[fail_fast.value]
 
 
 class LintResultListWithLinter(LintResultList):
@@ -89,6 +227,10 @@ class DocumentModel(BaseModel):
     pem: Annotated[Optional[str], Field(description='A PEM-encoded ASN.1 document')] = None
     b64: Annotated[Optional[str], Field(description='A Base64-encoded DER representation of an ASN.1 document')] = None
 
+    _substrate: Optional[bytes] = None
+    _fingerprint: Optional[bytes] = None
+    _parsed_document: Optional[document.Document] = None
+
     def _validate(self) -> 'DocumentModel':
         if self.pem and self.b64:
             raise ValueError('Cannot set both "pem" and "b64" fields; exactly one must be specified')
@@ -97,57 +239,167 @@ class DocumentModel(BaseModel):
         else:
             return self
 
-    def parse_document(self) -> document.Document:
+    def _pem_to_der(self, pem: str) -> bytes:
         pass
 
+    def _load_der(self, der: bytes) -> document.Document:
+        pass
 
-class CertificateModel(DocumentModel):
-    _parsed_document = None
+    @classmethod
+    def from_der(cls, der: bytes) -> 'DocumentModel':
+        """Creates a model for the specified DER encoding, such as the body of a request with a DER media type"""
+        doc = cls.model_construct()
+        doc._substrate = der
 
-    @model_validator(mode='after')
-    def validate(self) -> 'CertificateModel':
-        super()._validate()
+        return doc
 
+    @property
+    def _invalid_document_message(self) -> str:
         if self.pem is not None:
+            return 'Invalid PEM text specified'
+        elif self.b64 is not None:
+            return 'Invalid Base-64 encoding specified'
+        else:
+            return 'Invalid DER encoding specified'
+
+    @property
+    def substrate(self) -> bytes:
+        """The DER encoding of the document. The document is not decoded."""
+        if self._substrate is None:
+            self._validate()
+
             try:
-                self._parsed_document = loader.load_pem_certificate(self.pem, 'request', 'request')
+                if self.pem is not None:
+                    self._substrate = self._pem_to_der(self.pem)
+                else:
+                    self._substrate = base64.b64decode(self.b64)
             except ValueError as e:
-                raise ValueError('Invalid PEM text specified') from e
-        else:
+                raise ValueError(self._invalid_document_message) from e
+
+        return self._substrate
+
+    @property
+    def fingerprint(self) -> bytes:
+        """The SHA-256 digest of the DER encoding of the document"""
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.sha256(self.substrate).digest()
+
+        return self._fingerprint
+
+    @property
+    def is_parsed(self) -> bool:
+        """Whether the document has been decoded"""
+        return self._parsed_document is not None
+
+    def parse_document(self) -> document.Document:
+        """Decodes the document on first use"""
+        substrate = self.substrate
+
+        if self._parsed_document is None:
             try:
-                self._parsed_document = loader.load_b64_certificate(self.b64, 'request', 'request')
+                self._parsed_document = self._load_der(substrate)
             except ValueError as e:
-                raise ValueError('Invalid Base-64 encoding specified') from e
+                raise ValueError(self._invalid_document_message) from e
+
+        return self._parsed_document
+
+
+class CertificateDocumentModel(DocumentModel):
+    """A certificate that is not parsed until :py:meth:`parse_document` is called"""
+
+    def _pem_to_der(self, pem):
+        return loader.pem_certificate_to_der(pem)
+
+    def _load_der(self, der):
+        return loader.load_der_certificate(der, 'request', 'request')
+
+
+class CertificateModel(CertificateDocumentModel):
+    """A certificate whose PEM or Base-64 encoding is validated along with the request. The certificate itself is
+    decoded on first access of :py:attr:`parsed_document`, so a request that is answered from the response cache does
+    not decode the certificate."""
+
+    @model_validator(mode='after')
+    def validate(self) -> 'CertificateModel':
+        _ = self.substrate
 
         return self
 
     @property
     def parsed_document(self):
-        return self._parsed_document
+        return self.parse_document()
+
+
+class OcspResponseDocumentModel(DocumentModel):
+    """An OCSP response that is not parsed until :py:meth:`parse_document` is called"""
+
+    def _pem_to_der(self, pem):
+        return loader.pem_ocsp_response_to_der(pem)
+
+    def _load_der(self, der):
+        return loader.load_der_ocsp_response(der, 'request', 'request')
 
 
-class OcspResponseModel(DocumentModel):
-    _parsed_document = None
+class OcspResponseModel(OcspResponseDocumentModel):
+    """An OCSP response whose PEM or Base-64 encoding is validated along with the request. The OCSP response itself is
+    decoded on first access of :py:attr:`parsed_document`."""
 
     @model_validator(mode='after')
     def validate(self) -> 'OcspResponseModel':
-        super()._validate()
+        _ = self.substrate
 
-        if self.pem is not None:
-            try:
-                self._parsed_document = loader.load_pem_ocsp_response(self.pem, 'request', 'request')
-            except ValueError as e:
-                raise ValueError('Invalid PEM text specified') from e
-        else:
-            try:
-                self._parsed_document = loader.load_b64_ocsp_response(self.b64, 'request', 'request')
-            except ValueError as e:
-                raise ValueError('Invalid Base-64 encoding specified') from e
         return self
 
     @property
     def parsed_document(self):
-        return self._parsed_document
+        return self.parse_document()
+
+
+class CertificateBatchModel(BaseModel):
+    documents: Annotated[
+        List[CertificateDocumentModel],
+        Field(description='The certificates to lint. Each certificate is parsed and linted independently.')
+    ]
+
+
+class OcspResponseBatchModel(BaseModel):
+    documents: Annotated[
+        List[OcspResponseDocumentModel],
+        Field(description='The OCSP responses to lint. Each OCSP response is parsed and linted independently.')
+    ]
+
+
+class BatchLintResult(BaseModel):
+    linter: Annotated[
+        Optional[Linter],
+        Field(description='The linter that was used for linting the document, if the document was linted')
+    ] = None
+    results: Annotated[
+        Optional[List[Result]],
+        Field(description='The list of results returned by the linter, if the document was linted')
+    ] = None
+    truncated: Annotated[
+        bool,
+        Field(description='Whether linting stopped early due to a finding at or above the fail-fast severity')
+    ] = False
+    error: Annotated[
+        Optional[str],
+        Field(description='The reason that the document could not be parsed or linted, if an error occurred')
+    ] = None
+
+
+class BatchLintResultList(BaseModel):
+    items: Annotated[
+        List[BatchLintResult],
+        Field(description='The outcome for each document, in the order in which the documents were specified')
+    ]
+
+
+class CacheStatistics(BaseModel):
+    enabled: Annotated[bool, Field(description='Whether the response cache is enabled')]
+    size: Annotated[int, Field(description='The number of entries that are held in-process')] = 0
+    hits: Annotated[int, Field(description='The number of lookups that were answered from the cache')] = 0
+    misses: Annotated[int, Field(description='The number of lookups that were not answered from the cache')] = 0
 
 
 def create_unprocessable_entity_error_detail(message: str, error_type: str = 'value_error'):
@@ -0,0 +1,161 @@
+"""Request body dependencies that accept documents either in a JSON body or as raw DER.
+
+A JSON body is validated with the same pydantic model as before. A body whose media type is the DER media type of the
+document (such as "application/pkix-cert") is used as-is, so that the document is decoded directly from the request
+octets. For batch endpoints, a DER body is a concatenation of DER-encoded documents.
+"""
+
+import os
+from typing import Type
+
+import pydantic
+from fastapi import Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from starlette import status
+from typing_extensions import Annotated
+
+from pkilint import der
+from pkilint.rest import model
+
+PKIX_CERT_MEDIA_TYPE = 'application/pkix-cert'
+OCSP_RESPONSE_MEDIA_TYPE = 'application/ocsp-response'
+
+MAX_BATCH_SIZE_ENV_VAR = 'PKILINT_REST_MAX_BATCH_SIZE'
+'''The environment variable that specifies the maximum number of documents that may be submitted in a batch'''
+
+_DEFAULT_MAX_BATCH_SIZE = 1000
+
+_MAX_BATCH_SIZE = int(os.environ.get(MAX_BATCH_SIZE_ENV_VAR, _DEFAULT_MAX_BATCH_SIZE))
+
+
+def _get_media_type(request: Request) -> str:
+    return request.headers.get('content-type', '').split(';', 1)[0].strip().casefold()
+
+
+def _validate_json(model_cls: Type[pydantic.BaseModel], body: bytes):
+    try:
+        return model_cls.model_validate_json(body)
+    except pydantic.ValidationError as e:
+        raise RequestValidationError(
+            [{**error, 'loc': ('body', *error['loc'])} for error in e.errors(include_url=False)]
+        )
+
+
+def check_batch_size(document_count: int) -> None:
+    """Raises an HTTP 422 error if the specified number of documents exceeds the maximum batch size"""
+    if document_count > _MAX_BATCH_SIZE:
+        message = f'Batch contains {document_count} documents; at most {_MAX_BATCH_SIZE} documents may be specified'
+
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=model.create_unprocessable_entity_error_detail(message)
+        )
+
+
+def _create_openapi_extra(json_schema: dict, der_media_type: str, der_description: str) -> dict:
+    return {
+        'requestBody': {
+            'required': True,
+            'content': {
+                'application/json': {
+                    'schema': json_schema,
+                },
+                der_media_type: {
+                    'schema': {
+                        'type': 'string',
+                        'format': 'binary',
+                        'description': der_description,
+                    },
+                },
+            },
+        },
+    }
+
+
+class DocumentBody:
+    """A dependency that returns the document model for a JSON body or a DER body"""
+
+    def __init__(self, document_model_cls: Type[model.DocumentModel], der_media_type: str):
+        self._document_model_cls = document_model_cls
+        self._der_media_type = der_media_type
+
+    async def __call__(self, request: Request) -> model.DocumentModel:
+        body = await request.body()
+
+        if _get_media_type(request) == self._der_media_type:
+            return self._document_model_cls.from_der(body)
+        else:
+            return _validate_json(self._document_model_cls, body)
+
+    @property
+    def openapi_extra(self) -> dict:
+        return _create_openapi_extra(
+            self._document_model_cls.model_json_schema(), self._der_media_type, 'A DER-encoded document'
+        )
+
+
+class DocumentBatchBody:
+    """A dependency that returns the batch model for a JSON body or a body that is a concatenation of DER-encoded
+    documents"""
+
+    def __init__(self, batch_model_cls: Type[pydantic.BaseModel], document_model_cls: Type[model.DocumentModel],
+                 der_media_type: str):
+        self._batch_model_cls = batch_model_cls
+        self._document_model_cls = document_model_cls
+        self._der_media_type = der_media_type
+
+    async def __call__(self, request: Request):
+        body = await request.body()
+
+        if _get_media_type(request) != self._der_media_type:
+            return _validate_json(self._batch_model_cls, body)
+
+        spans = []
+        try:
+            for span in der.iter_top_level_spans(body):
+                spans.append(span)
+
+                # stop splitting the body as soon as the batch is known to be too large
+                check_batch_size(len(spans))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=model.create_unprocessable_entity_error_detail(f'Invalid concatenation of documents: {e}')
+            )
+
+        return self._batch_model_cls.model_construct(
+            documents=[self._document_model_cls.from_der(body[s.offset:s.end]) for s in spans]
+        )
+
+    @property
+    def openapi_extra(self) -> dict:
+        document_schema = self._document_model_cls.model_json_schema()
+
+        json_schema = {
+            'title': self._batch_model_cls.__name__,
+            'type': 'object',
+            'properties': {
+                'documents': {
+                    'type': 'array',
+                    'items': document_schema,
+                },
+            },
+            'required': ['documents'],
+        }
+
+        return _create_openapi_extra(json_schema, self._der_media_type, 'A concatenation of DER-encoded documents')
+
+
+CERTIFICATE_BODY = DocumentBody(model.CertificateModel, PKIX_CERT_MEDIA_TYPE)
+CERTIFICATE_BATCH_BODY = DocumentBatchBody(
+    model.CertificateBatchModel, model.CertificateDocumentModel, PKIX_CERT_MEDIA_TYPE
+)
+OCSP_RESPONSE_BODY = DocumentBody(model.OcspResponseModel, OCSP_RESPONSE_MEDIA_TYPE)
+OCSP_RESPONSE_BATCH_BODY = DocumentBatchBody(
+    model.OcspResponseBatchModel, model.OcspResponseDocumentModel, OCSP_RESPONSE_MEDIA_TYPE
+)
+
+CertificateBody = Annotated[model.CertificateModel, Depends(CERTIFICATE_BODY)]
+CertificateBatchBody = Annotated[model.CertificateBatchModel, Depends(CERTIFICATE_BATCH_BODY)]
+OcspResponseBody = Annotated[model.OcspResponseModel, Depends(OCSP_RESPONSE_BODY)]
+OcspResponseBatchBody = Annotated[model.OcspResponseBatchModel, Depends(OCSP_RESPONSE_BATCH_BODY)]
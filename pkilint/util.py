@@ -1,14 +1,16 @@
 import argparse
+import contextlib
 import datetime
 import functools
-from typing import Type
+import sys
+from typing import Type, Optional
 
 import dateutil.parser
 from cryptography.hazmat.primitives import hashes
 
-from pkilint import validation, report, document
+from pkilint import validation, report, document, profiling, finding_filter
 from pkilint.pkix.certificate import certificate_validity
-from pkilint.report import report_wrapper, REPORT_FORMATS
+from pkilint.report import write_report, REPORT_WRITERS
 
 
 def calculate_hash(octets: bytes, hash_algo: hashes.HashAlgorithm) -> bytes:
@@ -64,17 +66,17 @@ class ReportFormatAction(argparse.Action):
         super().__init__(*args, **kwargs)
 
     def __call__(self, parser, namespace, values, option_string=None):
-        report_generator_cls = REPORT_FORMATS[values]
+        report_writer_cls = REPORT_WRITERS[values]
 
-        setattr(namespace, self.dest, functools.partial(report_wrapper, report_generator_cls))
+        setattr(namespace, self.dest, functools.partial(write_report, report_writer_cls))
 
 
 def add_report_format_arg(parser):
     parser.add_argument('-f', '--format',
                         type=str.upper,
-                        default=functools.partial(report_wrapper, report.ReportGeneratorPlaintext),
+                        default=functools.partial(write_report, report.ReportWriterPlaintext),
                         help='The format in which results will be output.',
-                        choices=list(REPORT_FORMATS.keys()),
+                        choices=list(REPORT_WRITERS.keys()),
                         action=ReportFormatAction
                         )
 
@@ -128,9 +130,78 @@ add_certificate_validity_period_start_arg = functools.partial(
 )
 
 
+def add_profile_arg(parser):
+    parser.add_argument('--timing-profile',
+                        type=argparse.FileType('w'),
+                        metavar='FILE',
+                        help='Write per-validator timing and call counts to the specified file in JSON format. '
+                             'Specify "-" to write to standard output.'
+                        )
+
+
+@contextlib.contextmanager
+def profile_validation(profile_output):
+    """Collects validation statistics for the duration of the context and then writes them to the specified file
+    object. If no file object is specified, then no statistics are collected."""
+    if profile_output is None:
+        yield None
+    else:
+        with profiling.ValidationProfiler() as profiler:
+            yield profiler
+
+        profiler.dump_json(profile_output)
+        profile_output.flush()
+
+
+def add_fail_fast_arg(parser):
+    parser.add_argument('--fail-fast',
+                        type=argparse_enum_type_parser(validation.ValidationFindingSeverity),
+                        nargs='?',
+                        const=validation.ValidationFindingSeverity.ERROR,
+                        metavar='SEVERITY',
+                        help='Stop linting at the first reported finding that is at least as severe as the specified '
+                             'severity (default: ERROR). The reported results are then incomplete.'
+                        )
+
+
+def add_finding_code_selection_arg(parser):
+    parser.add_argument('--only',
+                        action='append',
+                        metavar='CODE_PATTERN',
+                        help='Execute only the validators that may report findings with codes that match the specified '
+                             'shell-style pattern (such as "cabf.serverauth.*"). May be specified multiple times.'
+                        )
+
+
+def select_validators(validator_container: validation.ValidatorContainer, args) -> validation.ValidatorContainer:
+    """Prunes the validator container to the finding codes selected on the command line, if any. A ValueError is raised
+    if no finding code matches the selection."""
+    if not args.only:
+        return validator_container
+
+    return validation.select_validators_by_finding_code(validator_container, args.only)
+
+
+def create_fail_fast_condition(args, finding_filters=None) -> Optional[validation.FailFastCondition]:
+    return finding_filter.create_fail_fast_condition(args.fail_fast, finding_filters)
+
+
+def print_fail_fast_notice(fail_fast: Optional[validation.FailFastCondition]):
+    """Notes on standard error that linting was stopped early, if it was"""
+    if fail_fast is not None and fail_fast.triggered:
+        blocking_result = fail_fast.blocking_result
+        finding = blocking_result.finding_descriptions[0].finding
+
+        print(f'Linting stopped at the first finding with severity {fail_fast.severity} or greater: {finding} on '
+              f'node "{blocking_result.node.path}"; results are truncated', file=sys.stderr)
+
+
 def add_standard_args(parser):
     add_severity_arg(parser)
     add_report_format_arg(parser)
+    add_profile_arg(parser)
+    add_fail_fast_arg(parser)
+    add_finding_code_selection_arg(parser)
 
 
 # This ensures that if a large (>255) number of findings are reported, we don't accidentally exit with an
@@ -1,17 +1,24 @@
+import copy
 import enum
+import fnmatch
 import itertools
 import logging
-from typing import Callable, NamedTuple, List, Optional
+import time
+from typing import Callable, NamedTuple, List, Optional, Union, Dict, Iterable, Iterator
 
-from pyasn1.codec.der.encoder import encode
 from pyasn1.type.constraint import PermittedAlphabetConstraint, ValueRangeConstraint
 from pyasn1.type.error import ValueConstraintError
 from pyasn1.type.univ import ObjectIdentifier
 
-from pkilint.document import PDUNode, NodeVisitor, SubstrateDecodingFailedError, PDUNavigationFailedError
+from pkilint import profiling
+from pkilint.document import (PDUNode, NodeVisitor, SubstrateDecodingFailedError, PDUNavigationFailedError,
+                              compile_path, NodeVisitorIndex)
 
 logger = logging.getLogger(__name__)
 
+DECODING_TAG = 'decoding'
+'''The tag of validators that decode values which other validators depend upon'''
+
 
 @enum.unique
 class ValidationFindingSeverity(enum.IntEnum):
@@ -86,32 +93,66 @@ class Validator(NodeVisitor):
 
         self._validations = validations
 
-    def validate_wrapper(self, node: PDUNode) -> 'ValidationResult':
+    def validate_wrapper(self, node: PDUNode,
+                         severity_threshold: Optional[ValidationFindingSeverity] = None,
+                         fail_fast: Optional['FailFastCondition'] = None) -> 'ValidationResult':
+        """Executes the validator on the specified node, converting raised findings and unhandled exceptions into a
+        result. If a severity threshold is specified, then findings with a lesser severity are discarded without
+        formatting their messages."""
         try:
             # pylint: disable=assignment-from-no-return
-            results = self.validate(node)
+            results = self._validate_with_options(node, severity_threshold, fail_fast)
             if results is None:
                 return ValidationResult(self, node, [])
+            elif severity_threshold is not None and isinstance(results, ValidationResult):
+                return results.filter_by_severity(severity_threshold)
             else:
                 return results
 
         except ValidationFindingEncountered as e:
+            if severity_threshold is not None and e.finding.severity > severity_threshold:
+                return ValidationResult(self, node, [])
+
             finding = ValidationFindingDescription(e.finding, e.message)
         except Exception as e:
-            logger.exception('Unhandled exception occurred when executing '
-                             'validator %s on node %s', self.name, node.path
-                             )
-            finding = ValidationFindingDescription(
-                self.VALIDATION_FINDING_UNHANDLED_EXCEPTION,
-                str(e)
-            )
+            return self._create_unhandled_exception_result(node, e)
+
+        return ValidationResult(self, node, [finding])
+
+    def _create_unhandled_exception_result(self, node: PDUNode, e: Exception) -> 'ValidationResult':
+        logger.exception('Unhandled exception occurred when executing '
+                         'validator %s on node %s', self.name, node.path
+                         )
+
+        profiler = profiling.get_active_profiler()
+        if profiler is not None:
+            profiler.record_exception(self, node)
+
+        finding = ValidationFindingDescription(
+            self.VALIDATION_FINDING_UNHANDLED_EXCEPTION,
+            str(e)
+        )
 
         return ValidationResult(self, node, [finding])
 
+    def _validate_with_options(self, node: PDUNode, severity_threshold: Optional[ValidationFindingSeverity],
+                               fail_fast: Optional['FailFastCondition']) -> 'ValidationResult':
+        return self.validate(node)
+
     def validate(self, node: PDUNode) -> 'ValidationResult':
         """Validates the specified node"""
         pass
 
+    def may_report(self, severity_threshold: ValidationFindingSeverity) -> bool:
+        """Returns whether the validator may report a finding that is at least as severe as the specified threshold.
+
+        Validators that do not declare their findings are assumed to report findings of any severity, as they may
+        also have side effects (such as decoding) that other validators rely upon.
+        """
+        declared = [v for v in self._validations if v is not self.VALIDATION_FINDING_UNHANDLED_EXCEPTION]
+
+        return not declared or any(v.severity <= severity_threshold for v in declared)
+
     @property
     def tags(self) -> List[str]:
         return ['static']
@@ -137,6 +178,15 @@ class ValidationResult(NamedTuple):
     finding_descriptions: List[ValidationFindingDescription]
     '''The list of findings and their associated messages'''
 
+    def filter_by_severity(self, severity_threshold: ValidationFindingSeverity) -> 'ValidationResult':
+        """Returns a result that contains only the findings that are at least as severe as the specified threshold"""
+        finding_descriptions = [f for f in self.finding_descriptions if f.finding.severity <= severity_threshold]
+
+        if len(finding_descriptions) == len(self.finding_descriptions):
+            return self
+        else:
+            return self._replace(finding_descriptions=finding_descriptions)
+
     def __repr__(self):
         findings_str = ', '.join([str(f) for f in self.finding_descriptions])
         return f'{self.validator} result for "{self.node}": {findings_str}'
@@ -145,11 +195,57 @@ class ValidationResult(NamedTuple):
 class ValidationFindingEncountered(Exception):
     """A convenient way to raise findings from a validator"""
 
-    def __init__(self, finding: ValidationFinding, message: str = None):
+    def __init__(self, finding: ValidationFinding, message: Union[str, Callable[[], str], None] = None):
         self.finding = finding
         '''The finding that is being raised by the validator'''
-        self.message = message
-        '''An optional message providing additional human-readable context for the finding'''
+        self._message = message
+
+    @property
+    def message(self) -> Optional[str]:
+        """An optional message providing additional human-readable context for the finding.
+
+        The message may be specified as a callable, in which case it is formatted on first access. This avoids the cost
+        of formatting messages for findings that are not reported.
+        """
+        if callable(self._message):
+            self._message = self._message()
+
+        return self._message
+
+
+class FailFastCondition:
+    """Stops the execution of a validator container once a result with a blocking finding is produced.
+
+    By default, findings that are at least as severe as the specified severity are blocking. The first result that
+    contains a blocking finding is recorded, so a new instance must be used for each validation.
+    """
+
+    def __init__(self, severity: ValidationFindingSeverity = ValidationFindingSeverity.ERROR):
+        self.severity = severity
+        '''The least severe finding severity that stops validation'''
+        self.blocking_result: Optional[ValidationResult] = None
+        '''The blocking findings of the result that stopped validation, if validation was stopped'''
+
+    def is_blocking_finding(self, result: ValidationResult, finding_description: ValidationFindingDescription) -> bool:
+        return finding_description.finding.severity <= self.severity
+
+    def evaluate(self, result: ValidationResult) -> bool:
+        """Returns whether the specified result contains a blocking finding, recording the result if so"""
+        blocking_finding_descriptions = [
+            f for f in result.finding_descriptions if self.is_blocking_finding(result, f)
+        ]
+
+        if any(blocking_finding_descriptions):
+            self.blocking_result = result._replace(finding_descriptions=blocking_finding_descriptions)
+
+            return True
+        else:
+            return False
+
+    @property
+    def triggered(self) -> bool:
+        """Whether validation was stopped, in which case the results of the validation are incomplete"""
+        return self.blocking_result is not None
 
 
 class ValidatorContainer(Validator):
@@ -158,38 +254,198 @@ class ValidatorContainer(Validator):
 
     def __init__(self, *, validators: List[Validator], **kwargs):
         self.validators = validators
-        validations_2d = (v.validations for v in self.validators)
+        self._dispatch_index = None
+        self._threshold_dispatch_indexes = {}
+
+        super().__init__(validations=self._collect_validations(validators), **kwargs)
+
+    @classmethod
+    def _collect_validations(cls, validators: List[Validator]) -> List[ValidationFinding]:
+        validations_2d = (v.validations for v in validators)
         validations_1d = itertools.chain.from_iterable(validations_2d)
 
-        all_validations = [
+        return [
             v
             for v in validations_1d
-            if v is not self.VALIDATION_FINDING_UNHANDLED_EXCEPTION
+            if v is not cls.VALIDATION_FINDING_UNHANDLED_EXCEPTION
         ]
 
-        super().__init__(validations=all_validations, **kwargs)
+    def prune(self, predicate: Callable[[Validator], bool]) -> 'ValidatorContainer':
+        """Returns a copy of the container that includes only the validators for which the predicate is true.
+
+        Nested containers are pruned recursively and are omitted if none of their validators are included. The
+        container is not modified.
+        """
+        validators = []
 
-    def _validate_rec(self, node: PDUNode,
-                      results: List[ValidationResult]
-                      ):
         for v in self.validators:
-            if v.match(node):
-                result = v.validate_wrapper(node)
+            if isinstance(v, ValidatorContainer):
+                v = v.prune(predicate)
+
+                if any(v.validators):
+                    validators.append(v)
+            elif predicate(v):
+                validators.append(v)
+
+        pruned = copy.copy(self)
+        pruned.validators = validators
+        pruned._validations = self._collect_validations(validators)
+        pruned._dispatch_index = None
+        pruned._threshold_dispatch_indexes = {}
+
+        return pruned
 
-                if isinstance(result, list):
-                    results += result
+    @property
+    def dispatch_index(self) -> NodeVisitorIndex:
+        """The index used to select the validators that may match a given node. The index is built on first use."""
+        if self._dispatch_index is None:
+            self._dispatch_index = NodeVisitorIndex(self.validators)
+
+        return self._dispatch_index
+
+    def get_dispatch_index(self, severity_threshold: Optional[ValidationFindingSeverity] = None) -> NodeVisitorIndex:
+        """Returns the index used to select the validators that may match a given node. If a severity threshold is
+        specified, then validators that cannot report a finding at least as severe as the threshold are excluded."""
+        if severity_threshold is None:
+            return self.dispatch_index
+
+        index = self._threshold_dispatch_indexes.get(severity_threshold)
+        if index is None:
+            index = NodeVisitorIndex([v for v in self.validators if v.may_report(severity_threshold)])
+
+            self._threshold_dispatch_indexes[severity_threshold] = index
+
+        return index
+
+    def may_report(self, severity_threshold):
+        return any(v.may_report(severity_threshold) for v in self.validators)
+
+    def _validate_with_options(self, node, severity_threshold, fail_fast):
+        return self.validate(node, severity_threshold, fail_fast)
+
+    def iter_validate(self, node: PDUNode,
+                      severity_threshold: Optional[ValidationFindingSeverity] = None,
+                      fail_fast: Optional[FailFastCondition] = None,
+                      include_empty_results: bool = True) -> Iterator[ValidationResult]:
+        """Executes the contained validators on the specified node and its descendants, yielding each result as it is
+        produced.
+
+        Nodes are visited in depth-first order using an explicit stack, so deeply nested documents do not exhaust the
+        interpreter's recursion limit. If include_empty_results is False, then results that contain no findings are not
+        yielded. The severity threshold and fail-fast condition have the same effect as for :py:meth:`validate`.
+        """
+        dispatch_index = self.get_dispatch_index(severity_threshold)
+        profiler = profiling.get_active_profiler()
+
+        pending_nodes = [node]
+        while pending_nodes:
+            current_node = pending_nodes.pop()
+
+            for v in dispatch_index.get_candidates(current_node):
+                # time spent in nested containers is attributed to the validators that they contain
+                is_container = isinstance(v, ValidatorContainer)
+
+                if profiler is not None and not is_container:
+                    profiler.record_match(v, current_node)
+
+                if not v.match(current_node):
+                    continue
+
+                if is_container:
+                    try:
+                        yield from v.iter_validate(current_node, severity_threshold, fail_fast, include_empty_results)
+                    except Exception as e:
+                        yield v._create_unhandled_exception_result(current_node, e)
+
+                    if fail_fast is not None and fail_fast.triggered:
+                        return
                 else:
-                    results.append(result)
+                    if profiler is None:
+                        result = v.validate_wrapper(current_node, severity_threshold)
+                    else:
+                        start = time.perf_counter()
+                        result = v.validate_wrapper(current_node, severity_threshold)
+                        profiler.record_validation(v, current_node, time.perf_counter() - start)
+
+                    if include_empty_results or any(result.finding_descriptions):
+                        yield result
+
+                    if fail_fast is not None and fail_fast.evaluate(result):
+                        return
+
+            # children are pushed in reverse so that they are visited in document order
+            pending_nodes.extend(reversed(current_node.children.values()))
+
+    def validate(self, node: PDUNode,
+                 severity_threshold: Optional[ValidationFindingSeverity] = None,
+                 fail_fast: Optional[FailFastCondition] = None) -> List[ValidationResult]:
+        """Executes the contained validators on the specified node and its descendants.
 
-        for child_node in node.children.values():
-            self._validate_rec(child_node, results)
+        If a severity threshold is specified, then validators that cannot report a finding at least as severe as the
+        threshold are not executed, and findings with a lesser severity are not included in the results. As skipped
+        validators are not executed, any unhandled exceptions that they would have raised are not reported.
 
-    def validate(self, node: PDUNode) -> List[ValidationResult]:
-        results = []
+        If a fail-fast condition is specified, then traversal stops as soon as a result with a blocking finding is
+        produced. In that case, the condition is marked as triggered and the returned results are truncated.
+        """
+        return list(self.iter_validate(node, severity_threshold, fail_fast))
 
-        self._validate_rec(node, results)
 
-        return results
+def create_finding_code_index(validator: Validator) -> Dict[str, List[Validator]]:
+    """Creates a reverse index that maps each finding code to the validators that may report it.
+
+    Validator containers are traversed recursively, so only the validators that they contain are indexed.
+    """
+    index = {}
+
+    def _add(v: Validator):
+        if isinstance(v, ValidatorContainer):
+            for child in v.validators:
+                _add(child)
+        else:
+            for finding in v.validations:
+                if finding is not Validator.VALIDATION_FINDING_UNHANDLED_EXCEPTION:
+                    validators = index.setdefault(finding.code, [])
+
+                    if not any(i is v for i in validators):
+                        validators.append(v)
+
+    _add(validator)
+
+    return index
+
+
+def create_finding_code_selector(validator: Validator, code_patterns: Iterable[str]) -> Callable[[Validator], bool]:
+    """Creates a predicate for :py:meth:`ValidatorContainer.prune` that retains the validators which may report a
+    finding whose code matches any of the specified shell-style patterns (such as "cabf.serverauth.*").
+
+    Decoding validators, as well as validators that do not declare their findings, are also retained, as the selected
+    validators may depend on the values that they decode. A ValueError is raised if no finding code matches.
+    """
+    code_patterns = list(code_patterns)
+    index = create_finding_code_index(validator)
+
+    selected_codes = [c for c in index.keys() if any(fnmatch.fnmatchcase(c, p) for p in code_patterns)]
+    if not any(selected_codes):
+        raise ValueError(f'No findings are reported with codes that match: {", ".join(code_patterns)}')
+
+    selected_validator_ids = {id(v) for c in selected_codes for v in index[c]}
+
+    def _is_retained(v: Validator):
+        return (
+            id(v) in selected_validator_ids or
+            DECODING_TAG in v.tags or
+            not any(f for f in v.validations if f is not Validator.VALIDATION_FINDING_UNHANDLED_EXCEPTION)
+        )
+
+    return _is_retained
+
+
+def select_validators_by_finding_code(validator_container: ValidatorContainer,
+                                      code_patterns: Iterable[str]) -> ValidatorContainer:
+    """Returns a copy of the container that includes only the validators that may report a finding whose code matches
+    any of the specified shell-style patterns, along with the decoding validators that they may depend upon."""
+    return validator_container.prune(create_finding_code_selector(validator_container, code_patterns))
 
 
 class ScalarFieldValueEqualityValidator(Validator):
@@ -204,7 +460,7 @@ class ScalarFieldValueEqualityValidator(Validator):
 
             raise ValidationFindingEncountered(
                 validation,
-                f'Expected="{self.value}", actual="{node.pdu}"'
+                lambda: f'Expected="{self.value}", actual="{node.pdu}"'
             )
 
 
@@ -234,8 +490,7 @@ class ASN1ConstraintValidator(Validator):
 
             raise ValidationFindingEncountered(
                 validation,
-                f'ASN.1 constraint failed: {self._get_message(e)} '
-                f'on content "{node.pdu}"'
+                lambda exc=e: f'ASN.1 constraint failed: {self._get_message(exc)} on content "{node.pdu}"'
             )
 
 
@@ -250,6 +505,10 @@ class DecodingValidator(Validator):
 
         super().__init__(validations=[self.VALIDATION_ASN1_DECODING_FAILURE], **kwargs)
 
+    @property
+    def tags(self):
+        return super().tags + [DECODING_TAG]
+
     def validate(self, node):
         try:
             self.decode_func(node)
@@ -268,13 +527,16 @@ class TypeMatchingValidator(Validator):
         self.type_oid = type_oid
         self.value_path = value_path
 
+        self._type_path = compile_path(type_path)
+        self._value_path = compile_path(value_path)
+
         super().__init__(**kwargs)
 
     def match(self, node):
         if not super().match(node):
             return False
 
-        type_node = node.navigate(self.type_path)
+        type_node = node.navigate(self._type_path)
 
         return type_node.pdu == self.type_oid
 
@@ -282,7 +544,7 @@ class TypeMatchingValidator(Validator):
         pass
 
     def validate(self, node):
-        value_node = node.navigate(self.value_path)
+        value_node = node.navigate(self._value_path)
 
         return self.validate_with_value(node, value_node)
 
@@ -301,10 +563,10 @@ class DEREqualityValidator(Validator):
     def validate(self, node):
         other_node = self._other_node_retriever(node)
 
-        if encode(node.pdu) != encode(other_node.pdu):
+        if node.der != other_node.der:
             raise ValidationFindingEncountered(
                 self.validations[0],
-                f'DER encoding of {node.path} and {other_node.path} are '
+                lambda: f'DER encoding of {node.path} and {other_node.path} are '
                 f'not equal'
             )
 
@@ -1,12 +1,17 @@
 import csv
 import io
+import json
 import os
 import subprocess
 import tempfile
 
+import pytest
+
+from pkilint.bin import lint_batch
 from pkilint.cabf.serverauth import serverauth_constants
 from pkilint.cabf.smime import smime_constants
 from pkilint.etsi import etsi_constants
+from tests import test_loader
 
 
 def _test_program_validations(name, args=None):
@@ -498,3 +503,104 @@ eo163oRkEIV75k1Onw==
 def test_lint_etsi_cert_validations():
     for cert_type in etsi_constants.CertificateType:
         _test_program_validations('lint_etsi_cert', ['-t', cert_type.to_option_str])
+
+
+def test_lint_ocsp_response_timing_profile():
+    profile_f = tempfile.NamedTemporaryFile('w+', delete=False)
+    profile_f.close()
+
+    ret = subprocess.run(
+        ['lint_ocsp_response', 'lint', '--timing-profile', profile_f.name, '-'],
+        input=test_loader._OCSP_RESPONSE_B64.encode()
+    )
+
+    assert ret.returncode == 0
+
+    with open(profile_f.name, 'r') as f:
+        profile = json.load(f)
+
+    assert any(profile['validators'])
+
+    os.unlink(profile_f.name)
+
+
+def test_lint_batch():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for i in range(4):
+            path = os.path.join(temp_dir, f'{i}.pem')
+
+            with open(path, 'w') as f:
+                f.write(test_loader._CERT_B64)
+
+            paths.append(path)
+
+        bad_path = os.path.join(temp_dir, 'bad.pem')
+        with open(bad_path, 'w') as f:
+            f.write('not a certificate')
+
+        ret = subprocess.run(
+            ['lint_batch', 'pkix-cert', '-j', '2', '--chunk-size', '1', temp_dir],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+        lines = [json.loads(l) for l in ret.stdout.decode().splitlines()]
+
+        assert [l['document'] for l in lines] == paths + [bad_path]
+        assert all(l['linter'] == 'PKIX' and any(l['results']) for l in lines[:-1])
+        assert 'error' in lines[-1]
+        assert 'Linted 5 document(s)' in ret.stderr.decode()
+        assert ret.returncode > 0
+
+
+def test_lint_batch_timing_profile():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for i in range(2):
+            with open(os.path.join(temp_dir, f'{i}.pem'), 'w') as f:
+                f.write(test_loader._CERT_B64)
+
+        profile_path = os.path.join(temp_dir, 'profile.json')
+
+        ret = subprocess.run(
+            ['lint_batch', 'pkix-cert', '-j', '2', '--timing-profile', profile_path, os.path.join(temp_dir, '*.pem')],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+        assert len(ret.stdout.decode().splitlines()) == 2
+
+        with open(profile_path, 'r') as f:
+            profile = json.load(f)
+
+    assert all(v['validate_count'] % 2 == 0 for v in profile['validators'])
+    assert any(profile['validators'])
+
+
+class _FailingBatchLinter(lint_batch.PkixCertificateBatchLinter):
+    def determine_linter_name(self, doc):
+        raise KeyError('unexpected')
+
+
+def test_lint_batch_unexpected_error():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for i in range(2):
+            path = os.path.join(temp_dir, f'{i}.pem')
+
+            with open(path, 'w') as f:
+                f.write(test_loader._CERT_B64)
+
+            paths.append(path)
+
+        outcomes = list(lint_batch.lint_paths(_FailingBatchLinter, paths, 1, True, 1, None, False, None))
+
+    assert [json.loads(o.output_line) for o in outcomes] == [
+        {'document': p, 'error': "KeyError: 'unexpected'"} for p in paths
+    ]
+    assert all(o.failed for o in outcomes)
+
+
+def test_lint_batch_negative_decode_cache_size():
+    with pytest.raises(SystemExit) as e:
+        lint_batch.main(['pkix-cert', '--decode-cache-size', '-1', 'foo.pem'])
+
+    assert e.value.code == 2
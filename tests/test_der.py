@@ -0,0 +1,118 @@
+import pytest
+from pyasn1.codec.der.decoder import decode
+from pyasn1.codec.der.encoder import encode
+from pyasn1_alt_modules import rfc5280
+
+from pkilint import der, loader
+from tests import test_loader
+
+
+def test_der_certificate():
+    cert = loader.load_b64_certificate(test_loader._CERT_B64, 'test')
+
+    assert der.find_violation(cert.substrate, cert.root.pdu) is None
+
+
+@pytest.mark.parametrize('substrate,offset,reason', [
+    ('308002010a0000', 1, 'Indefinite length encoding'),
+    ('30810302010a', 1, 'Length is not minimally encoded'),
+    ('3082000302010a', 1, 'Length is not minimally encoded'),
+    ('3003020201', 3, 'Length exceeds the available octets'),
+    ('010101', 0, 'BOOLEAN TRUE value is not encoded as 0xFF'),
+    ('01020000', 0, 'BOOLEAN value is not one octet'),
+    ('020200ff', None, None),
+    ('0202007f', 0, 'Integer value is not minimally encoded'),
+    ('030207ff', 3, 'BIT STRING unused bits are not zero'),
+    ('030208ff', 2, 'BIT STRING unused bits count exceeds 7'),
+    ('030101', 2, 'Empty BIT STRING has a non-zero unused bits count'),
+    ('2304040200ff', 0, 'Constructed encoding of a primitive type'),
+    ('0603808101', 2, 'OBJECT IDENTIFIER arc is not minimally encoded'),
+    ('3106020102020101', 5, 'SET components are not in ascending order'),
+    ('3106020101020102', None, None),
+    ('170d3233303130313030303030305a', None, None),
+    ('170d3233303130313030303030302b', 0, 'UTCTime value is not expressed in UTC'),
+])
+def test_schema_independent_violations(substrate, offset, reason):
+    violation = der.find_violation(bytes.fromhex(substrate))
+
+    if reason is None:
+        assert violation is None
+    else:
+        assert violation == (offset, reason)
+
+
+def test_default_value_encoded():
+    substrate = bytes.fromhex('3003010100')
+
+    decoded, _ = decode(substrate, asn1Spec=rfc5280.BasicConstraints())
+
+    assert der.find_violation(substrate) is None
+    assert der.find_violation(substrate, decoded) == (
+        0, '"BasicConstraints" encodes a DEFAULT value or an empty OPTIONAL value'
+    )
+
+
+def test_empty_optional_value_encoded():
+    substrate = bytes.fromhex('30083006060255043000')
+
+    decoded, _ = decode(substrate, asn1Spec=rfc5280.CertificatePolicies())
+
+    assert der.find_violation(substrate, decoded).offset == 2
+
+
+@pytest.mark.parametrize('asn1_spec,substrate,offset,reason', [
+    # AuthorityKeyIdentifier with an implicitly tagged authorityCertSerialNumber that is not minimally encoded
+    (rfc5280.AuthorityKeyIdentifier(), '3004 82020001', 2, 'Integer value is not minimally encoded'),
+    # IssuingDistributionPoint with an implicitly tagged onlyContainsUserCerts that is not encoded as 0xFF
+    (rfc5280.IssuingDistributionPoint(), '3003 810101', 2, 'BOOLEAN TRUE value is not encoded as 0xFF'),
+    # DistributionPoint with an implicitly tagged reasons that has non-zero unused bits
+    (rfc5280.CRLDistributionPoints(), '30063004 810207ff', 7, 'BIT STRING unused bits are not zero'),
+    # DistributionPoint with an explicitly tagged distributionPoint that is encoded in primitive form
+    (rfc5280.CRLDistributionPoints(), '30093007 8005 a003 860161', 4,
+     'Explicit tag is not encoded in constructed form'),
+    # otherName with an explicitly tagged ANY value that is encoded in primitive form
+    (rfc5280.GeneralNames(), '300c a00a 06032a0304 8003 0c0161', 9, 'Explicit tag is not encoded in constructed form'),
+    # DistributionPoint with an implicitly tagged nameRelativeToCRLIssuer whose components are not in order
+    (rfc5280.CRLDistributionPoints(), '301a3018a016a114 3008060355040a0c0161 300806035504030c0161', 18,
+     'SET components are not in ascending order'),
+    (rfc5280.CRLDistributionPoints(), '301a3018a016a114 300806035504030c0161 3008060355040a0c0161', None, None),
+    # empty SIZE (1..MAX) value
+    (rfc5280.CertificatePolicies(), '3000', 0, '"CertificatePolicies" value does not satisfy its constraints'),
+    (rfc5280.CRLNumber(), '0201010000', 3, 'Octets follow the encoding of the value'),
+    # the content of ANY values is checked when it is decoded with its own schema
+    (rfc5280.Name(), '300b3109 30070603550403 2100', None, None),
+    # fractional times are compared with their encoding
+    (rfc5280.Time(), '1811 32303233303130313030303030302e31 5a', None, None),
+    (rfc5280.Time(), '1812 32303233303130313030303030302e3130 5a', 1,
+     'Substrate differs from the DER encoding of the decoded value'),
+])
+def test_schema_dependent_violations(asn1_spec, substrate, offset, reason):
+    substrate = bytes.fromhex(substrate.replace(' ', ''))
+
+    decoded, _ = decode(substrate, asn1Spec=asn1_spec)
+
+    try:
+        is_der = encode(decoded) == substrate
+    except Exception:
+        is_der = False
+
+    violation = der.find_violation(substrate, decoded)
+
+    # the checker agrees with comparing the substrate with the DER encoding of the decoded value
+    assert (violation is None) == is_der
+
+    if reason is None:
+        assert violation is None
+    else:
+        assert violation == (offset, reason)
+
+
+def test_iter_top_level_spans():
+    assert list(der.iter_top_level_spans(b'\x30\x00\x04\x02ab\x05\x00')) == [
+        der.ByteSpan(0, 2), der.ByteSpan(2, 4), der.ByteSpan(6, 2)
+    ]
+
+
+def test_iter_top_level_spans_truncated():
+    with pytest.raises(ValueError):
+        list(der.iter_top_level_spans(b'\x30\x00\x04\x02a'))
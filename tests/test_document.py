@@ -0,0 +1,240 @@
+import glob
+import re
+from os import path
+
+import pytest
+from pyasn1.codec.der.encoder import encode
+from pyasn1.type import tag, univ
+from pyasn1_alt_modules import rfc5280
+
+from pkilint import document, loader
+from pkilint.pkix import certificate, extension, name
+from tests import integration_certificate, test_loader
+
+
+def _load_certificate():
+    return loader.load_b64_certificate(test_loader._CERT_B64, 'test')
+
+
+def test_children_materialized_on_access():
+    cert = _load_certificate()
+
+    assert not cert.root.is_materialized
+
+    tbs_cert = cert.root.children['tbsCertificate']
+
+    assert cert.root.is_materialized
+    assert not tbs_cert.is_materialized
+    assert list(cert.root.children.keys()) == ['tbsCertificate', 'signatureAlgorithm', 'signature']
+
+
+def test_navigate_materializes_only_traversed_nodes():
+    cert = _load_certificate()
+
+    node = cert.root.navigate('tbsCertificate.subjectPublicKeyInfo.subjectPublicKey')
+
+    assert node.path == 'certificate.tbsCertificate.subjectPublicKeyInfo.subjectPublicKey'
+    assert not cert.root.children['signatureAlgorithm'].is_materialized
+    assert not cert.root.navigate('tbsCertificate.extensions').is_materialized
+
+
+def test_decoded_child_appended_to_unmaterialized_node():
+    cert = _load_certificate()
+
+    ext_value = cert.root.navigate('tbsCertificate.extensions.0.extnValue')
+
+    decoded = document.decode_substrate(cert, ext_value.pdu.asOctets(), rfc5280.BasicConstraints(), ext_value)
+
+    assert ext_value.children == {'basicConstraints': decoded}
+    assert decoded.parent is ext_value
+
+
+def test_path_computed_on_demand():
+    cert = _load_certificate()
+
+    node = cert.root.navigate('tbsCertificate.validity.notBefore')
+
+    assert node._path is None
+    assert node.parent._path is None
+
+    assert node.path == 'certificate.tbsCertificate.validity.notBefore'
+    assert node.parent.path == 'certificate.tbsCertificate.validity'
+
+
+def test_node_names_are_interned():
+    cert_1 = _load_certificate()
+    cert_2 = _load_certificate()
+
+    ext_1 = cert_1.root.navigate('tbsCertificate.extensions.0')
+    ext_2 = cert_2.root.navigate('tbsCertificate.extensions.0')
+
+    assert ext_1.name is ext_2.name
+    assert not hasattr(ext_1, '__dict__')
+
+
+def test_compile_path():
+    compiled = document.compile_path('subject:certificate.tbsCertificate')
+
+    assert compiled.doc_name == 'subject'
+    assert compiled.node_path_parts == ('certificate', 'tbsCertificate')
+    assert document.compile_path('subject:certificate.tbsCertificate') is compiled
+
+    assert document.compile_path('^.^') == ('^.^', None, ('^', '^'))
+    assert document.compile_path(':') == (':', '', ())
+
+
+def test_compile_invalid_path():
+    with pytest.raises(ValueError):
+        document.compile_path('tbsCertificate..subject')
+
+
+def test_navigate_compiled_path():
+    cert = _load_certificate()
+
+    compiled = document.compile_path('tbsCertificate.subjectPublicKeyInfo.subjectPublicKey')
+
+    assert cert.root.navigate(compiled) is cert.root.navigate(compiled.path)
+
+    spki = cert.root.navigate(compiled).parent
+
+    assert spki.navigate(document.compile_path(':certificate.tbsCertificate')) is cert.root.children['tbsCertificate']
+    assert spki.navigate(document.compile_path(':')) is cert
+
+    with pytest.raises(document.PDUNavigationFailedError) as e:
+        spki.navigate(document.compile_path('^.issuerUniqueID'))
+
+    assert e.value.requested_path == '^.issuerUniqueID'
+
+
+def test_node_visitor_index_preserves_order():
+    cert = _load_certificate()
+
+    visitors = [
+        document.NodeVisitor(predicate=lambda n: True),
+        document.NodeVisitor(pdu_class=rfc5280.Extension),
+        document.NodeVisitor(path='certificate.tbsCertificate.extensions.0'),
+        document.NodeVisitor(pdu_class=rfc5280.Name),
+        document.NodeVisitor(path='certificate.tbsCertificate.extensions.1'),
+        document.NodeVisitor(path_re=re.compile(r'.+\.extensions\.\d+$')),
+    ]
+
+    index = document.NodeVisitorIndex(visitors)
+
+    ext_node = cert.root.navigate('tbsCertificate.extensions.0')
+
+    candidates = list(index.get_candidates(ext_node))
+
+    assert candidates == [visitors[0], visitors[1], visitors[2], visitors[5]]
+    assert [v for v in candidates if v.match(ext_node)] == [v for v in visitors if v.match(ext_node)]
+
+    assert list(index.get_candidates(cert.root)) == [visitors[0], visitors[5]]
+
+
+def test_decode_cache_shares_values_across_documents():
+    cache = document.enable_decode_cache(64)
+
+    try:
+        cert_1 = _load_certificate()
+        cert_2 = _load_certificate()
+
+        ext_value_1 = cert_1.root.navigate('tbsCertificate.extensions.0.extnValue')
+        ext_value_2 = cert_2.root.navigate('tbsCertificate.extensions.0.extnValue')
+
+        decoded_1 = document.decode_substrate(cert_1, ext_value_1.pdu, rfc5280.BasicConstraints(), ext_value_1)
+
+        hits_before = cache.cache_info().hits
+
+        decoded_2 = document.decode_substrate(cert_2, ext_value_2.pdu, rfc5280.BasicConstraints(), ext_value_2)
+
+        assert cache.cache_info().hits == hits_before + 1
+        assert decoded_1 is not decoded_2
+        assert decoded_1.pdu is decoded_2.pdu
+        assert decoded_2.document is cert_2
+        assert decoded_2.path == 'certificate.tbsCertificate.extensions.0.extnValue.basicConstraints'
+    finally:
+        document.disable_decode_cache()
+
+
+def test_decode_cache_evicts_least_recently_used():
+    cache = document.DecodeCache(2)
+
+    cache.put('a', None, 'a')
+    cache.put('b', None, 'b')
+    cache.get('a')
+    cache.put('c', None, 'c')
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.cache_info() == (2, 1, 2, 2)
+
+
+def test_node_span_covers_substrate_bytes():
+    cert = _load_certificate()
+
+    issuer = cert.root.navigate('tbsCertificate.issuer')
+
+    assert issuer.span is not None
+    assert bytes(issuer.der) == cert.substrate[issuer.span.offset:issuer.span.end]
+    assert bytes(issuer.der) == encode(issuer.pdu)
+
+
+def test_decoded_node_span_is_relative_to_nested_substrate():
+    cert = _load_certificate()
+
+    ext_value = cert.root.navigate('tbsCertificate.extensions.0.extnValue')
+    decoded = document.decode_substrate(cert, ext_value.pdu.asOctets(), rfc5280.BasicConstraints(), ext_value)
+
+    assert decoded.substrate == ext_value.pdu.asOctets()
+    assert decoded.span == (0, len(decoded.substrate))
+    assert bytes(decoded.der) == encode(decoded.pdu)
+
+
+def test_node_without_substrate_falls_back_to_encoding():
+    node = document.PDUNode(None, 'rdnSequence', rfc5280.RDNSequence(), None)
+
+    assert node.span is None
+    assert bytes(node.der) == encode(node.pdu)
+
+
+def _iter_nodes(node):
+    yield node
+
+    for child in node.children.values():
+        yield from _iter_nodes(child)
+
+
+def test_node_der_matches_encoding():
+    kinds = set()
+
+    for test_file_path in glob.glob(path.join(path.dirname(__file__), 'integration_certificate', 'pkix', '*.crttest')):
+        cert, _ = integration_certificate.certificate_test_file(test_file_path)
+
+        validator = certificate.create_pkix_certificate_validator_container(
+            certificate.create_decoding_validators(name.ATTRIBUTE_TYPE_MAPPINGS, extension.EXTENSION_MAPPINGS), []
+        )
+        validator.validate(cert.root)
+
+        for node in _iter_nodes(cert.root):
+            parent = node.parent
+            tag_set = node.pdu.tagSet
+
+            if parent is None:
+                continue
+            elif node.substrate is not parent.substrate:
+                kinds.add('nested document')
+            elif isinstance(parent.pdu, univ.Choice):
+                kinds.add('CHOICE alternative')
+            elif isinstance(parent.pdu, univ.SequenceOfAndSetOfBase):
+                kinds.add('SEQUENCE OF element')
+
+            if tag_set and tag_set.superTags[-1].tagClass == tag.tagClassContext:
+                if tag_set.superTags[-1].tagFormat == tag.tagFormatConstructed and len(tag_set.superTags) > 1:
+                    kinds.add('explicitly tagged')
+                elif tag_set.superTags[-1].tagFormat == tag.tagFormatSimple:
+                    kinds.add('implicitly tagged')
+
+            assert bytes(node.der) == encode(node.pdu), node.path
+
+    assert kinds == {
+        'nested document', 'CHOICE alternative', 'SEQUENCE OF element', 'explicitly tagged', 'implicitly tagged',
+    }
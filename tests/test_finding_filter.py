@@ -0,0 +1,74 @@
+from pkilint import finding_filter, validation, loader
+from tests import test_loader
+
+_WARNING_FINDING = validation.ValidationFinding(validation.ValidationFindingSeverity.WARNING, 'test.warning')
+_ERROR_FINDING = validation.ValidationFinding(validation.ValidationFindingSeverity.ERROR, 'test.error')
+
+
+class ErrorFindingFilter(finding_filter.FindingDescriptionFilter):
+    def __init__(self):
+        super().__init__()
+
+        self.call_count = 0
+
+    def filter(self, result, finding_description):
+        self.call_count += 1
+
+        return finding_description.finding != _ERROR_FINDING
+
+
+def _create_result(*findings):
+    cert = loader.load_b64_certificate(test_loader._CERT_B64, 'test')
+
+    return validation.ValidationResult(
+        validation.Validator(), cert.root,
+        [validation.ValidationFindingDescription(f, None) for f in findings]
+    )
+
+
+def test_validation_finding_filters_are_indexed():
+    warning_filter = finding_filter.ValidationFindingFilter(_WARNING_FINDING)
+    error_filter = ErrorFindingFilter()
+
+    filter_index = finding_filter.FindingDescriptionFilterIndex([warning_filter, error_filter])
+
+    result = _create_result(_WARNING_FINDING, _ERROR_FINDING)
+    warning_description, error_description = result.finding_descriptions
+
+    assert filter_index.find_excluding_filter(result, warning_description) is warning_filter
+    assert error_filter.call_count == 0
+
+    assert filter_index.find_excluding_filter(result, error_description) is error_filter
+    assert error_filter.call_count == 1
+
+
+def test_first_excluding_filter_is_returned():
+    error_filter = ErrorFindingFilter()
+    validation_finding_filter = finding_filter.ValidationFindingFilter(_ERROR_FINDING)
+
+    result = _create_result(_ERROR_FINDING)
+
+    filter_index = finding_filter.FindingDescriptionFilterIndex([error_filter, validation_finding_filter])
+    assert filter_index.find_excluding_filter(result, result.finding_descriptions[0]) is error_filter
+
+    filter_index = finding_filter.FindingDescriptionFilterIndex([validation_finding_filter, error_filter])
+    assert filter_index.find_excluding_filter(result, result.finding_descriptions[0]) is validation_finding_filter
+    assert error_filter.call_count == 1
+
+
+def test_filter_results():
+    warning_filter = finding_filter.ValidationFindingFilter(_WARNING_FINDING)
+    unfiltered_result = _create_result(_ERROR_FINDING)
+    filtered_result = _create_result(_ERROR_FINDING, _WARNING_FINDING, _ERROR_FINDING)
+
+    results, results_with_exclusions = finding_filter.filter_results(
+        [warning_filter], [unfiltered_result, filtered_result]
+    )
+
+    assert results[0] is unfiltered_result
+    assert [fd.finding for fd in results[1].finding_descriptions] == [_ERROR_FINDING, _ERROR_FINDING]
+
+    assert len(results_with_exclusions) == 1
+    assert results_with_exclusions[0].filter_and_finding_descriptions == [
+        (warning_filter, filtered_result.finding_descriptions[1])
+    ]
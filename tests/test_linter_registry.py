@@ -0,0 +1,93 @@
+import datetime
+
+import pytest
+
+from pkilint import linter_registry, loader, document
+from pkilint.pkix.certificate import certificate_validity
+from tests import test_loader
+
+
+def test_linters_built_lazily_and_memoized():
+    registry = linter_registry.LinterRegistry()
+
+    assert registry.built_keys == []
+
+    linter = registry.get_linter('cabf-serverauth', 'dv-final-certificate')
+
+    assert linter.key.linter_name == 'DV-FINAL-CERTIFICATE'
+    assert registry.built_keys == [linter.key]
+    assert registry.get_linter('CABF-SERVERAUTH', 'DV-FINAL-CERTIFICATE') is linter
+    assert registry.get_linter(
+        'cabf-serverauth', 'DV-FINAL-CERTIFICATE', certificate_validity.CertificateValidityPeriodStartRetriever()
+    ) is linter
+
+
+def test_validity_period_start_strategy_in_key():
+    registry = linter_registry.LinterRegistry()
+
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+
+    static_linter = registry.get_linter(
+        'cabf-serverauth', 'DV-FINAL-CERTIFICATE', document.StaticValidityPeriodStartRetriever(now)
+    )
+
+    assert static_linter is not registry.get_linter('cabf-serverauth', 'DV-FINAL-CERTIFICATE')
+    assert static_linter is registry.get_linter(
+        'cabf-serverauth', 'DV-FINAL-CERTIFICATE', document.StaticValidityPeriodStartRetriever(now)
+    )
+
+    # the S/MIME profile does not use the validity period start, so the strategy is not part of the key
+    assert registry.get_linter(
+        'cabf-smime', 'MAILBOX-LEGACY', document.StaticValidityPeriodStartRetriever(now)
+    ) is registry.get_linter('cabf-smime', 'MAILBOX-LEGACY')
+
+
+class _OffsetValidityPeriodStartRetriever(document.ValidityPeriodStartRetriever):
+    def __init__(self, offset: datetime.timedelta):
+        self._offset = offset
+
+    def __call__(self, certificate, *args, **kwargs):
+        return certificate.not_before + self._offset
+
+
+def test_stateful_validity_period_start_retrievers_in_key():
+    registry = linter_registry.LinterRegistry()
+
+    day_linter = registry.get_linter(
+        'cabf-serverauth', 'DV-FINAL-CERTIFICATE', _OffsetValidityPeriodStartRetriever(datetime.timedelta(days=1))
+    )
+
+    assert day_linter is registry.get_linter(
+        'cabf-serverauth', 'DV-FINAL-CERTIFICATE', _OffsetValidityPeriodStartRetriever(datetime.timedelta(days=1))
+    )
+    assert day_linter is not registry.get_linter(
+        'cabf-serverauth', 'DV-FINAL-CERTIFICATE', _OffsetValidityPeriodStartRetriever(datetime.timedelta(days=2))
+    )
+
+
+def test_shared_validators_across_linters():
+    registry = linter_registry.LinterRegistry()
+
+    dv = registry.get_linter('cabf-serverauth', 'DV-FINAL-CERTIFICATE')
+    ov = registry.get_linter('cabf-serverauth', 'OV-FINAL-CERTIFICATE')
+
+    assert dv.validator is not ov.validator
+    assert dv.validator.validators[0].validators is ov.validator.validators[0].validators
+
+
+def test_unknown_linter():
+    registry = linter_registry.LinterRegistry()
+
+    with pytest.raises(ValueError):
+        registry.get_linter('cabf-serverauth', 'FOO')
+
+    with pytest.raises(ValueError):
+        registry.get_linter('foo', 'PKIX')
+
+
+def test_prebuilt_linter_validate():
+    cert = loader.load_b64_certificate(test_loader._CERT_B64, 'test')
+
+    results = linter_registry.get_linter('pkix-cert', 'PKIX').validate(cert)
+
+    assert any(r.finding_descriptions for r in results)
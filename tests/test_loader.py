@@ -4,6 +4,7 @@ import tempfile
 import pytest
 
 from pkilint import loader, document
+from pkilint.pkix.certificate import RFC5280Certificate
 
 _CERT_B64 = '''MIIGrzCCBJegAwIBAgIUYsQ+Fan+RfQ1ToEaA+PeZh43OTEwDQYJKoZIhvcNAQEL
 BQAwSDELMAkGA1UEBhMCVVMxHzAdBgNVBAoMFkZvbyBJbmR1c3RyaWVzIExpbWl0
@@ -277,3 +278,46 @@ def test_ocsp_response_loader():
 def test_load_cert_with_trailer():
     with pytest.raises(document.SubstrateDecodingFailedError):
         loader.load_der_certificate(base64.b64decode(_CERT_WITH_TRAILER_B64), 'test', 'test')
+
+
+def test_iter_pem_bundle_with_surrounding_text():
+    first_pem = _make_pem(_CERT_B64, 'CERTIFICATE')
+    second_pem = _make_pem(_CRL_B64, 'X509 CRL')
+    third_pem = _make_pem(_CERT_B64, 'CERTIFICATE')
+
+    log_text = f'2024-04-02 issued:\n{first_pem}\nskipped:\n{second_pem}\nreissued: {third_pem}\n'.encode()
+
+    loaded = list(loader.iter_certificates(log_text, 'test', 'test'))
+
+    assert [l.offset for l in loaded] == [log_text.index(b'-----BEGIN CERTIFICATE'), log_text.rindex(b'-----BEGIN')]
+    assert all(l.document.substrate == base64.b64decode(_CERT_B64) for l in loaded)
+
+
+def test_iter_concatenated_der_file():
+    cert_der = base64.b64decode(_CERT_B64)
+
+    with tempfile.NamedTemporaryFile('w+b') as f:
+        f.write(cert_der + cert_der)
+        f.flush()
+
+        loaded = list(loader.iter_certificates_in_file(f.name))
+
+    assert [l.offset for l in loaded] == [0, len(cert_der)]
+    assert all(isinstance(l.document, RFC5280Certificate) for l in loaded)
+    assert loaded[0].document.substrate_source == f.name
+
+
+def test_iter_truncated_der():
+    cert_der = base64.b64decode(_CERT_B64)
+
+    substrates = loader.DocumentLoader.iter_der_substrates(cert_der + cert_der[:-1])
+
+    assert next(substrates) == loader.DocumentSubstrate(0, cert_der)
+
+    with pytest.raises(ValueError):
+        next(substrates)
+
+
+def test_iter_empty_file():
+    with tempfile.NamedTemporaryFile('w+b') as f:
+        assert not any(loader.iter_certificates_in_file(f.name))
@@ -0,0 +1,77 @@
+import io
+import json
+
+from pkilint import profiling, validation, loader
+from pkilint.pkix import certificate, name, extension
+from tests import test_loader
+
+
+class FailingValidator(validation.Validator):
+    def __init__(self):
+        super().__init__(path='certificate.tbsCertificate.serialNumber')
+
+    def validate(self, node):
+        raise ValueError('Failure')
+
+
+def _create_validator():
+    return certificate.create_pkix_certificate_validator_container(
+        certificate.create_decoding_validators(name.ATTRIBUTE_TYPE_MAPPINGS, extension.EXTENSION_MAPPINGS),
+        [
+            certificate.create_extensions_validator_container(),
+            FailingValidator(),
+        ]
+    )
+
+
+def _lint(validator):
+    cert = loader.load_b64_certificate(test_loader._CERT_B64, 'test')
+
+    return validator.validate(cert.root)
+
+
+def test_profiler_inactive_by_default():
+    assert profiling.get_active_profiler() is None
+
+
+def test_profiler_collects_statistics():
+    validator = _create_validator()
+
+    with profiling.ValidationProfiler() as profiler:
+        assert profiling.get_active_profiler() is profiler
+
+        results = _lint(validator)
+
+    assert profiling.get_active_profiler() is None
+
+    # profiling does not affect results
+    assert len(results) == len(_lint(validator))
+
+    entries = {e.validator: e.statistics for e in profiler.get_entries()}
+
+    assert 'ValidatorContainer' not in entries
+
+    failing_stats = entries['FailingValidator']
+    assert failing_stats.validate_count == 1
+    assert failing_stats.exception_count == 1
+
+    ski_stats = entries['SubjectKeyIdentifierValidator']
+    assert ski_stats.validate_count == 1
+    assert ski_stats.match_count >= 1
+    assert ski_stats.max_time <= ski_stats.total_time
+
+    node_entries = [e for e in profiler.get_entries(by_node_path=True) if e.validator == 'FailingValidator']
+    assert [e.node_path for e in node_entries] == ['certificate.tbsCertificate.serialNumber']
+
+
+def test_profiler_json_dump():
+    with profiling.ValidationProfiler() as profiler:
+        _lint(_create_validator())
+
+    s = io.StringIO()
+    profiler.dump_json(s)
+
+    report = json.loads(s.getvalue())
+
+    assert set(report.keys()) == {'validators', 'nodes'}
+    assert any(v['validator'] == 'FailingValidator' and v['exception_count'] == 1 for v in report['validators'])
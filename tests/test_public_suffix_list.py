@@ -0,0 +1,46 @@
+import tempfile
+
+from pkilint.common import public_suffix_list
+
+
+def test_lookup_cached():
+    service = public_suffix_list.PublicSuffixListService(cache_size=8)
+
+    assert service.publicsuffix('www.Example.COM') == 'com'
+    assert service.publicsuffix('www.example.com') == 'com'
+    assert service.publicsuffix('foo.internal') is None
+
+    cache_info = service.cache_info()
+
+    assert cache_info.hits == 1
+    assert cache_info.misses == 2
+
+
+def test_pinned_snapshot():
+    with tempfile.NamedTemporaryFile('w', suffix='.dat') as f:
+        f.write('// pinned snapshot\ninternal\n')
+        f.flush()
+
+        service = public_suffix_list.PublicSuffixListService(f.name)
+
+    assert service.publicsuffix('foo.internal') == 'internal'
+    assert service.publicsuffix('www.example.com') is None
+
+
+def test_process_wide_service(monkeypatch):
+    previous = public_suffix_list.get_public_suffix_list()
+
+    try:
+        with tempfile.NamedTemporaryFile('w', suffix='.dat') as f:
+            f.write('internal\n')
+            f.flush()
+
+            monkeypatch.setenv(public_suffix_list.PUBLIC_SUFFIX_LIST_FILE_ENV_VAR, f.name)
+            public_suffix_list.set_public_suffix_list(None)
+
+            service = public_suffix_list.get_public_suffix_list()
+
+        assert service.snapshot_path == f.name
+        assert public_suffix_list.get_public_suffix_list() is service
+    finally:
+        public_suffix_list.set_public_suffix_list(previous)
@@ -1,3 +1,6 @@
+import io
+import json
+
 from pkilint import document, validation, report
 
 
@@ -81,3 +84,91 @@ def test_json_warning():
 
     assert gen.generate() == '{"results": [{"node_path": "bar", "validator": "DummyValidator2", "finding_descriptions": [{"severity": "ERROR", "code": "error_finding", "message": "The error message"}]}]}'
 
+
+
+def test_json_writer_matches_generator():
+    output = io.StringIO()
+
+    findings_count = report.ReportWriterJson(_RESULTS, validation.ValidationFindingSeverity.INFO, output).write()
+
+    assert findings_count == 2
+    assert output.getvalue() == report.ReportGeneratorJson(_RESULTS, validation.ValidationFindingSeverity.INFO).generate() + '\n'
+
+
+def test_ndjson_writer():
+    output = io.StringIO()
+
+    findings_count = report.ReportWriterNdjson(iter(_RESULTS), None, output).write()
+
+    assert findings_count == 2
+    assert [json.loads(l)['node_path'] for l in output.getvalue().splitlines()] == ['foo', 'bar']
+
+
+def test_csv_writer_binary_output():
+    output = io.BytesIO()
+
+    findings_count = report.ReportWriterCsv(_RESULTS, validation.ValidationFindingSeverity.WARNING, output).write()
+
+    assert findings_count == 1
+    assert not output.closed
+    assert output.getvalue() == b'node_path,validator,severity,code,message\r\nbar,DummyValidator2,ERROR,error_finding,The error message\r\n'
+
+
+class _StringCollector:
+    """A text stream that does not derive from io.TextIOBase"""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, s):
+        self.parts.append(s)
+
+        return len(s)
+
+
+def test_ndjson_writer_duck_typed_text_output():
+    output = _StringCollector()
+
+    findings_count = report.ReportWriterNdjson(_RESULTS, validation.ValidationFindingSeverity.WARNING, output).write()
+
+    assert findings_count == 1
+    assert [json.loads(l)['node_path'] for l in ''.join(output.parts).splitlines()] == ['bar']
+
+
+class _CountingResultsReportGenerator(report.ReportGeneratorPlaintext):
+    def __init__(self, results, severity_threshold):
+        super().__init__(results, severity_threshold)
+
+        self.filter_count = 0
+
+    def get_finding_descriptions_for_result(self, result):
+        self.filter_count += 1
+
+        return super().get_finding_descriptions_for_result(result)
+
+
+def test_plaintext_filters_each_result_once():
+    gen = _CountingResultsReportGenerator(_RESULTS, validation.ValidationFindingSeverity.WARNING)
+
+    gen.generate()
+
+    assert gen.filter_count == len(_RESULTS)
+
+
+def test_write_report_plaintext_followed_by_empty_line():
+    output = io.StringIO()
+
+    findings_count = report.write_report(
+        report.ReportWriterPlaintext, _RESULTS, validation.ValidationFindingSeverity.WARNING, output
+    )
+
+    assert findings_count == 1
+    assert output.getvalue() == 'DummyValidator2 @ bar\n    error_finding (ERROR): The error message\n\n'
+
+
+def test_write_report_json_not_followed_by_empty_line():
+    output = io.StringIO()
+
+    report.write_report(report.ReportWriterJson, _RESULTS, validation.ValidationFindingSeverity.WARNING, output)
+
+    assert output.getvalue().endswith(']}\n')
@@ -0,0 +1,103 @@
+import hashlib
+
+from pkilint import validation
+from pkilint.rest import cache, model
+
+
+def _create_key(data: bytes, linter_name='linter'):
+    return cache.CacheKey(hashlib.sha256(data).digest(), 'group', linter_name, None, '1.0')
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+_RESULT_LIST = model.LintResultList(
+    results=[
+        model.Result(
+            validator='Validator', node_path='certificate',
+            finding_descriptions=[model.FindingDescription(severity='ERROR', code='test.error', message=None)]
+        )
+    ]
+)
+
+
+def test_lru_eviction():
+    lint_cache = cache.LintCache(2)
+
+    lint_cache.put_linter_name(_create_key(b'1'), 'one')
+    lint_cache.put_linter_name(_create_key(b'2'), 'two')
+
+    assert lint_cache.get_linter_name(_create_key(b'1')) == 'one'
+
+    lint_cache.put_linter_name(_create_key(b'3'), 'three')
+
+    assert lint_cache.get_linter_name(_create_key(b'2')) is None
+    assert lint_cache.get_linter_name(_create_key(b'1')) == 'one'
+    assert lint_cache.get_linter_name(_create_key(b'3')) == 'three'
+
+    assert lint_cache.hits == 3
+    assert lint_cache.misses == 1
+    assert len(lint_cache) == 2
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    lint_cache = cache.LintCache(10, ttl=60, clock=clock)
+
+    lint_cache.put_result_list(_create_key(b'1'), _RESULT_LIST)
+
+    clock.now = 60
+    assert lint_cache.get_result_list(_create_key(b'1')) is _RESULT_LIST
+
+    clock.now = 61
+    assert lint_cache.get_result_list(_create_key(b'1')) is None
+    assert len(lint_cache) == 0
+
+
+def test_key_includes_fail_fast_severity():
+    key = _create_key(b'1')
+
+    assert key.digest != key._replace(fail_fast_severity=validation.ValidationFindingSeverity.ERROR).digest
+    assert key.digest != key._replace(linter_name=None).digest
+
+
+def test_file_store_is_shared(tmp_path):
+    store = cache.FileCacheStore(str(tmp_path))
+
+    cache.LintCache(10, store=store).put_result_list(_create_key(b'1'), _RESULT_LIST)
+
+    other_cache = cache.LintCache(10, store=store)
+
+    assert other_cache.get_result_list(_create_key(b'1')) == _RESULT_LIST
+    assert other_cache.get_result_list(_create_key(b'2')) is None
+    assert other_cache.hits == 1
+    assert other_cache.misses == 1
+
+
+class FakeStore(cache.CacheStore):
+    """A store that holds a single entry of the specified age, which is removed once it is retrieved"""
+
+    def __init__(self, age):
+        self.age = age
+
+    def get(self, key, ttl):
+        age, self.age = self.age, None
+
+        return None if age is None else cache.CacheStoreEntry(_RESULT_LIST.model_dump_json(), age)
+
+
+def test_store_entry_keeps_remaining_ttl():
+    clock = FakeClock()
+    lint_cache = cache.LintCache(10, ttl=60, store=FakeStore(50), clock=clock)
+
+    assert lint_cache.get_result_list(_create_key(b'1')) == _RESULT_LIST
+
+    # the stored entry expires 10 seconds after it was retrieved
+    clock.now = 11
+
+    assert lint_cache.get_result_list(_create_key(b'1')) is None
@@ -0,0 +1,43 @@
+from pkilint.rest import metrics
+
+
+def test_counter_exposition():
+    registry = metrics.MetricsRegistry()
+    counter = registry.register(metrics.Counter('requests_total', 'The number of requests', ('route',)))
+
+    counter.inc('/a')
+    counter.inc('/a')
+    counter.inc('/"b"\n')
+
+    assert registry.render() == (
+        '# HELP requests_total The number of requests\n'
+        '# TYPE requests_total counter\n'
+        'requests_total{route="/\\"b\\"\\n"} 1\n'
+        'requests_total{route="/a"} 2\n'
+    )
+
+
+def test_histogram_exposition():
+    registry = metrics.MetricsRegistry()
+    histogram = registry.register(metrics.Histogram('duration_seconds', 'The duration', ('phase',), (0.1, 1.0)))
+
+    histogram.observe('decode', value=0.05)
+    histogram.observe('decode', value=0.1)
+    histogram.observe('decode', value=2.0)
+
+    assert registry.render() == (
+        '# HELP duration_seconds The duration\n'
+        '# TYPE duration_seconds histogram\n'
+        'duration_seconds_bucket{phase="decode",le="0.1"} 2\n'
+        'duration_seconds_bucket{phase="decode",le="1"} 2\n'
+        'duration_seconds_bucket{phase="decode",le="+Inf"} 3\n'
+        'duration_seconds_sum{phase="decode"} 2.15\n'
+        'duration_seconds_count{phase="decode"} 3\n'
+    )
+
+
+def test_function_gauge_without_value():
+    registry = metrics.MetricsRegistry()
+    registry.register(metrics.FunctionGauge('ratio', 'A ratio', lambda: None))
+
+    assert registry.render() == '# HELP ratio A ratio\n# TYPE ratio gauge\n'
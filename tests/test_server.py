@@ -1,16 +1,22 @@
+import asyncio
+import base64
+import gc
+import os
+import signal
 from http import HTTPStatus
 from importlib.metadata import version
 
 import pytest
 from fastapi.testclient import TestClient
 
-from pkilint import report, pkix
+from pkilint import report, pkix, linter_registry
 from pkilint.cabf import serverauth
 from pkilint.cabf.serverauth import serverauth_constants
 from pkilint.cabf.smime import smime_constants
 from pkilint.etsi import etsi_constants
 from pkilint.pkix import certificate, ocsp, name, extension
-from pkilint.rest import app as web_app
+from pkilint.rest import app as web_app, cabf_serverauth, model, cache as rest_cache, executor as rest_executor
+from pkilint.rest import metrics as rest_metrics, preload
 
 
 @pytest.fixture()
@@ -399,6 +405,33 @@ def test_detect_and_lint_serverauth_with_smime(client):
     assert j['linter']['name'] == serverauth_constants.CertificateType.DV_FINAL_CERTIFICATE.to_option_str
 
 
+def test_lint_serverauth_fail_fast(client):
+    resp = client.post(
+        '/certificate/cabf-serverauth/DV-FINAL-CERTIFICATE', params={'fail_fast': 'ERROR'},
+        json={'pem': _SMBR_SPONSORED_STRICT_PEM}
+    )
+    assert resp.status_code == HTTPStatus.OK
+
+    j = resp.json()
+
+    assert j['truncated']
+    assert len(j['results']) == 1
+    assert any(f['severity'] == 'ERROR' for f in j['results'][0]['finding_descriptions'])
+
+
+def test_lint_serverauth_fail_fast_not_triggered(client):
+    resp = client.post(
+        '/certificate/cabf-serverauth/OV-FINAL-CERTIFICATE', params={'fail_fast': 'ERROR'},
+        json={'pem': _OV_FINAL_CLEAN_PEM}
+    )
+    assert resp.status_code == HTTPStatus.OK
+
+    j = resp.json()
+
+    assert not j['truncated']
+    assert len(j['results']) == 0
+
+
 def test_validations_list(client):
     resp = client.get('/certificate/cabf-serverauth/root-ca')
     assert resp.status_code == HTTPStatus.OK
@@ -465,3 +498,401 @@ def test_detect_and_lint_etsi(client):
     j = resp.json()
 
     assert j['linter']['name'] == etsi_constants.CertificateType.OVCP_FINAL_CERTIFICATE.to_option_str
+
+
+def test_detect_and_lint_smime_batch(client):
+    resp = client.post(
+        '/certificate/cabf-smime/batch',
+        json={'documents': [{'pem': _SMBR_SPONSORED_STRICT_PEM}, {'pem': 'foo'}, {'pem': _OV_FINAL_CLEAN_PEM}]}
+    )
+    assert resp.status_code == HTTPStatus.OK
+
+    smime_item, bad_pem_item, not_smime_item = resp.json()['items']
+
+    assert smime_item['linter']['name'] == (
+        f'{smime_constants.ValidationLevel.SPONSORED}-{smime_constants.Generation.STRICT}'
+    )
+    assert smime_item['error'] is None
+    assert len(smime_item['results']) == 1
+
+    assert bad_pem_item['error'] == 'Invalid PEM text specified'
+    assert bad_pem_item['results'] is None
+
+    assert not_smime_item['error'] == 'Could not determine certificate type'
+    assert not_smime_item['linter'] is None
+
+
+def test_lint_serverauth_batch(client):
+    resp = client.post(
+        '/certificate/cabf-serverauth/DV-FINAL-CERTIFICATE/batch', params={'fail_fast': 'ERROR'},
+        json={'documents': [{'pem': _SMBR_SPONSORED_STRICT_PEM}, {'b64': 'foo'}]}
+    )
+    assert resp.status_code == HTTPStatus.OK
+
+    linted_item, bad_base64_item = resp.json()['items']
+
+    assert linted_item['linter']['name'] == serverauth_constants.CertificateType.DV_FINAL_CERTIFICATE.to_option_str
+    assert linted_item['truncated']
+
+    assert bad_base64_item['error'] == 'Invalid Base-64 encoding specified'
+
+
+def test_lint_batch_unknown_linter(client):
+    resp = client.post('/certificate/cabf-serverauth/FOOMASTER-BAR/batch', json={'documents': []})
+    assert resp.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_lint_batch_too_large(client, monkeypatch):
+    monkeypatch.setattr('pkilint.rest.request_body._MAX_BATCH_SIZE', 1)
+
+    resp = client.post(
+        '/certificate/cabf-serverauth/batch',
+        json={'documents': [{'pem': _OV_FINAL_CLEAN_PEM}, {'pem': _OV_FINAL_CLEAN_PEM}]}
+    )
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    _assert_validationerror_list_present(resp)
+
+
+def test_ocsp_pkix_lint_batch(client):
+    resp = client.post(
+        '/ocsp/pkix/batch', json={'documents': [{'b64': _OCSP_RESPONSE_B64}, {'pem': _OCSP_RESPONSE_B64}]}
+    )
+    assert resp.status_code == HTTPStatus.OK
+
+    linted_item, bad_pem_item = resp.json()['items']
+
+    assert linted_item['results'] == []
+    assert bad_pem_item['error'] == 'Invalid PEM text specified'
+
+
+def test_lint_request_timeout(client, monkeypatch):
+    monkeypatch.setattr('pkilint.rest._EXECUTOR', rest_executor.ThreadPoolLintExecutor(timeout=0.0))
+
+    resp = client.post('/certificate/cabf-serverauth/OV-FINAL-CERTIFICATE', json={'pem': _OV_FINAL_CLEAN_PEM})
+    assert resp.status_code == HTTPStatus.GATEWAY_TIMEOUT
+
+
+def test_lint_too_many_pending_requests(client, monkeypatch):
+    monkeypatch.setattr('pkilint.rest._EXECUTOR', rest_executor.ThreadPoolLintExecutor(max_pending_requests=0))
+
+    resp = client.post('/ocsp/pkix', json={'b64': _OCSP_RESPONSE_B64})
+    assert resp.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+
+
+def test_process_pool_executor(client, monkeypatch):
+    linters = [l for l in cabf_serverauth.create_linter_group_instance().linters]
+    pool_executor = rest_executor.ProcessPoolLintExecutor(1, linters)
+
+    monkeypatch.setattr('pkilint.rest._EXECUTOR', pool_executor)
+
+    try:
+        resp = client.post(
+            '/certificate/cabf-serverauth/batch',
+            json={'documents': [{'pem': _OV_FINAL_CLEAN_PEM}, {'pem': _SMBR_SPONSORED_STRICT_PEM}]}
+        )
+    finally:
+        pool_executor.shutdown()
+
+    assert resp.status_code == HTTPStatus.OK
+
+    ov_item, dv_item = resp.json()['items']
+
+    assert ov_item['linter']['name'] == serverauth_constants.CertificateType.OV_FINAL_CERTIFICATE.to_option_str
+    assert ov_item['results'] == []
+
+    assert dv_item['linter']['name'] == serverauth_constants.CertificateType.DV_FINAL_CERTIFICATE.to_option_str
+    assert any(dv_item['results'])
+    assert pool_executor.pending_request_count == 0
+
+
+def test_process_pool_executor_started_with_app(app, monkeypatch):
+    pool_executor = rest_executor.ProcessPoolLintExecutor(2, cabf_serverauth.create_linter_group_instance().linters)
+
+    monkeypatch.setattr('pkilint.rest._EXECUTOR', pool_executor)
+
+    with TestClient(app):
+        assert len(pool_executor._pool._processes) == 2
+
+    assert pool_executor._pool is None
+
+
+def test_process_pool_executor_worker_killed(app, monkeypatch):
+    pool_executor = rest_executor.ProcessPoolLintExecutor(1, cabf_serverauth.create_linter_group_instance().linters)
+
+    monkeypatch.setattr('pkilint.rest._EXECUTOR', pool_executor)
+
+    with TestClient(app) as client:
+        broken_pool = pool_executor._pool
+        worker_process, = broken_pool._processes.values()
+
+        os.kill(worker_process.pid, signal.SIGKILL)
+        worker_process.join()
+
+        resp = client.post('/certificate/cabf-serverauth/OV-FINAL-CERTIFICATE', json={'pem': _OV_FINAL_CLEAN_PEM})
+        assert resp.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+
+        assert pool_executor._pool is not broken_pool
+
+        resp = client.post('/certificate/cabf-serverauth/OV-FINAL-CERTIFICATE', json={'pem': _OV_FINAL_CLEAN_PEM})
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json()['results'] == []
+
+
+def test_process_pool_executor_bad_der(client, monkeypatch):
+    linters = [l for l in cabf_serverauth.create_linter_group_instance().linters]
+    pool_executor = rest_executor.ProcessPoolLintExecutor(1, linters)
+
+    monkeypatch.setattr('pkilint.rest._EXECUTOR', pool_executor)
+
+    try:
+        resp = client.post(
+            '/certificate/cabf-serverauth/OV-FINAL-CERTIFICATE/batch', content=b'\x04\x00',
+            headers={'Content-Type': 'application/pkix-cert'}
+        )
+    finally:
+        pool_executor.shutdown()
+
+    assert resp.status_code == HTTPStatus.OK
+
+    item, = resp.json()['items']
+
+    assert item['error'] == 'Invalid DER encoding specified'
+
+
+def test_lint_decodes_off_event_loop(client, monkeypatch):
+    parse_document = model.DocumentModel.parse_document
+
+    def parse_document_off_event_loop(self):
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+
+        return parse_document(self)
+
+    monkeypatch.setattr(model.DocumentModel, 'parse_document', parse_document_off_event_loop)
+
+    resp = client.post('/certificate/cabf-serverauth/OV-FINAL-CERTIFICATE', json={'pem': _OV_FINAL_CLEAN_PEM})
+    assert resp.status_code == HTTPStatus.OK
+
+    resp = client.post('/certificate/cabf-serverauth/batch', json={'documents': [{'pem': _OV_FINAL_CLEAN_PEM}]})
+    assert resp.json()['items'][0]['results'] == []
+
+
+def test_cache_statistics_disabled(client):
+    resp = client.get('/cache')
+    assert resp.status_code == HTTPStatus.OK
+
+    assert resp.json() == {'enabled': False, 'size': 0, 'hits': 0, 'misses': 0}
+
+
+def test_cached_determine_and_lint(client, monkeypatch):
+    monkeypatch.setattr('pkilint.rest._CACHE', rest_cache.LintCache(10))
+
+    first_resp = client.post('/certificate/cabf-smime', json={'pem': _SMBR_SPONSORED_STRICT_PEM})
+    assert client.get('/cache').json() == {'enabled': True, 'size': 2, 'hits': 0, 'misses': 2}
+
+    def fail_parse(self):
+        raise AssertionError('Document was parsed')
+
+    monkeypatch.setattr(model.DocumentModel, 'parse_document', fail_parse)
+
+    second_resp = client.post('/certificate/cabf-smime', json={'pem': _SMBR_SPONSORED_STRICT_PEM})
+    assert second_resp.json() == first_resp.json()
+
+    batch_resp = client.post(
+        '/certificate/cabf-smime/batch', json={'documents': [{'pem': _SMBR_SPONSORED_STRICT_PEM}]}
+    )
+    assert batch_resp.json()['items'][0]['results'] == first_resp.json()['results']
+
+    determine_resp = client.post('/certificate/cabf-smime/determine-linter', json={'pem': _SMBR_SPONSORED_STRICT_PEM})
+    assert determine_resp.json() == first_resp.json()['linter']
+
+    assert client.get('/cache').json() == {'enabled': True, 'size': 2, 'hits': 5, 'misses': 2}
+
+
+def test_cache_key_includes_fail_fast(client, monkeypatch):
+    monkeypatch.setattr('pkilint.rest._CACHE', rest_cache.LintCache(10))
+
+    resp = client.post('/certificate/cabf-serverauth/DV-FINAL-CERTIFICATE', json={'pem': _SMBR_SPONSORED_STRICT_PEM})
+    assert not resp.json()['truncated']
+
+    resp = client.post(
+        '/certificate/cabf-serverauth/DV-FINAL-CERTIFICATE', params={'fail_fast': 'ERROR'},
+        json={'pem': _SMBR_SPONSORED_STRICT_PEM}
+    )
+    assert resp.json()['truncated']
+
+
+class _EventLoopCheckingCacheStore(rest_cache.CacheStore):
+    def __init__(self):
+        self.calls = 0
+
+    def _check_off_event_loop(self):
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+
+        self.calls += 1
+
+    def get(self, key, ttl):
+        self._check_off_event_loop()
+
+    def put(self, key, value):
+        self._check_off_event_loop()
+
+
+def test_cache_store_off_event_loop(client, monkeypatch):
+    store = _EventLoopCheckingCacheStore()
+
+    monkeypatch.setattr('pkilint.rest._CACHE', rest_cache.LintCache(10, store=store))
+
+    resp = client.post('/ocsp/pkix', json={'b64': _OCSP_RESPONSE_B64})
+    assert resp.status_code == HTTPStatus.OK
+
+    resp = client.post(
+        '/ocsp/pkix/batch', params={'fail_fast': 'FATAL'}, json={'documents': [{'b64': _OCSP_RESPONSE_B64}]}
+    )
+    assert resp.status_code == HTTPStatus.OK
+
+    # a lookup and an addition for each request, as the results of the requests have different cache keys
+    assert store.calls == 4
+
+
+def _pem_to_der(pem):
+    return base64.b64decode(''.join(l for l in pem.splitlines() if not l.startswith('-----')))
+
+
+def test_lint_serverauth_der_body(client):
+    resp = client.post(
+        '/certificate/cabf-serverauth', content=_pem_to_der(_OV_FINAL_CLEAN_PEM),
+        headers={'Content-Type': 'application/pkix-cert'}
+    )
+    assert resp.status_code == HTTPStatus.OK
+
+    j = resp.json()
+
+    assert j['linter']['name'] == serverauth_constants.CertificateType.OV_FINAL_CERTIFICATE.to_option_str
+    assert len(j['results']) == 0
+
+
+def test_lint_bad_der_body(client):
+    resp = client.post(
+        '/certificate/cabf-serverauth/OV-FINAL-CERTIFICATE', content=b'\x04\x00',
+        headers={'Content-Type': 'application/pkix-cert'}
+    )
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    _assert_validationerror_list_present(resp)
+
+
+def test_lint_batch_concatenated_der_body(client):
+    content = _pem_to_der(_OV_FINAL_CLEAN_PEM) + b'\x04\x00' + _pem_to_der(_SMBR_SPONSORED_STRICT_PEM)
+
+    resp = client.post(
+        '/certificate/cabf-serverauth/batch', content=content, headers={'Content-Type': 'application/pkix-cert'}
+    )
+    assert resp.status_code == HTTPStatus.OK
+
+    ov_item, bad_item, dv_item = resp.json()['items']
+
+    assert ov_item['linter']['name'] == serverauth_constants.CertificateType.OV_FINAL_CERTIFICATE.to_option_str
+    assert bad_item['error'] == 'Invalid DER encoding specified'
+    assert dv_item['linter']['name'] == serverauth_constants.CertificateType.DV_FINAL_CERTIFICATE.to_option_str
+
+
+def test_lint_batch_truncated_der_body(client):
+    resp = client.post(
+        '/certificate/cabf-serverauth/batch', content=_pem_to_der(_OV_FINAL_CLEAN_PEM)[:-1],
+        headers={'Content-Type': 'application/pkix-cert'}
+    )
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    _assert_validationerror_list_present(resp)
+
+
+def test_lint_batch_der_body_too_large(client, monkeypatch):
+    monkeypatch.setattr('pkilint.rest.request_body._MAX_BATCH_SIZE', 1)
+
+    # the trailing truncated TLV is never reached, as splitting stops once the batch is known to be too large
+    content = _pem_to_der(_OV_FINAL_CLEAN_PEM) * 2 + b'\x30\x05'
+
+    resp = client.post(
+        '/certificate/cabf-serverauth/batch', content=content, headers={'Content-Type': 'application/pkix-cert'}
+    )
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    _assert_validationerror_list_present(resp)
+    assert resp.json()['detail'][0]['msg'].startswith('Batch contains 2 documents')
+
+
+def test_ocsp_pkix_lint_der_body(client):
+    resp = client.post(
+        '/ocsp/pkix', content=base64.b64decode(_OCSP_RESPONSE_B64),
+        headers={'Content-Type': 'application/ocsp-response'}
+    )
+    assert resp.status_code == HTTPStatus.OK
+
+    assert len(resp.json()['results']) == 0
+
+
+def test_openapi_der_media_types(client):
+    paths = client.get('/openapi.json').json()['paths']
+
+    assert 'application/pkix-cert' in paths['/certificate/{linter_group_name}']['post']['requestBody']['content']
+    assert 'application/ocsp-response' in paths['/ocsp/pkix/batch']['post']['requestBody']['content']
+
+
+def test_metrics(client, monkeypatch):
+    monkeypatch.setattr('pkilint.rest._CACHE', rest_cache.LintCache(10))
+
+    linter_name = serverauth_constants.CertificateType.OV_FINAL_CERTIFICATE.to_option_str
+    lint_requests = rest_metrics.LINT_REQUESTS.get('cabf-serverauth', linter_name, 'false')
+    decode_failures = rest_metrics.DECODE_FAILURES.get('cabf-serverauth')
+    validate_count = rest_metrics.PHASE_DURATION.get_count('cabf-serverauth', rest_metrics.PHASE_VALIDATE)
+
+    client.post('/certificate/cabf-serverauth', json={'pem': _OV_FINAL_CLEAN_PEM})
+    client.post('/certificate/cabf-serverauth', json={'pem': _OV_FINAL_CLEAN_PEM})
+    client.post('/certificate/cabf-serverauth', content=b'\x04\x00', headers={'Content-Type': 'application/pkix-cert'})
+
+    assert rest_metrics.LINT_REQUESTS.get('cabf-serverauth', linter_name, 'false') == lint_requests + 1
+    assert rest_metrics.LINT_REQUESTS.get('cabf-serverauth', linter_name, 'true') >= 1
+    assert rest_metrics.DECODE_FAILURES.get('cabf-serverauth') == decode_failures + 1
+    assert rest_metrics.PHASE_DURATION.get_count('cabf-serverauth', rest_metrics.PHASE_VALIDATE) == validate_count + 1
+
+    resp = client.get('/metrics')
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.headers['content-type'] == rest_metrics.CONTENT_TYPE
+
+    lines = resp.text.splitlines()
+
+    assert '# TYPE pkilint_lint_request_duration_seconds histogram' in lines
+    assert (
+        f'pkilint_lint_request_duration_seconds_bucket{{linter_group="cabf-serverauth",linter="{linter_name}",'
+        f'le="+Inf"}}' in resp.text
+    )
+    assert 'pkilint_cache_hit_ratio 0.4' in lines
+    assert any(
+        l.startswith('pkilint_http_requests_total{method="POST",route="/certificate/{linter_group_name}",'
+                     'status_code="422"}')
+        for l in lines
+    )
+
+
+def test_preload():
+    try:
+        preload()
+
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+    built_keys = linter_registry.get_default_registry().built_keys
+
+    assert any(k.profile == 'etsi' for k in built_keys)
+    assert any(k.profile == 'pkix-ocsp' for k in built_keys)
+
+
+def test_startup_metrics(app):
+    with TestClient(app) as client:
+        lines = client.get('/metrics').text.splitlines()
+
+    assert any(l.startswith('pkilint_startup_duration_seconds ') for l in lines)
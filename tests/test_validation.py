@@ -0,0 +1,204 @@
+import pytest
+
+from pkilint import validation, loader
+from pkilint.pkix import certificate, name, extension
+from tests import test_loader
+
+_SERIAL_NUMBER_PATH = 'certificate.tbsCertificate.serialNumber'
+
+_WARNING_FINDING = validation.ValidationFinding(validation.ValidationFindingSeverity.WARNING, 'test.warning')
+_ERROR_FINDING = validation.ValidationFinding(validation.ValidationFindingSeverity.ERROR, 'test.error')
+
+
+class RecordingValidator(validation.Validator):
+    def __init__(self, finding, **kwargs):
+        super().__init__(path=_SERIAL_NUMBER_PATH, **kwargs)
+
+        self.finding = finding
+        self.executed = False
+        self.message_formatted = False
+
+    def _format_message(self):
+        self.message_formatted = True
+
+        return 'message'
+
+    def validate(self, node):
+        self.executed = True
+
+        raise validation.ValidationFindingEncountered(self.finding, self._format_message)
+
+
+def _validate(validators, severity_threshold, fail_fast=None):
+    cert = loader.load_b64_certificate(test_loader._CERT_B64, 'test')
+
+    return validation.ValidatorContainer(validators=validators).validate(cert.root, severity_threshold, fail_fast)
+
+
+def test_validators_below_threshold_are_skipped():
+    warning_validator = RecordingValidator(_WARNING_FINDING, validations=[_WARNING_FINDING])
+    error_validator = RecordingValidator(_ERROR_FINDING, validations=[_ERROR_FINDING])
+
+    results = _validate([warning_validator, error_validator], validation.ValidationFindingSeverity.ERROR)
+
+    assert not warning_validator.executed
+    assert error_validator.executed
+    assert [r.validator for r in results] == [error_validator]
+    assert results[0].finding_descriptions == [validation.ValidationFindingDescription(_ERROR_FINDING, 'message')]
+
+
+def test_validators_without_declared_findings_are_executed():
+    undeclared_validator = RecordingValidator(_WARNING_FINDING)
+
+    results = _validate([undeclared_validator], validation.ValidationFindingSeverity.ERROR)
+
+    assert undeclared_validator.executed
+    assert not undeclared_validator.message_formatted
+    assert results[0].finding_descriptions == []
+
+
+def test_all_validators_executed_without_threshold():
+    warning_validator = RecordingValidator(_WARNING_FINDING, validations=[_WARNING_FINDING])
+
+    results = _validate([warning_validator], None)
+
+    assert warning_validator.executed
+    assert warning_validator.message_formatted
+    assert results[0].finding_descriptions == [validation.ValidationFindingDescription(_WARNING_FINDING, 'message')]
+
+
+def test_nested_container_below_threshold_is_skipped():
+    warning_validator = RecordingValidator(_WARNING_FINDING, validations=[_WARNING_FINDING])
+    container = validation.ValidatorContainer(validators=[warning_validator])
+
+    assert not container.may_report(validation.ValidationFindingSeverity.ERROR)
+    assert container.may_report(validation.ValidationFindingSeverity.WARNING)
+
+    assert _validate([container], validation.ValidationFindingSeverity.ERROR) == []
+    assert not warning_validator.executed
+
+
+def test_fail_fast_stops_at_first_blocking_finding():
+    warning_validator = RecordingValidator(_WARNING_FINDING, validations=[_WARNING_FINDING])
+    error_validator = RecordingValidator(_ERROR_FINDING, validations=[_ERROR_FINDING])
+    skipped_validator = RecordingValidator(_ERROR_FINDING, validations=[_ERROR_FINDING])
+    nested_container = validation.ValidatorContainer(validators=[error_validator], path=_SERIAL_NUMBER_PATH)
+
+    fail_fast = validation.FailFastCondition(validation.ValidationFindingSeverity.ERROR)
+
+    results = _validate([warning_validator, nested_container, skipped_validator], None, fail_fast)
+
+    assert fail_fast.triggered
+    assert fail_fast.blocking_result.validator is error_validator
+    assert [r.validator for r in results] == [warning_validator, error_validator]
+    assert not skipped_validator.executed
+
+
+def test_fail_fast_not_triggered():
+    warning_validator = RecordingValidator(_WARNING_FINDING, validations=[_WARNING_FINDING])
+
+    fail_fast = validation.FailFastCondition(validation.ValidationFindingSeverity.ERROR)
+
+    results = _validate([warning_validator], None, fail_fast)
+
+    assert not fail_fast.triggered
+    assert len(results) == 1
+
+
+def test_finding_code_index():
+    warning_validator = RecordingValidator(_WARNING_FINDING, validations=[_WARNING_FINDING])
+    error_validator = RecordingValidator(_ERROR_FINDING, validations=[_ERROR_FINDING, _WARNING_FINDING])
+    container = validation.ValidatorContainer(
+        validators=[warning_validator, validation.ValidatorContainer(validators=[error_validator])]
+    )
+
+    index = validation.create_finding_code_index(container)
+
+    assert index == {
+        'test.warning': [warning_validator, error_validator],
+        'test.error': [error_validator],
+    }
+
+
+def test_select_validators_by_finding_code_retains_decoders():
+    warning_validator = RecordingValidator(_WARNING_FINDING, validations=[_WARNING_FINDING])
+    error_validator = RecordingValidator(_ERROR_FINDING, validations=[_ERROR_FINDING])
+    decoding_validator = validation.DecodingValidator(decode_func=lambda n: None, path=_SERIAL_NUMBER_PATH)
+    nested_container = validation.ValidatorContainer(validators=[warning_validator])
+    container = validation.ValidatorContainer(validators=[decoding_validator, nested_container, error_validator])
+
+    selected = validation.select_validators_by_finding_code(container, ['test.err*'])
+
+    assert selected.validators == [decoding_validator, error_validator]
+    assert set(selected.validations) == {
+        _ERROR_FINDING,
+        validation.DecodingValidator.VALIDATION_ASN1_DECODING_FAILURE,
+        validation.Validator.VALIDATION_FINDING_UNHANDLED_EXCEPTION,
+    }
+    assert container.validators == [decoding_validator, nested_container, error_validator]
+
+
+def test_select_validators_by_finding_code_no_match():
+    container = validation.ValidatorContainer(
+        validators=[RecordingValidator(_WARNING_FINDING, validations=[_WARNING_FINDING])]
+    )
+
+    with pytest.raises(ValueError):
+        validation.select_validators_by_finding_code(container, ['cabf.*'])
+
+
+class PassingValidator(validation.Validator):
+    def __init__(self):
+        super().__init__(validations=[_WARNING_FINDING], path=_SERIAL_NUMBER_PATH)
+
+    def validate(self, node):
+        pass
+
+
+def test_iter_validate_yields_results_as_produced():
+    warning_validator = RecordingValidator(_WARNING_FINDING, validations=[_WARNING_FINDING])
+    error_validator = RecordingValidator(_ERROR_FINDING, validations=[_ERROR_FINDING])
+    container = validation.ValidatorContainer(validators=[warning_validator, error_validator])
+
+    cert = loader.load_b64_certificate(test_loader._CERT_B64, 'test')
+
+    results = container.iter_validate(cert.root)
+
+    assert next(results).validator is warning_validator
+    assert not error_validator.executed
+
+    assert next(results).validator is error_validator
+    assert next(results, None) is None
+
+
+def test_iter_validate_excludes_empty_results():
+    passing_validator = PassingValidator()
+    warning_validator = RecordingValidator(_WARNING_FINDING, validations=[_WARNING_FINDING])
+    container = validation.ValidatorContainer(validators=[passing_validator, warning_validator])
+
+    cert = loader.load_b64_certificate(test_loader._CERT_B64, 'test')
+
+    assert [r.validator for r in container.iter_validate(cert.root)] == [passing_validator, warning_validator]
+    assert [r.validator for r in container.iter_validate(cert.root, include_empty_results=False)] == [
+        warning_validator
+    ]
+
+
+def test_iter_validate_matches_validate():
+    validator = certificate.create_pkix_certificate_validator_container(
+        certificate.create_decoding_validators(name.ATTRIBUTE_TYPE_MAPPINGS, extension.EXTENSION_MAPPINGS),
+        [
+            certificate.create_issuer_validator_container([]),
+            certificate.create_validity_validator_container(),
+            certificate.create_subject_validator_container([]),
+            certificate.create_extensions_validator_container([]),
+        ]
+    )
+
+    cert_1 = loader.load_b64_certificate(test_loader._CERT_B64, 'test')
+    cert_2 = loader.load_b64_certificate(test_loader._CERT_B64, 'test')
+
+    expected = [(r.validator, r.node.path, r.finding_descriptions) for r in validator.validate(cert_1.root)]
+    actual = [(r.validator, r.node.path, r.finding_descriptions) for r in validator.iter_validate(cert_2.root)]
+
+    assert actual == expected